@@ -1,17 +1,33 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from bson import ObjectId
 from .config import settings
 from .models.user import User
 from .database import get_database
+from .repositories import UserRepository
+from .cache import TTLCache
+from . import codec
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
+# Authenticated users keyed by user id, so most requests skip the users lookup
+principal_cache = TTLCache(
+    maxsize=settings.principal_cache_max_size,
+    ttl=settings.principal_cache_ttl_seconds,
+)
+
+
+def invalidate_principal(user_id) -> None:
+    """Drop a cached user; call after any write to that user's document."""
+    if user_id is not None:
+        principal_cache.invalidate(str(user_id))
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -21,6 +37,75 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHashPool:
+    """Runs bcrypt hashing and verification on a dedicated worker pool.
+
+    At most ``workers + queue_size`` calls may be in flight; beyond that the
+    caller gets a 503 immediately instead of queueing behind a login burst.
+    """
+
+    def __init__(self, kind: str, workers: int, queue_size: int):
+        self.kind = kind
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.in_flight = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def run(self, func, *args):
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
+
+
+password_hash_pool = PasswordHashPool(
+    kind=settings.password_hash_executor,
+    workers=settings.password_hash_workers,
+    queue_size=settings.password_hash_queue_size,
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hash_pool.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -46,20 +131,18 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except JWTError:
         raise credentials_exception
     
+    cached_user = principal_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+    
     db = await get_database()
-    user = await db.habitgrove.users.find_one({"_id": ObjectId(user_id)})
+    user = await UserRepository(db).get(user_id)
     if user is None:
         raise credentials_exception
     
-    # Convert ObjectId to string and ensure both id and _id are set
-    user["_id"] = str(user["_id"])
-    user["id"] = user["_id"]  # Ensure id field is also set
-    
-    # Convert group_id ObjectId to string if it exists
-    if "group_id" in user and user["group_id"] is not None:
-        user["group_id"] = str(user["group_id"])
-    
-    return User(**user)
+    principal = User(**codec.users.to_api(user))
+    principal_cache.set(user_id, principal)
+    return principal
 
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)):
@@ -0,0 +1,75 @@
+"""Conversion of MongoDB documents into the shape the API returns.
+
+Documents keep ObjectIds in ``_id`` and in reference fields such as
+``group_id`` or ``admins``. The API returns them as strings, with the
+document id under ``id`` too (models that alias ``id`` to ``_id`` read the
+latter). Each collection has a ``DocumentCodec`` that knows its reference
+fields and converts a document in place in a single pass, so no copy is
+made per document.
+
+``ObjectIdStr`` is the matching Pydantic type: a ``str`` that also accepts
+an ObjectId, for model fields that hold references. ``object_id`` goes the
+other way, for ids taken from requests.
+"""
+from typing import Annotated, Optional, Sequence, Tuple
+
+from bson import ObjectId
+from pydantic import BeforeValidator
+
+
+def id_str(value):
+    """``str(value)`` for an ObjectId; anything else is returned unchanged."""
+    return str(value) if type(value) is ObjectId else value
+
+
+ObjectIdStr = Annotated[str, BeforeValidator(id_str)]
+
+
+def object_id(value) -> ObjectId:
+    """``ObjectId(value)`` for an id string; an ObjectId is returned unchanged."""
+    return value if isinstance(value, ObjectId) else ObjectId(value)
+
+
+class DocumentCodec:
+    """In-place converter for the documents of one collection.
+
+    ``refs`` name fields holding one ObjectId and ``ref_lists`` fields
+    holding a list of them. With ``mongo_id=False`` the document id is moved
+    to ``id`` instead of being kept under both keys.
+    """
+
+    def __init__(self, refs: Tuple[str, ...] = (), ref_lists: Tuple[str, ...] = (), mongo_id: bool = True):
+        self.refs = refs
+        self.ref_lists = ref_lists
+        self.mongo_id = mongo_id
+
+    def to_api(self, doc: Optional[dict]) -> Optional[dict]:
+        if doc is not None:
+            self.to_api_many((doc,))
+        return doc
+
+    def to_api_many(self, docs: Sequence[dict]) -> Sequence[dict]:
+        """Convert ``docs`` in place and return them; the whole batch runs in one loop."""
+        mongo_id, refs, ref_lists = self.mongo_id, self.refs, self.ref_lists
+        for doc in docs:
+            if mongo_id:
+                doc["_id"] = doc["id"] = str(doc["_id"])
+            elif "_id" in doc:
+                doc["id"] = str(doc.pop("_id"))
+            for field in refs:
+                value = doc.get(field)
+                if type(value) is ObjectId:
+                    doc[field] = str(value)
+            for field in ref_lists:
+                values = doc.get(field)
+                if values:
+                    doc[field] = [str(value) if type(value) is ObjectId else value for value in values]
+        return docs
+
+
+users = DocumentCodec(refs=("group_id",))
+tasks = DocumentCodec(refs=("group_id",))
+groups = DocumentCodec(ref_lists=("admins",))
+group_summaries = DocumentCodec(mongo_id=False)
+completions = DocumentCodec(refs=("task_id", "user_id", "group_id"))
+admin_requests = DocumentCodec(refs=("group_id", "user_id", "reviewed_by"))
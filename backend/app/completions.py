@@ -0,0 +1,177 @@
+"""Writes that record task completions and award their points."""
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from .config import settings
+from .leaderboards import leaderboards
+from .periods import period_key
+from .point_buckets import add_to_point_buckets
+from .point_counters import get_shard_counts, group_increment_writes, write_shard_increments
+from .repositories import CompletionRepository, GroupRepository, TaskRepository, UserRepository
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def build_completion(task: dict, user_id: str, group_id: Optional[str], completed_at: datetime) -> dict:
+    """Build the task_completions document for ``task`` completed by ``user_id``."""
+    completion = {
+        "task_id": task["_id"] if isinstance(task["_id"], ObjectId) else ObjectId(task["_id"]),
+        "user_id": ObjectId(user_id),
+        "group_id": ObjectId(group_id) if group_id else None,
+        "completed_at": completed_at,
+        "points_earned": task["points"],
+        "period_key": period_key(task.get("type"), completed_at),
+    }
+    return completion
+
+
+async def apply_point_increments(
+    client,
+    user_increments: Dict[str, int],
+    group_increments: Dict[str, int],
+    session=None,
+):
+    """Add points to users and group totals, one bulk write per collection.
+
+    Increments of groups with sharded counters go to ``group_point_shards``
+    (see ``point_counters``). Outside a transaction the bulk writes run
+    concurrently.
+    """
+    writes = []
+    group_writes, shard_writes = [], []
+    if group_increments:
+        counts = await get_shard_counts(client, group_increments)
+        group_writes, shard_writes = group_increment_writes(group_increments, counts)
+    if user_increments:
+        writes.append(UserRepository(client).add_points(user_increments, session=session))
+    if group_writes:
+        writes.append(GroupRepository(client).bulk_write(group_writes, session=session))
+    if shard_writes:
+        writes.append(write_shard_increments(client, shard_writes, session=session))
+
+    if session is not None:
+        # Operations of one session must not run concurrently
+        for write in writes:
+            await write
+    else:
+        await asyncio.gather(*writes)
+
+
+async def record_completion(client, completion: dict):
+    """Insert ``completion`` and award its points.
+
+    The unique ``(user_id, task_id, period_key)`` index makes the insert itself
+    the duplicate check: a second completion in the same period raises
+    ``DuplicateKeyError`` before any points are awarded. With
+    ``settings.use_transactions`` the insert, both increments and the period
+    point buckets commit atomically (requires a replica set).
+    """
+    completions = CompletionRepository(client)
+    user_increments = {str(completion["user_id"]): completion["points_earned"]}
+    group_increments = {}
+    if completion.get("group_id"):
+        group_increments[str(completion["group_id"])] = completion["points_earned"]
+
+    if settings.use_transactions:
+        async with await client.start_session() as session:
+            async with session.start_transaction():
+                completion_id = await completions.insert(completion, session=session)
+                await apply_point_increments(client, user_increments, group_increments, session=session)
+                await add_to_point_buckets(client, [completion], session=session)
+        leaderboards.apply_increments(user_increments)
+        return completion_id
+
+    completion_id = await completions.insert(completion)
+    await asyncio.gather(
+        apply_point_increments(client, user_increments, group_increments),
+        add_to_point_buckets(client, [completion]),
+    )
+    leaderboards.apply_increments(user_increments)
+    return completion_id
+
+
+async def backfill_period_keys(client) -> Dict[str, int]:
+    """Set ``period_key`` on completions stored before period keys existed.
+
+    Keys are derived from the task type and ``completed_at`` (or
+    ``created_at``). When several completions of a user and task fall into
+    the same period, only one gets the key (the unique index rejects the
+    rest); the others are reported as duplicates. Safe to re-run.
+    """
+    completions = CompletionRepository(client)
+    legacy = await completions.without_period_keys()
+
+    tasks = await TaskRepository(client).by_ids((completion["task_id"] for completion in legacy), {"type": 1})
+    task_types = {task_id: task.get("type") for task_id, task in tasks.items()}
+
+    writes, seen = [], set()
+    duplicates = 0
+    for completion in legacy:
+        completed_at = completion.get("completed_at") or completion.get("created_at")
+        if not isinstance(completed_at, datetime):
+            continue
+        key = period_key(task_types.get(str(completion["task_id"])), completed_at)
+        if (completion["user_id"], completion["task_id"], key) in seen:
+            duplicates += 1
+            continue
+        seen.add((completion["user_id"], completion["task_id"], key))
+        writes.append(UpdateOne({"_id": completion["_id"]}, {"$set": {"period_key": key}}))
+
+    updated = 0
+    for start in range(0, len(writes), settings.bulk_insert_batch_size):
+        try:
+            result = await completions.bulk_write(writes[start:start + settings.bulk_insert_batch_size])
+            updated += result.modified_count
+        except BulkWriteError as e:
+            updated += e.details.get("nModified", 0)
+            duplicates += sum(
+                1 for error in e.details.get("writeErrors", []) if error.get("code") == DUPLICATE_KEY_ERROR
+            )
+
+    skipped = len(legacy) - len(writes) - duplicates
+    return {"completions_updated": updated, "duplicates": duplicates, "skipped": skipped}
+
+
+async def record_completions(client, completions: List[dict]) -> Dict[int, str]:
+    """Insert many completions at once and award the points of those stored.
+
+    Uses ``insert_many(ordered=False)`` so one duplicate does not stop the
+    rest of the batch, then merges the increments per user and per group.
+    Returns ``{position: error}`` for the documents that were not stored;
+    duplicates of an existing period are reported as ``"duplicate"``.
+    """
+    failed: Dict[int, str] = {}
+    if not completions:
+        return failed
+
+    try:
+        await CompletionRepository(client).insert_many(completions)
+    except BulkWriteError as e:
+        for write_error in e.details.get("writeErrors", []):
+            if write_error.get("code") == DUPLICATE_KEY_ERROR:
+                failed[write_error["index"]] = "duplicate"
+            else:
+                failed[write_error["index"]] = write_error.get("errmsg", "write failed")
+
+    user_increments: Dict[str, int] = defaultdict(int)
+    group_increments: Dict[str, int] = defaultdict(int)
+    for position, completion in enumerate(completions):
+        if position in failed:
+            continue
+        user_increments[str(completion["user_id"])] += completion["points_earned"]
+        if completion.get("group_id"):
+            group_increments[str(completion["group_id"])] += completion["points_earned"]
+
+    stored = [completion for position, completion in enumerate(completions) if position not in failed]
+    await asyncio.gather(
+        apply_point_increments(client, user_increments, group_increments),
+        add_to_point_buckets(client, stored),
+    )
+    leaderboards.apply_increments(user_increments)
+    return failed
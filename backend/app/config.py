@@ -7,6 +7,54 @@ class Settings(BaseSettings):
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+
+    # In-process cache of authenticated users (see auth.get_current_user)
+    principal_cache_ttl_seconds: float = 30
+    principal_cache_max_size: int = 10000
+
+    # Worker pool that runs bcrypt off the event loop ("thread" or "process")
+    password_hash_executor: str = "thread"
+    password_hash_workers: int = 4
+    password_hash_queue_size: int = 32
+
+    # Index bootstrap (see app/indexes.py)
+    create_indexes_on_startup: bool = True
+    unique_user_email: bool = False
+
+    # Record completions and their point increments in one transaction
+    # (requires MongoDB running as a replica set, e.g. Atlas)
+    use_transactions: bool = False
+
+    # Also check completions stored before period keys existed; disable once
+    # POST /admin/completions/migrate-period-keys has run
+    completion_window_fallback: bool = True
+
+    # Max age of the in-process task catalog behind GET /tasks/
+    task_catalog_ttl_seconds: float = 60
+
+    # Bulk and streaming uploads
+    bulk_insert_batch_size: int = 500
+    bulk_import_max_errors: int = 1000
+
+    # Roster imports: concurrent bcrypt hashes (leave pool room for logins)
+    # and lifetime of invite tokens for members imported without a password
+    roster_import_hash_concurrency: int = 2
+    roster_invite_ttl_days: int = 14
+
+    # Lifetime of GET /admin/statistics snapshots
+    statistics_cache_ttl_seconds: float = 15
+
+    # Also match the legacy groups.members arrays in membership checks;
+    # disable once POST /admin/groups/migrate-memberships has run
+    membership_array_fallback: bool = True
+
+    # Sharded group point counters (see app/point_counters.py)
+    group_point_shards_max: int = 64
+    point_shard_config_ttl_seconds: float = 30
+    group_points_cache_ttl_seconds: float = 5
+
+    # In-memory leaderboards are rebuilt from MongoDB this often (0 disables)
+    leaderboard_refresh_seconds: float = 300
     
     class Config:
         env_file = ".env"
@@ -1,5 +1,6 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from .config import settings
+from .indexes import check_required_indexes, ensure_indexes, verify_indexes
 
 
 class Database:
@@ -16,6 +17,18 @@ async def get_database() -> AsyncIOMotorClient:
 async def connect_to_mongo():
     db.client = AsyncIOMotorClient(settings.mongo_url)
     print("Connected to MongoDB.")
+    
+    if settings.create_indexes_on_startup:
+        result = await ensure_indexes(db.client, settings.unique_user_email)
+        for message in result["failed"]:
+            print(f"Index creation failed: {message}")
+    
+    report = await verify_indexes(db.client, settings.unique_user_email)
+    if report["missing"]:
+        print(f"Missing MongoDB indexes: {', '.join(report['missing'])}")
+    if report["extra"]:
+        print(f"Undeclared MongoDB indexes: {', '.join(report['extra'])}")
+    check_required_indexes(report)
 
 
 async def close_mongo_connection():
@@ -0,0 +1,85 @@
+"""Sparse fieldsets: the ``fields`` query parameter of list endpoints.
+
+``?fields=title,points`` asks for a subset of the response model's fields.
+The selection trims the MongoDB projection, so less is read and sent, and
+picks a trimmed response model, so the JSON body only carries those keys.
+``id`` is always returned.
+
+Fields are named as in the response body: the field name or its alias.
+"""
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, create_model
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return, e.g. title,points (id is always included)"
+
+# Selected field names of a model in declaration order, so equal selections share caches
+Fieldset = Tuple[str, ...]
+
+# Trimmed models kept; selections are chosen by clients, so the cache is bounded
+SPARSE_MODEL_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=None)
+def _names_by_key(model: type[BaseModel]) -> Dict[str, str]:
+    names = {}
+    for name, field in model.model_fields.items():
+        names[name] = name
+        if field.alias:
+            names[field.alias] = name
+    return names
+
+
+def parse_fields(model: type[BaseModel], fields: Optional[str]) -> Optional[Fieldset]:
+    """The fieldset selected by a ``fields`` parameter, or None for every field."""
+    if not fields:
+        return None
+    names = _names_by_key(model)
+    selected = {"id"} if "id" in model.model_fields else set()
+    for key in fields.split(","):
+        key = key.strip()
+        if not key:
+            continue
+        if key not in names:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown field: {key}")
+        selected.add(names[key])
+    return tuple(name for name in model.model_fields if name in selected)
+
+
+@lru_cache(maxsize=SPARSE_MODEL_CACHE_SIZE)
+def sparse_model(model: type[BaseModel], fieldset: Optional[Fieldset]) -> type[BaseModel]:
+    """``model`` with only the fields of ``fieldset`` (``model`` itself for None).
+
+    Recently used selections are cached, so the serialization adapters built
+    for them are reused.
+    """
+    if fieldset is None:
+        return model
+    return create_model(
+        f"{model.__name__}Fields",
+        __config__=model.model_config,
+        **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fieldset},
+    )
+
+
+def sparse_projection(
+    projection: dict,
+    model: type[BaseModel],
+    fieldset: Optional[Fieldset],
+    keep: Iterable[str] = (),
+) -> dict:
+    """``projection`` without the stored fields of unselected model fields.
+
+    ``_id`` and the keys in ``keep``, such as the sort key of a keyset page,
+    are kept either way.
+    """
+    if fieldset is None:
+        return projection
+    keys = {"_id", *keep}
+    for name in fieldset:
+        field = model.model_fields[name]
+        keys.add(field.alias or name)
+        keys.add(name)
+    return {key: value for key, value in projection.items() if key in keys}
@@ -0,0 +1,51 @@
+"""Group directory search.
+
+Groups store ``name_search``, their name folded by ``normalize_search_text``.
+A search is an anchored regex on that field, which MongoDB answers as a
+range scan over the ``groups_type_name_search`` / ``groups_name_search``
+indexes, and results are paged by ``(name_search, _id)``.
+
+Groups created before this field existed are backfilled with
+``backfill_group_search_names``.
+"""
+import re
+from typing import Dict, Optional
+
+from pymongo import UpdateOne
+
+from .config import settings
+from .repositories import GroupRepository
+from .repositories.groups import SEARCH_FIELD
+from .text import normalize_search_text
+
+
+def group_search_filter(query: Optional[str], group_type: Optional[str] = None) -> dict:
+    """Filter matching groups whose normalized name starts with ``query``."""
+    filter_query = {}
+    if group_type:
+        filter_query["type"] = group_type
+    prefix = normalize_search_text(query or "")
+    if prefix:
+        filter_query[SEARCH_FIELD] = {"$regex": "^" + re.escape(prefix)}
+    else:
+        filter_query[SEARCH_FIELD] = {"$exists": True}
+    return filter_query
+
+
+async def backfill_group_search_names(client) -> Dict[str, int]:
+    """Set ``name_search`` on every group whose value is missing or stale."""
+    groups = GroupRepository(client)
+    writes = []
+    groups_updated = 0
+
+    async for group in groups.search_names():
+        normalized = normalize_search_text(group.get("name", ""))
+        if group.get(SEARCH_FIELD) != normalized:
+            writes.append(UpdateOne({"_id": group["_id"]}, {"$set": {SEARCH_FIELD: normalized}}))
+        if len(writes) >= settings.bulk_insert_batch_size:
+            groups_updated += (await groups.bulk_write(writes)).modified_count
+            writes = []
+    if writes:
+        groups_updated += (await groups.bulk_write(writes)).modified_count
+
+    return {"groups_updated": groups_updated}
@@ -0,0 +1,248 @@
+"""Declared MongoDB indexes for the HabitGrove collections.
+
+Every index a router relies on is listed in ``INDEXES`` so that query shapes
+and their indexes are reviewed in one place. The registry can be applied at
+startup (see ``database.connect_to_mongo``) or from the command line:
+
+    python -m app.indexes            # report missing and extra indexes
+    python -m app.indexes --create   # build missing indexes, then report
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+DATABASE_NAME = "habitgrove"
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    collection: str
+    keys: Tuple[Tuple[str, int], ...]
+    name: str
+    unique: bool = False
+    options: Dict = field(default_factory=dict, hash=False, compare=False)
+
+    def to_model(self) -> IndexModel:
+        return IndexModel(list(self.keys), name=self.name, unique=self.unique, **self.options)
+
+
+INDEXES: List[IndexSpec] = [
+    # auth.login, auth.register
+    IndexSpec("users", (("email", ASCENDING),), "users_email"),
+    # tasks.get_tasks
+    IndexSpec(
+        "tasks",
+        (("isActive", ASCENDING), ("type", ASCENDING), ("category", ASCENDING), ("difficulty", ASCENDING)),
+        "tasks_active_type_category_difficulty",
+    ),
+    # tasks.get_group_tasks
+    IndexSpec(
+        "tasks",
+        (("group_id", ASCENDING), ("is_group_task", ASCENDING), ("isActive", ASCENDING)),
+        "tasks_group_active",
+    ),
+    # tasks.complete_task: one completion per user, task and period
+    IndexSpec(
+        "task_completions",
+        (("user_id", ASCENDING), ("task_id", ASCENDING), ("period_key", ASCENDING)),
+        "completions_user_task_period",
+        unique=True,
+        options={"partialFilterExpression": {"period_key": {"$exists": True}}},
+    ),
+    # tasks.get_user_completions
+    IndexSpec(
+        "task_completions",
+        (("user_id", ASCENDING), ("completed_at", DESCENDING), ("_id", DESCENDING)),
+        "completions_user_completed_at",
+    ),
+    # tasks.get_group_completions, groups.get_group_profile recent completions
+    IndexSpec(
+        "task_completions",
+        (("group_id", ASCENDING), ("completed_at", DESCENDING), ("_id", DESCENDING)),
+        "completions_group_completed_at",
+    ),
+    # memberships.is_member, memberships.add_member
+    IndexSpec(
+        "group_memberships",
+        (("group_id", ASCENDING), ("user_id", ASCENDING)),
+        "memberships_group_user",
+        unique=True,
+    ),
+    # memberships.remove_user_memberships
+    IndexSpec("group_memberships", (("user_id", ASCENDING),), "memberships_user"),
+    # admin.get_admin_statistics top lists
+    IndexSpec("users", (("points", DESCENDING),), "users_points"),
+    IndexSpec("groups", (("total_points", DESCENDING),), "groups_total_points"),
+    # groups.search_groups, with and without a type filter
+    IndexSpec("groups", (("name_search", ASCENDING), ("_id", ASCENDING)), "groups_name_search"),
+    IndexSpec(
+        "groups",
+        (("type", ASCENDING), ("name_search", ASCENDING), ("_id", ASCENDING)),
+        "groups_type_name_search",
+    ),
+    # point_counters: one document per group and shard
+    IndexSpec(
+        "group_point_shards",
+        (("group_id", ASCENDING), ("shard", ASCENDING)),
+        "point_shards_group_shard",
+        unique=True,
+    ),
+    # point_buckets: one document per user or group and period
+    IndexSpec(
+        "point_buckets",
+        (("kind", ASCENDING), ("owner_id", ASCENDING), ("period", ASCENDING)),
+        "point_buckets_owner_period",
+        unique=True,
+    ),
+    # leaderboards.get_period_*_leaderboard
+    IndexSpec(
+        "point_buckets",
+        (("kind", ASCENDING), ("period", ASCENDING), ("points", DESCENDING), ("owner_id", ASCENDING)),
+        "point_buckets_period_points",
+    ),
+    IndexSpec(
+        "point_buckets",
+        (("kind", ASCENDING), ("period", ASCENDING), ("group_id", ASCENDING), ("points", DESCENDING), ("owner_id", ASCENDING)),
+        "point_buckets_group_period_points",
+    ),
+    # auth.accept_invite
+    IndexSpec(
+        "users",
+        (("invite_token_hash", ASCENDING),),
+        "users_invite_token",
+        options={"sparse": True},
+    ),
+    # admin_requests.create_admin_request, groups.get_group_admins
+    IndexSpec(
+        "admin_requests",
+        (("group_id", ASCENDING), ("user_id", ASCENDING), ("status", ASCENDING)),
+        "admin_requests_group_user_status",
+    ),
+    # admin_requests.get_my_admin_requests
+    IndexSpec("admin_requests", (("user_id", ASCENDING),), "admin_requests_user"),
+    # admin.get_admin_requests status filter, paged by _id
+    IndexSpec("admin_requests", (("status", ASCENDING), ("_id", ASCENDING)), "admin_requests_status"),
+]
+
+
+# Unique indexes that enforce correctness rather than speed: without them
+# completions could be paid twice, users join a group twice and counter or
+# bucket upserts create duplicates. The API refuses to start without them.
+REQUIRED_INDEXES = (
+    "task_completions.completions_user_task_period",
+    "group_memberships.memberships_group_user",
+    "group_point_shards.point_shards_group_shard",
+    "point_buckets.point_buckets_owner_period",
+)
+
+
+class MissingIndexError(RuntimeError):
+    pass
+
+
+def declared_indexes(unique_email: bool = False) -> List[IndexSpec]:
+    """Return the registry, optionally enforcing unique user emails."""
+    specs = []
+    for spec in INDEXES:
+        if unique_email and spec.name == "users_email":
+            spec = IndexSpec(spec.collection, spec.keys, spec.name, unique=True, options=spec.options)
+        specs.append(spec)
+    return specs
+
+
+def _key_signature(keys) -> Tuple[Tuple[str, int], ...]:
+    return tuple(
+        (name, direction if isinstance(direction, str) else int(direction))
+        for name, direction in keys
+    )
+
+
+async def ensure_indexes(client, unique_email: bool = False) -> Dict[str, List[str]]:
+    """Create every declared index that does not exist yet.
+
+    Indexes are built one at a time so a single failure (for example duplicate
+    emails blocking the unique index) does not prevent the others.
+    """
+    database = client[DATABASE_NAME]
+    created, failed = [], []
+    for spec in declared_indexes(unique_email):
+        try:
+            await database[spec.collection].create_indexes([spec.to_model()])
+            created.append(f"{spec.collection}.{spec.name}")
+        except OperationFailure as e:
+            failed.append(f"{spec.collection}.{spec.name}: {e}")
+    return {"ensured": created, "failed": failed}
+
+
+async def verify_indexes(client, unique_email: bool = False) -> Dict[str, List[str]]:
+    """Compare the declared indexes with the ones that exist in the database.
+
+    An index matches when its key pattern and uniqueness agree; names are not
+    compared so indexes built by hand under another name are still accepted.
+    """
+    database = client[DATABASE_NAME]
+    specs = declared_indexes(unique_email)
+    missing, extra = [], []
+
+    for collection in sorted({spec.collection for spec in specs}):
+        existing = {}
+        async for index in database[collection].list_indexes():
+            if index["name"] == "_id_":
+                continue
+            existing[(_key_signature(index["key"].items()), bool(index.get("unique", False)))] = index["name"]
+
+        declared = {
+            (_key_signature(spec.keys), spec.unique): spec.name
+            for spec in specs if spec.collection == collection
+        }
+        missing.extend(f"{collection}.{name}" for key, name in declared.items() if key not in existing)
+        extra.extend(f"{collection}.{name}" for key, name in existing.items() if key not in declared)
+
+    return {"missing": missing, "extra": extra}
+
+
+def check_required_indexes(report: Dict[str, List[str]]) -> None:
+    """Raise ``MissingIndexError`` if a ``verify_indexes`` report lacks a required index."""
+    missing = [name for name in REQUIRED_INDEXES if name in report["missing"]]
+    if missing:
+        raise MissingIndexError(
+            f"Required MongoDB indexes are missing: {', '.join(missing)}. "
+            "Build them with: python -m app.indexes --create"
+        )
+
+
+async def _main(args) -> int:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from .config import settings
+
+    client = AsyncIOMotorClient(settings.mongo_url)
+    unique_email = args.unique_email or settings.unique_user_email
+    try:
+        if args.create:
+            result = await ensure_indexes(client, unique_email)
+            for name in result["ensured"]:
+                print(f"ensured  {name}")
+            for message in result["failed"]:
+                print(f"FAILED   {message}")
+
+        report = await verify_indexes(client, unique_email)
+        for name in report["missing"]:
+            print(f"missing  {name}")
+        for name in report["extra"]:
+            print(f"extra    {name}")
+        if not report["missing"] and not report["extra"]:
+            print("All declared indexes are present.")
+        return 1 if report["missing"] else 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or verify the HabitGrove MongoDB indexes")
+    parser.add_argument("--create", action="store_true", help="build missing indexes before reporting")
+    parser.add_argument("--unique-email", action="store_true", help="declare users.email as unique")
+    raise SystemExit(asyncio.run(_main(parser.parse_args())))
@@ -0,0 +1,163 @@
+"""In-memory user leaderboards.
+
+Each scope, the global board and one board per group, keeps its members in
+a ``SortedList`` ordered by ``(-points, user_id)``. Top-N, rank-of-user and
+neighbours-around-user are then a bisect plus a slice, O(log n) each.
+
+The boards are loaded from MongoDB at startup (``rebuild``) and updated
+incrementally: completions call ``apply_increments``, group joins call
+``move_user``. With several server processes each one only sees its own
+increments, so ``refresh_periodically`` rebuilds every
+``settings.leaderboard_refresh_seconds`` to converge.
+
+Ranks use competition ranking: users with equal points share a rank.
+"""
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+from .repositories import UserRepository
+
+# (user_id, points, rank)
+Entry = Tuple[str, int, int]
+
+
+class Leaderboard:
+    def __init__(self):
+        self._points: Dict[str, int] = {}
+        self._order = SortedList()
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._points
+
+    def points(self, user_id: str) -> Optional[int]:
+        return self._points.get(user_id)
+
+    def set(self, user_id: str, points: int) -> None:
+        previous = self._points.get(user_id)
+        if previous is not None:
+            self._order.remove((-previous, user_id))
+        self._points[user_id] = points
+        self._order.add((-points, user_id))
+
+    def add(self, user_id: str, delta: int) -> None:
+        self.set(user_id, self._points.get(user_id, 0) + delta)
+
+    def remove(self, user_id: str) -> None:
+        previous = self._points.pop(user_id, None)
+        if previous is not None:
+            self._order.remove((-previous, user_id))
+
+    def _rank_of_points(self, points: int) -> int:
+        # "" sorts before every user id, so this is the first position with these points
+        return self._order.bisect_left((-points, "")) + 1
+
+    def _entries(self, start: int, stop: int) -> List[Entry]:
+        return [
+            (user_id, -negated, self._rank_of_points(-negated))
+            for negated, user_id in self._order.islice(max(start, 0), max(stop, 0))
+        ]
+
+    def top(self, limit: int, offset: int = 0) -> List[Entry]:
+        return self._entries(offset, offset + limit)
+
+    def rank(self, user_id: str) -> Optional[int]:
+        points = self._points.get(user_id)
+        if points is None:
+            return None
+        return self._rank_of_points(points)
+
+    def around(self, user_id: str, radius: int) -> List[Entry]:
+        """The user's entry with up to ``radius`` entries above and below it."""
+        points = self._points.get(user_id)
+        if points is None:
+            return []
+        position = self._order.index((-points, user_id))
+        return self._entries(position - radius, position + radius + 1)
+
+
+class LeaderboardRegistry:
+    """The global board plus one board per group, and each user's group."""
+
+    def __init__(self):
+        self.global_board = Leaderboard()
+        self._group_boards: Dict[str, Leaderboard] = {}
+        self._user_groups: Dict[str, str] = {}
+        self.loaded = False
+
+    def board(self, group_id: Optional[str] = None) -> Leaderboard:
+        if group_id is None:
+            return self.global_board
+        return self._group_boards.get(group_id) or Leaderboard()
+
+    def group_of(self, user_id: str) -> Optional[str]:
+        return self._user_groups.get(user_id)
+
+    def set_user(self, user_id: str, points: int, group_id: Optional[str] = None) -> None:
+        self.global_board.set(user_id, points)
+        self._place(user_id, group_id)
+
+    def _place(self, user_id: str, group_id: Optional[str]) -> None:
+        previous = self._user_groups.pop(user_id, None)
+        if previous is not None and previous in self._group_boards:
+            self._group_boards[previous].remove(user_id)
+            if not self._group_boards[previous]:
+                del self._group_boards[previous]
+        if group_id is not None:
+            self._user_groups[user_id] = group_id
+            self._group_boards.setdefault(group_id, Leaderboard()).set(
+                user_id, self.global_board.points(user_id) or 0
+            )
+
+    def move_user(self, user_id: str, group_id: Optional[str]) -> None:
+        """Record that ``user_id`` now belongs to ``group_id`` (or to no group)."""
+        if user_id not in self.global_board:
+            self.global_board.set(user_id, 0)
+        self._place(user_id, group_id)
+
+    def remove_user(self, user_id: str) -> None:
+        self._place(user_id, None)
+        self.global_board.remove(user_id)
+
+    def apply_increments(self, user_increments: Dict[str, int]) -> None:
+        for user_id, points in user_increments.items():
+            self.global_board.add(user_id, points)
+            group_id = self._user_groups.get(user_id)
+            if group_id is not None:
+                self._group_boards[group_id].set(user_id, self.global_board.points(user_id))
+
+    async def rebuild(self, client) -> int:
+        """Reload every board from the users collection; returns the number of users."""
+        registry = LeaderboardRegistry()
+        async for user in UserRepository(client).points_and_groups():
+            group_id = user.get("group_id")
+            registry.set_user(str(user["_id"]), user.get("points", 0), str(group_id) if group_id else None)
+
+        self.global_board = registry.global_board
+        self._group_boards = registry._group_boards
+        self._user_groups = registry._user_groups
+        self.loaded = True
+        return len(self.global_board)
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "users": len(self.global_board),
+            "groups": len(self._group_boards),
+        }
+
+
+async def refresh_periodically(client, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await leaderboards.rebuild(client)
+        except Exception as e:
+            print(f"Leaderboard refresh failed: {e}")
+
+
+leaderboards = LeaderboardRegistry()
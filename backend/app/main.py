@@ -1,15 +1,21 @@
+import asyncio
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from .database import connect_to_mongo, close_mongo_connection
-from .routers import auth, users, tasks, groups, admin, admin_requests
+from .database import connect_to_mongo, close_mongo_connection, db
+from .auth import password_hash_pool
+from .config import settings
+from .leaderboards import leaderboards, refresh_periodically
+from .pagination import NEXT_CURSOR_HEADER
+from .routers import auth, users, tasks, groups, admin, admin_requests, leaderboards as leaderboard_routes
 
 app = FastAPI(
     title="HabitGrove API",
     description="Sustainability habit tracking platform API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -19,6 +25,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Global exception handlers
@@ -59,13 +66,23 @@ async def general_exception_handler(request: Request, exc: Exception):
     )
 
 # Event handlers
+background_tasks = []
+
 @app.on_event("startup")
 async def startup_db_client():
     await connect_to_mongo()
+    print(f"Loaded {await leaderboards.rebuild(db.client)} users into the leaderboards.")
+    if settings.leaderboard_refresh_seconds > 0:
+        background_tasks.append(asyncio.create_task(
+            refresh_periodically(db.client, settings.leaderboard_refresh_seconds)
+        ))
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    for task in background_tasks:
+        task.cancel()
     await close_mongo_connection()
+    password_hash_pool.shutdown()
 
 # Include routers
 app.include_router(auth.router)
@@ -74,6 +91,7 @@ app.include_router(tasks.router)
 app.include_router(groups.router)
 app.include_router(admin.router)
 app.include_router(admin_requests.router)
+app.include_router(leaderboard_routes.router)
 
 @app.get("/")
 async def root():
@@ -0,0 +1,123 @@
+"""Group membership stored in its own collection.
+
+Each membership is one ``group_memberships`` document with a unique
+``(group_id, user_id)`` index, so membership checks are indexed point
+lookups and never load a group's member list. Groups keep a
+``member_count`` counter next to ``total_points``.
+
+Groups created before this collection existed keep their members in the
+``members`` array until ``migrate_group_members`` has copied them over;
+until then ``is_member`` falls back to an array match evaluated on the
+server (see ``settings.membership_array_fallback``).
+"""
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from .codec import object_id
+from .config import settings
+from .repositories import GroupRepository
+
+async def is_member(client, group_id, user_id) -> bool:
+    database = client.habitgrove
+    membership = await database.group_memberships.find_one(
+        {"group_id": object_id(group_id), "user_id": object_id(user_id)},
+        {"_id": 1}
+    )
+    if membership:
+        return True
+
+    if settings.membership_array_fallback:
+        return await GroupRepository(client).has_legacy_member(group_id, user_id)
+    return False
+
+
+async def add_member(client, group_id, user_id) -> bool:
+    """Add ``user_id`` to the group; returns False if already a member."""
+    if settings.membership_array_fallback and await is_member(client, group_id, user_id):
+        return False
+
+    database = client.habitgrove
+    try:
+        await database.group_memberships.insert_one({
+            "group_id": object_id(group_id),
+            "user_id": object_id(user_id),
+            "joined_at": datetime.utcnow(),
+        })
+    except DuplicateKeyError:
+        return False
+
+    await GroupRepository(client).add_to_member_counts({group_id: 1})
+    return True
+
+
+async def remove_user_memberships(client, user_id) -> int:
+    """Delete every membership of ``user_id`` and decrement the member counts."""
+    database = client.habitgrove
+    group_ids = [
+        membership["group_id"]
+        async for membership in database.group_memberships.find({"user_id": object_id(user_id)}, {"group_id": 1})
+    ]
+    if not group_ids:
+        return 0
+
+    await database.group_memberships.delete_many({"user_id": object_id(user_id)})
+    await GroupRepository(client).add_to_member_counts({group_id: -1 for group_id in group_ids})
+    return len(group_ids)
+
+
+async def remove_memberships(client, memberships: Iterable[Tuple]) -> int:
+    """Delete the given ``(group_id, user_id)`` memberships and decrement the member counts."""
+    database = client.habitgrove
+    pairs = [{"group_id": object_id(group_id), "user_id": object_id(user_id)} for group_id, user_id in memberships]
+    if not pairs:
+        return 0
+
+    found = [membership async for membership in database.group_memberships.find({"$or": pairs}, {"group_id": 1})]
+    if not found:
+        return 0
+
+    await database.group_memberships.delete_many({"_id": {"$in": [membership["_id"] for membership in found]}})
+    removed = Counter(membership["group_id"] for membership in found)
+    await GroupRepository(client).add_to_member_counts({group_id: -count for group_id, count in removed.items()})
+    return len(found)
+
+
+async def migrate_group_members(client, remove_arrays: bool = False) -> Dict[str, int]:
+    """Copy legacy ``members`` arrays into ``group_memberships``.
+
+    Upserts make the migration safe to re-run. Each migrated group's
+    ``member_count`` is recomputed from the collection, and with
+    ``remove_arrays`` its ``members`` array is dropped afterwards.
+    """
+    database = client.habitgrove
+    groups = GroupRepository(client)
+    groups_migrated = 0
+    memberships_upserted = 0
+    now = datetime.utcnow()
+
+    async for group in groups.with_legacy_members():
+        writes = [
+            UpdateOne(
+                {"group_id": group["_id"], "user_id": object_id(member)},
+                {"$setOnInsert": {"joined_at": now}},
+                upsert=True
+            )
+            for member in group["members"]
+            if ObjectId.is_valid(str(member))
+        ]
+        for start in range(0, len(writes), settings.bulk_insert_batch_size):
+            result = await database.group_memberships.bulk_write(
+                writes[start:start + settings.bulk_insert_batch_size], ordered=False
+            )
+            memberships_upserted += result.upserted_count
+
+        member_count = await database.group_memberships.count_documents({"group_id": group["_id"]})
+        await groups.set_member_count(group["_id"], member_count, remove_arrays)
+        groups_migrated += 1
+
+    return {"groups_migrated": groups_migrated, "memberships_upserted": memberships_upserted}
@@ -1,11 +1,14 @@
-from .user import User, UserCreate, UserUpdate
-from .group import Group, GroupCreate, GroupUpdate
+from .user import User, UserCreate, UserUpdate, RosterMember, RosterImportResult
+from .group import Group, GroupCreate, GroupUpdate, GroupSummary, GroupAdmin, GroupProfile
 from .task import Task, TaskCreate, TaskUpdate
-from .task_completion import TaskCompletion, TaskCompletionCreate
+from .leaderboard import LeaderboardEntry, GroupLeaderboardEntry, LeaderboardPosition
+from .task_completion import TaskCompletion, TaskCompletionCreate, TaskCompletionBatch, TaskCompletionBatchResult
 
 __all__ = [
-    "User", "UserCreate", "UserUpdate",
-    "Group", "GroupCreate", "GroupUpdate",
+    "User", "UserCreate", "UserUpdate", "RosterMember", "RosterImportResult",
+    "Group", "GroupCreate", "GroupUpdate", "GroupSummary", "GroupAdmin", "GroupProfile",
     "Task", "TaskCreate", "TaskUpdate",
-    "TaskCompletion", "TaskCompletionCreate"
+    "TaskCompletion", "TaskCompletionCreate",
+    "TaskCompletionBatch", "TaskCompletionBatchResult",
+    "LeaderboardEntry", "GroupLeaderboardEntry", "LeaderboardPosition"
 ] 
\ No newline at end of file
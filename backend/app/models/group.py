@@ -2,6 +2,9 @@ from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
+from .task import Task
+from .task_completion import TaskCompletion
+from ..codec import ObjectIdStr
 
 
 class GroupBase(BaseModel):
@@ -27,10 +30,11 @@ class GroupUpdate(BaseModel):
 
 
 class Group(GroupBase):
-    id: Optional[str] = None
-    members: List[str] = []
-    admins: List[str] = []  # Admin user IDs
+    id: Optional[ObjectIdStr] = None
+    admins: List[ObjectIdStr] = []  # Admin user IDs
+    member_count: int = 0
     total_points: int = 0
+    point_shards: int = 0  # > 0 spreads point increments over counter shards
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Config:
@@ -38,10 +42,36 @@ class Group(GroupBase):
         populate_by_name = True
 
 
+class GroupSummary(BaseModel):
+    id: str
+    name: str
+    type: str
+    member_count: int = 0
+    admin_count: int = 0
+    total_points: int = 0
+
+
+class GroupAdmin(BaseModel):
+    id: str
+    name: str = ""
+    email: str = ""
+    points: int = 0
+    full_name: str = ""
+    profession: str = ""
+    bio: str = ""
+
+
+class GroupProfile(BaseModel):
+    group: GroupSummary
+    admins: List[GroupAdmin] = []
+    tasks: List[Task] = []
+    recent_completions: List[TaskCompletion] = []
+
+
 class AdminRequest(BaseModel):
-    id: Optional[str] = None
-    group_id: str
-    user_id: str
+    id: Optional[ObjectIdStr] = None
+    group_id: ObjectIdStr
+    user_id: ObjectIdStr
     reason: str = Field(..., min_length=10, max_length=500)
     full_name: str = Field(..., min_length=2, max_length=100)
     email: str = Field(..., pattern=r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
@@ -50,7 +80,7 @@ class AdminRequest(BaseModel):
     status: str = Field(default="pending", pattern="^(pending|approved|rejected)$")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     reviewed_at: Optional[datetime] = None
-    reviewed_by: Optional[str] = None
+    reviewed_by: Optional[ObjectIdStr] = None
     admin_notes: Optional[str] = None
 
     class Config:
@@ -77,4 +107,8 @@ class AdminRequestUpdate(BaseModel):
 
     class Config:
         json_encoders = {ObjectId: str}
-        populate_by_name = True 
\ No newline at end of file
+        populate_by_name = True
+
+
+class AdminRequestBulkReview(AdminRequestUpdate):
+    request_ids: List[str] = Field(..., min_items=1, max_items=500) 
\ No newline at end of file
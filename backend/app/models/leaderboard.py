@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class LeaderboardEntry(BaseModel):
+    user_id: str
+    name: str = ""
+    points: int
+    rank: int
+
+
+class GroupLeaderboardEntry(BaseModel):
+    group_id: str
+    name: str = ""
+    points: int
+    rank: int
+
+
+class LeaderboardPosition(BaseModel):
+    rank: Optional[int] = None  # None when the user is not on the board
+    total: int
+    points: int = 0
+    neighbours: List[LeaderboardEntry] = []
@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 from bson import ObjectId
+from ..codec import ObjectIdStr
 
 
 class TaskBase(BaseModel):
@@ -13,7 +14,7 @@ class TaskBase(BaseModel):
     points: int = Field(..., ge=1, le=2000)
     isActive: bool = True
     is_group_task: bool = False
-    group_id: Optional[str] = None
+    group_id: Optional[ObjectIdStr] = None
 
     class Config:
         json_encoders = {ObjectId: str}
@@ -41,7 +42,7 @@ class TaskUpdate(BaseModel):
 
 
 class Task(TaskBase):
-    id: str = Field(alias="_id")
+    id: ObjectIdStr = Field(alias="_id")
 
     class Config:
         json_encoders = {ObjectId: str}
@@ -49,8 +50,19 @@ class Task(TaskBase):
 
 
 class BulkTaskUpload(BaseModel):
-    tasks: list[TaskCreate] = Field(..., min_items=1, max_items=100)
+    tasks: list[TaskCreate] = Field(..., min_items=1, max_items=1000)
 
     class Config:
         json_encoders = {ObjectId: str}
-        populate_by_name = True 
\ No newline at end of file
+        populate_by_name = True
+
+
+class BulkRowError(BaseModel):
+    row: int
+    error: str
+
+
+class BulkImportResult(BaseModel):
+    inserted: int
+    failed: int
+    errors: list[BulkRowError] = [] 
\ No newline at end of file
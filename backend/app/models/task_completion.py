@@ -1,13 +1,14 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
 from bson import ObjectId
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from ..codec import ObjectIdStr
 
 
 class TaskCompletionBase(BaseModel):
-    task_id: str
-    user_id: str
-    group_id: Optional[str] = None
+    task_id: ObjectIdStr
+    user_id: ObjectIdStr
+    group_id: Optional[ObjectIdStr] = None
 
     class Config:
         json_encoders = {ObjectId: str}
@@ -19,11 +20,33 @@ class TaskCompletionCreate(TaskCompletionBase):
 
 
 class TaskCompletion(TaskCompletionBase):
-    id: str = Field(alias="_id")
+    id: ObjectIdStr = Field(alias="_id")
     completed_at: datetime = Field(default_factory=datetime.utcnow)
     points_earned: int
+    period_key: Optional[str] = None
     task: Optional[Dict[str, Any]] = None
+    user: Optional[Dict[str, Any]] = None
 
     class Config:
         json_encoders = {ObjectId: str}
-        populate_by_name = True 
\ No newline at end of file
+        populate_by_name = True 
+
+class TaskCompletionBatch(BaseModel):
+    completions: List[TaskCompletionCreate] = Field(..., min_items=1, max_items=500)
+
+    class Config:
+        json_encoders = {ObjectId: str}
+        populate_by_name = True
+
+
+class TaskCompletionBatchItem(BaseModel):
+    index: int
+    success: bool
+    completion: Optional[TaskCompletion] = None
+    error: Optional[str] = None
+
+
+class TaskCompletionBatchResult(BaseModel):
+    completed: int
+    failed: int
+    results: List[TaskCompletionBatchItem]
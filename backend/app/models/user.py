@@ -2,6 +2,8 @@ from pydantic import BaseModel, Field, EmailStr
 from datetime import datetime
 from typing import Optional, List
 from bson import ObjectId
+from .task import BulkRowError
+from ..codec import ObjectIdStr
 
 
 class UserBase(BaseModel):
@@ -28,13 +30,44 @@ class UserUpdate(BaseModel):
 
 
 class User(UserBase):
-    id: Optional[str] = None
+    id: Optional[ObjectIdStr] = None
     points: int = 0
-    group_id: Optional[str] = None
+    group_id: Optional[ObjectIdStr] = None
     favorite_tasks: List[str] = []
     is_admin: bool = False  # System admin flag
     created_at: Optional[datetime] = None
 
     class Config:
         json_encoders = {ObjectId: str}
-        populate_by_name = True 
\ No newline at end of file
+        populate_by_name = True
+
+
+class RosterMember(UserBase):
+    # Members without a password get an invite token instead
+    password: Optional[str] = Field(None, min_length=6)
+
+
+class RosterInvite(BaseModel):
+    row: int
+    email: str
+    token: str
+
+
+class RosterImportResult(BaseModel):
+    import_id: str
+    group_id: str
+    status: str
+    rows_processed: int = 0
+    users_created: int = 0
+    users_existing: int = 0
+    memberships_added: int = 0
+    failed: int = 0
+    errors: List[BulkRowError] = []
+    invites: List[RosterInvite] = []
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class AcceptInvite(BaseModel):
+    token: str
+    password: str = Field(..., min_length=6)
@@ -0,0 +1,95 @@
+"""Opaque cursors for keyset pagination.
+
+List endpoints that page by a sort key return the cursor for the next page
+in the ``X-Next-Cursor`` response header, so their JSON bodies stay plain
+lists. Clients pass it back unchanged as the ``cursor`` query parameter.
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, List, Optional
+
+from bson import ObjectId, json_util
+from fastapi import HTTPException, Response, status
+
+from .projections import model_projection
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Sort key values a cursor may hold; None is the key of legacy documents missing it.
+# Anything else, such as a dict, could smuggle query operators into keyset filters.
+CURSOR_VALUE_TYPES = (ObjectId, datetime, str, int, float, type(None))
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key values of the last item of a page."""
+    raw = json_util.dumps(list(values)).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> List[Any]:
+    """Decode a cursor made by ``encode_cursor`` holding ``size`` scalar values."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError, binascii.Error):
+        values = None
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(isinstance(value, CURSOR_VALUE_TYPES) for value in values)
+    ):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def keyset_filter(field: str, value: Any, last_id: Any, descending: bool = True) -> dict:
+    """Filter selecting the items after ``(value, last_id)`` in a sort on ``field`` then ``_id``."""
+    op = "$lt" if descending else "$gt"
+    return {"$or": [
+        {field: {op: value}},
+        {field: value, "_id": {op: last_id}},
+    ]}
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]) -> None:
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
+
+async def find_page_by_id(
+    collection,
+    filter_query: dict,
+    response: Response,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    projection: Optional[dict] = None,
+    model: Optional[type] = None,
+) -> List[dict]:
+    """Return one page of ``collection`` in ``_id`` order.
+
+    With a ``cursor`` the page starts right after the ``_id`` it holds, which
+    is an index seek whatever the depth. Without one, ``skip`` is applied for
+    compatibility with offset-based clients. Either way the cursor for the
+    next page is set on ``response`` when more documents exist.
+
+    With a ``model`` and no ``projection``, only the fields the model reads
+    are fetched.
+    """
+    if cursor:
+        (last_id,) = decode_cursor(cursor, 1)
+        filter_query = {"$and": [filter_query, {"_id": {"$gt": last_id}}]} if filter_query else {"_id": {"$gt": last_id}}
+        skip = 0
+
+    if projection is None and model is not None:
+        projection = model_projection(model)
+    query = collection.find(filter_query, projection).sort("_id", 1)
+    if skip:
+        query = query.skip(skip)
+    documents = await query.limit(limit + 1).to_list(length=limit + 1)
+
+    if len(documents) > limit:
+        documents = documents[:limit]
+        set_next_cursor(response, encode_cursor(documents[-1]["_id"]))
+    return documents
@@ -0,0 +1,42 @@
+from datetime import datetime
+
+# Messages returned when a task was already completed in the current period
+ALREADY_COMPLETED_MESSAGES = {
+    "daily": "Bu görev bugün zaten tamamlandı",
+    "weekly": "Bu görev bu hafta zaten tamamlandı",
+    "monthly": "Bu görev bu ay zaten tamamlandı",
+    "yearly": "Bu görev bu yıl zaten tamamlandı",
+}
+DEFAULT_ALREADY_COMPLETED_MESSAGE = "Bu görev zaten tamamlandı"
+
+
+def period_key(task_type: str, at: datetime) -> str:
+    """Return the completion window a task completed at ``at`` falls into.
+
+    A task may be completed once per window, so ``(user_id, task_id,
+    period_key)`` is unique across task completions. Unknown types fall back
+    to daily windows, matching the historical behaviour.
+    """
+    if task_type == "weekly":
+        year, week, _ = at.isocalendar()
+        return f"week:{year}-W{week:02d}"
+    if task_type == "monthly":
+        return f"month:{at.year}-{at.month:02d}"
+    if task_type == "yearly":
+        return f"year:{at.year}"
+    if task_type == "one_time":
+        return "once"
+    return f"day:{at.year}-{at.month:02d}-{at.day:02d}"
+
+
+# Leaderboard windows and the task type whose period_key names them
+BUCKET_WINDOWS = {"day": "daily", "week": "weekly", "month": "monthly"}
+
+
+def bucket_periods(at: datetime) -> list:
+    """Return the day, ISO week and month keys of the point buckets ``at`` counts towards."""
+    return [period_key(task_type, at) for task_type in BUCKET_WINDOWS.values()]
+
+
+def already_completed_message(task_type: str) -> str:
+    return ALREADY_COMPLETED_MESSAGES.get(task_type, DEFAULT_ALREADY_COMPLETED_MESSAGE)
@@ -0,0 +1,104 @@
+"""Per-period point tallies for windowed leaderboards.
+
+Every recorded completion adds its points to ``point_buckets`` documents
+keyed by ``(kind, owner_id, period)``: one per user and one per group for
+the day, ISO week and month it was completed in (``periods.bucket_periods``).
+User buckets also carry the user's ``group_id`` so a group's weekly ranking
+is a single indexed query; it is the group of their latest completion in
+that period that had one, so completions posted without a group never clear
+it.
+
+``backfill_point_buckets`` rebuilds the buckets from ``task_completions``,
+read oldest first so each bucket ends with the group of its period.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from .config import settings
+from .periods import bucket_periods
+from .repositories import CompletionRepository
+
+USER = "user"
+GROUP = "group"
+
+BucketKey = Tuple[str, ObjectId, str]
+# (user_id, period) -> the group of the user's bucket in that period
+UserGroups = Dict[Tuple[ObjectId, str], Optional[ObjectId]]
+
+
+def _tally(points: Dict[BucketKey, int], user_groups: UserGroups, completion: dict) -> None:
+    completed_at = completion.get("completed_at") or completion.get("created_at")
+    if not isinstance(completed_at, datetime):
+        return
+    user_id = completion["user_id"]
+    group_id = completion.get("group_id")
+    for period in bucket_periods(completed_at):
+        # A completion posted without a group keeps the group already recorded
+        if group_id or (user_id, period) not in user_groups:
+            user_groups[(user_id, period)] = group_id
+        points[(USER, user_id, period)] += completion.get("points_earned", 0)
+        if group_id:
+            points[(GROUP, group_id, period)] += completion.get("points_earned", 0)
+
+
+def _bucket_writes(points, user_groups, operator: str) -> List[UpdateOne]:
+    writes = []
+    for (kind, owner_id, period), value in points.items():
+        update = {operator: {"points": value}}
+        if kind == USER:
+            # Only a completion with a group moves the bucket; others never clear it
+            group_id = user_groups.get((owner_id, period))
+            if group_id:
+                update["$set"] = {**update.get("$set", {}), "group_id": group_id}
+            else:
+                update["$setOnInsert"] = {"group_id": None}
+        writes.append(UpdateOne({"kind": kind, "owner_id": owner_id, "period": period}, update, upsert=True))
+    return writes
+
+
+async def add_to_point_buckets(client, completions: List[dict], session=None) -> None:
+    """Add the points of newly stored ``completions`` to their buckets."""
+    points, user_groups = defaultdict(int), {}
+    for completion in completions:
+        _tally(points, user_groups, completion)
+    writes = _bucket_writes(points, user_groups, "$inc")
+    if writes:
+        await client.habitgrove.point_buckets.bulk_write(writes, ordered=False, session=session)
+
+
+async def backfill_point_buckets(client) -> Dict[str, int]:
+    """Recompute every bucket from ``task_completions``.
+
+    Bucket values are overwritten with the recomputed sums, so the job is
+    safe to re-run; points recorded while it runs may be overwritten in
+    the buckets of the current periods and are restored by running it again.
+    """
+    database = client.habitgrove
+    points, user_groups = defaultdict(int), {}
+    async for completion in CompletionRepository(client).point_history():
+        _tally(points, user_groups, completion)
+
+    writes = _bucket_writes(points, user_groups, "$set")
+    buckets_written = 0
+    for start in range(0, len(writes), settings.bulk_insert_batch_size):
+        result = await database.point_buckets.bulk_write(
+            writes[start:start + settings.bulk_insert_batch_size], ordered=False
+        )
+        buckets_written += result.upserted_count + result.modified_count
+
+    return {"buckets": len(writes), "buckets_written": buckets_written}
+
+
+async def top_buckets(client, kind: str, period: str, limit: int, offset: int = 0, group_id=None) -> List[dict]:
+    """Highest-scoring buckets of ``kind`` in ``period``, optionally within one group."""
+    filter_query = {"kind": kind, "period": period}
+    if group_id is not None:
+        filter_query["group_id"] = group_id
+    cursor = client.habitgrove.point_buckets.find(filter_query, {"owner_id": 1, "points": 1}).sort(
+        [("points", -1), ("owner_id", 1)]
+    ).skip(offset).limit(limit)
+    return await cursor.to_list(length=limit)
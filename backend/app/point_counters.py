@@ -0,0 +1,121 @@
+"""Sharded group point counters.
+
+A completion normally does ``$inc total_points`` on its group document, so
+every completion in a busy group contends on that one document. Groups with
+``point_shards`` set to N > 0 instead spread their increments over N
+``group_point_shards`` documents, ``(group_id, shard)``, picked at random.
+
+A sharded group's points are ``total_points`` (everything awarded before
+sharding was enabled) plus the sum of its shards. ``add_sharded_points``
+adds that sum to group documents being returned; sums are cached for
+``settings.group_points_cache_ttl_seconds``. Setting ``point_shards`` back
+to 0 routes new increments to ``total_points`` again while the existing
+shards keep being counted, so switching modes never loses points.
+
+Lists sorted by ``total_points`` (the admin statistics top groups) only see
+the unsharded part of a sharded group's points.
+"""
+import random
+from typing import Dict, Iterable, List
+
+from pymongo import UpdateOne
+
+from .cache import TTLCache
+from .codec import object_id
+from .config import settings
+from .repositories import GroupRepository
+
+# group_id -> number of shards (0 when the group is not sharded)
+shard_counts = TTLCache(maxsize=10000, ttl=settings.point_shard_config_ttl_seconds)
+# group_id -> sum of the group's shard documents
+shard_totals = TTLCache(maxsize=10000, ttl=settings.group_points_cache_ttl_seconds)
+
+
+async def get_shard_counts(client, group_ids: Iterable[str]) -> Dict[str, int]:
+    """Return the shard count of each group, reading uncached ones in one query."""
+    counts = {}
+    missing = []
+    for group_id in group_ids:
+        count = shard_counts.get(group_id)
+        if count is None:
+            missing.append(group_id)
+        else:
+            counts[group_id] = count
+
+    if missing:
+        found = {group_id: 0 for group_id in missing}
+        found.update(await GroupRepository(client).point_shards(missing))
+        for group_id, count in found.items():
+            shard_counts.set(group_id, count)
+        counts.update(found)
+
+    return counts
+
+
+async def write_shard_increments(client, shard_writes: List[UpdateOne], session=None) -> None:
+    """Apply the ``group_point_shards`` writes of ``group_increment_writes``."""
+    await client.habitgrove.group_point_shards.bulk_write(shard_writes, ordered=False, session=session)
+
+
+def group_increment_writes(group_increments: Dict[str, int], counts: Dict[str, int]):
+    """Split ``group_increments`` into writes for ``groups`` and ``group_point_shards``."""
+    group_writes = []
+    shard_writes = []
+    for group_id, points in group_increments.items():
+        shards = counts.get(group_id, 0)
+        if shards > 0:
+            shard_writes.append(UpdateOne(
+                {"group_id": object_id(group_id), "shard": random.randrange(shards)},
+                {"$inc": {"points": points}},
+                upsert=True
+            ))
+        else:
+            group_writes.append(UpdateOne({"_id": object_id(group_id)}, {"$inc": {"total_points": points}}))
+    return group_writes, shard_writes
+
+
+async def get_shard_totals(client, group_ids: Iterable[str]) -> Dict[str, int]:
+    """Return the summed shard points of each group, summing uncached ones in one aggregation."""
+    totals = {}
+    missing = []
+    for group_id in group_ids:
+        total = shard_totals.get(group_id)
+        if total is None:
+            missing.append(group_id)
+        else:
+            totals[group_id] = total
+
+    if missing:
+        found = {group_id: 0 for group_id in missing}
+        cursor = client.habitgrove.group_point_shards.aggregate([
+            {"$match": {"group_id": {"$in": [object_id(group_id) for group_id in missing]}}},
+            {"$group": {"_id": "$group_id", "points": {"$sum": "$points"}}},
+        ])
+        async for row in cursor:
+            found[str(row["_id"])] = row["points"]
+        for group_id, total in found.items():
+            shard_totals.set(group_id, total)
+        totals.update(found)
+
+    return totals
+
+
+async def add_sharded_points(client, groups: List[dict]) -> List[dict]:
+    """Add shard sums to the ``total_points`` of groups that have ``point_shards`` set.
+
+    ``groups`` must have been read with ``point_shards`` in their projection.
+    """
+    sharded = [group for group in groups if group.get("point_shards") is not None]
+    if sharded:
+        totals = await get_shard_totals(client, {str(group["_id"]) for group in sharded})
+        for group in sharded:
+            group["total_points"] = group.get("total_points", 0) + totals.get(str(group["_id"]), 0)
+    return groups
+
+
+async def set_point_shards(client, group_id: str, shards: int) -> bool:
+    """Set how many shards ``group_id`` spreads its increments over; 0 turns sharding off."""
+    found = await GroupRepository(client).update_fields(group_id, {"point_shards": shards})
+    shard_counts.invalidate(group_id)
+    shard_totals.invalidate(group_id)
+    return found
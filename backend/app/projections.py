@@ -0,0 +1,30 @@
+"""Projections derived from response models.
+
+List endpoints only need the fields their response model reads. Asking
+MongoDB for just those keeps stored-only fields such as ``password_hash``,
+the invite token hashes or ``name_search`` off the wire and out of the BSON
+decoder.
+"""
+from functools import lru_cache
+from typing import Dict, FrozenSet
+
+from pydantic import BaseModel
+
+
+@lru_cache(maxsize=None)
+def model_fields(model: type[BaseModel]) -> FrozenSet[str]:
+    """Document keys read by ``model``: field names, their aliases and ``_id``."""
+    names = {"_id"}
+    for name, field in model.model_fields.items():
+        names.add(name)
+        if field.alias:
+            names.add(field.alias)
+    return frozenset(names)
+
+
+def model_projection(model: type[BaseModel]) -> Dict[str, int]:
+    """Inclusion projection of the stored fields ``model`` reads.
+
+    ``id`` is left out: it is derived from ``_id`` (see ``app.codec``).
+    """
+    return {field: 1 for field in sorted(model_fields(model)) if field != "id"}
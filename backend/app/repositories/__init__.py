@@ -0,0 +1,17 @@
+"""Per-collection data access (see ``base.Repository``).
+
+Every read and write of ``users``, ``tasks``, ``groups``, ``task_completions``
+and ``admin_requests`` goes through these repositories. Collections that
+belong to one module are accessed only by that module and have no
+repository: ``group_memberships`` (``memberships``, plus the membership
+upserts of ``roster_import``), ``point_buckets`` (``point_buckets``),
+``group_point_shards`` (``point_counters``) and ``roster_imports``
+(``roster_import``).
+"""
+from .users import UserRepository
+from .tasks import TaskRepository
+from .groups import GroupRepository
+from .completions import CompletionRepository
+from .admin_requests import AdminRequestRepository
+
+__all__ = ["UserRepository", "TaskRepository", "GroupRepository", "CompletionRepository", "AdminRequestRepository"]
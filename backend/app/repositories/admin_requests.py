@@ -0,0 +1,78 @@
+import uuid
+from typing import Iterable, List, Optional
+
+from fastapi import Response
+from pymongo import ReturnDocument
+
+from ..models.group import AdminRequest
+from ..projections import model_projection
+from .base import Repository, object_id
+
+ADMIN_REQUEST_PROJECTION = model_projection(AdminRequest)
+# What a group's admin list shows from each admin's request
+ADMIN_PROFILE_PROJECTION = {"user_id": 1, "full_name": 1, "profession": 1, "bio": 1}
+
+
+class AdminRequestRepository(Repository):
+    collection_name = "admin_requests"
+
+    async def get(self, request_id) -> Optional[dict]:
+        return await self.collection.find_one({"_id": object_id(request_id)}, ADMIN_REQUEST_PROJECTION)
+
+    async def has_pending(self, group_id, user_id) -> bool:
+        request = await self.collection.find_one(
+            {"group_id": object_id(group_id), "user_id": object_id(user_id), "status": "pending"},
+            {"_id": 1}
+        )
+        return request is not None
+
+    async def for_user(self, user_id, limit: int = 100) -> List[dict]:
+        return await self.collection.find(
+            {"user_id": object_id(user_id)}, ADMIN_REQUEST_PROJECTION
+        ).to_list(length=limit)
+
+    async def profiles(self, group_id, user_ids: List) -> List[dict]:
+        """Profile fields of the requests the given users made for the group."""
+        return await self.collection.find(
+            {"group_id": object_id(group_id), "user_id": {"$in": user_ids}}, ADMIN_PROFILE_PROJECTION
+        ).to_list(length=None)
+
+    async def page(
+        self,
+        filter_query: dict,
+        response: Response,
+        limit: int,
+        cursor=None,
+        skip: int = 0,
+    ) -> List[dict]:
+        return await super().page(filter_query, response, limit, cursor, skip, ADMIN_REQUEST_PROJECTION)
+
+    async def insert(self, request: dict):
+        result = await self.collection.insert_one(request)
+        return result.inserted_id
+
+    async def review(self, request_id, review: dict) -> Optional[dict]:
+        """``$set`` the review fields; returns the request's group and user, or None if not found."""
+        return await self.collection.find_one_and_update(
+            {"_id": object_id(request_id)},
+            {"$set": review},
+            projection={"group_id": 1, "user_id": 1},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def review_pending(self, request_ids: Iterable, review: dict) -> List[dict]:
+        """``$set`` the review fields of the given requests still pending, with one write.
+
+        The write tags the requests with a new ``review_batch`` id, so reading
+        them back by it returns exactly those this call moved out of pending,
+        whatever other reviews run concurrently. Returns their group and user.
+        """
+        object_ids = [object_id(request_id) for request_id in request_ids]
+        review_batch = uuid.uuid4().hex
+        await self.collection.update_many(
+            {"_id": {"$in": object_ids}, "status": "pending"},
+            {"$set": {**review, "review_batch": review_batch}}
+        )
+        return await self.collection.find(
+            {"_id": {"$in": object_ids}, "review_batch": review_batch}, {"group_id": 1, "user_id": 1}
+        ).to_list(length=len(object_ids))
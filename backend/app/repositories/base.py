@@ -0,0 +1,93 @@
+import asyncio
+from typing import Iterable, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from fastapi import Response
+
+from ..codec import object_id
+from ..pagination import find_page_by_id
+
+
+class Repository:
+    """Access to one collection of the habitgrove database.
+
+    Subclasses set ``collection_name`` and add purpose-specific reads, each
+    with the projection its callers need, so query shapes (and the indexes
+    that serve them) live next to each other instead of in the routers.
+    """
+
+    collection_name: str
+
+    def __init__(self, client):
+        self.client = client
+        self.collection = client.habitgrove[self.collection_name]
+
+    async def exists(self, document_id) -> bool:
+        return await self.collection.find_one({"_id": object_id(document_id)}, {"_id": 1}) is not None
+
+    async def existing_ids(self, document_ids: Iterable) -> Set[ObjectId]:
+        object_ids = list({object_id(document_id) for document_id in document_ids})
+        if not object_ids:
+            return set()
+        return {
+            document["_id"]
+            async for document in self.collection.find({"_id": {"$in": object_ids}}, {"_id": 1})
+        }
+
+    async def page(
+        self,
+        filter_query: dict,
+        response: Response,
+        limit: int,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        projection: Optional[dict] = None,
+    ) -> List[dict]:
+        """One page in ``_id`` order; see ``pagination.find_page_by_id``."""
+        return await find_page_by_id(self.collection, filter_query, response, limit, cursor, skip, projection)
+
+    async def update_fields(self, document_id, fields: dict) -> bool:
+        """``$set`` ``fields``; returns False if the document does not exist."""
+        result = await self.collection.update_one({"_id": object_id(document_id)}, {"$set": fields})
+        return result.matched_count > 0
+
+    async def insert_many(self, documents: List[dict]) -> None:
+        """Insert ``documents`` unordered in one round trip.
+
+        Rejected documents raise ``BulkWriteError`` once the rest are stored.
+        """
+        await self.collection.insert_many(documents, ordered=False)
+
+    async def bulk_write(self, writes: List, session=None):
+        """Apply ``writes`` unordered in one round trip."""
+        return await self.collection.bulk_write(writes, ordered=False, session=session)
+
+    async def delete(self, document_id) -> bool:
+        result = await self.collection.delete_one({"_id": object_id(document_id)})
+        return result.deleted_count > 0
+
+    async def count(self, filter_query: Optional[dict] = None, estimate: bool = False) -> int:
+        """Count matching documents; ``estimate`` uses collection metadata when unfiltered."""
+        if estimate and not filter_query:
+            return await self.collection.estimated_document_count()
+        return await self.collection.count_documents(filter_query or {})
+
+    async def top(self, sort_field: str, projection: dict, limit: int) -> List[dict]:
+        """The ``limit`` documents with the highest ``sort_field``.
+
+        ``$sort`` and ``$limit`` open the pipeline so they run on an index of
+        ``sort_field``, and ``projection`` (which may hold expressions) only
+        sees the documents kept.
+        """
+        return await self.collection.aggregate([
+            {"$sort": {sort_field: -1}}, {"$limit": limit}, {"$project": projection}
+        ]).to_list(length=limit)
+
+    async def count_and_top(self, sort_field: str, projection: dict, limit: int) -> Tuple[int, List[dict]]:
+        """Count the collection and fetch its top documents, concurrently.
+
+        A ``$sort`` inside ``$facet`` cannot use an index, so the top list is
+        its own indexed query next to the count.
+        """
+        total, top = await asyncio.gather(self.count(), self.top(sort_field, projection, limit))
+        return total, top
@@ -0,0 +1,114 @@
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import Response
+
+from ..fieldsets import Fieldset, sparse_projection
+from ..models.task_completion import TaskCompletion
+from ..pagination import decode_cursor, encode_cursor, keyset_filter, set_next_cursor
+from ..periods import period_key
+from ..projections import model_projection
+from .base import Repository, object_id
+
+# Legacy completions only have created_at, which stands in for completed_at
+COMPLETION_PROJECTION = {**model_projection(TaskCompletion), "created_at": 1}
+NEWEST_FIRST = [("completed_at", -1), ("_id", -1)]
+# Read whatever the fieldset: the page key, its legacy fallback and the feed joins
+FEED_KEYS = ("completed_at", "created_at", "task_id", "user_id")
+
+
+class CompletionRepository(Repository):
+    collection_name = "task_completions"
+
+    async def insert(self, completion: dict, session=None):
+        result = await self.collection.insert_one(completion, session=session)
+        return result.inserted_id
+
+    async def without_period_keys(self) -> List[dict]:
+        """Completions stored before period keys existed, with what derives their key."""
+        return await self.collection.find(
+            {"period_key": {"$exists": False}},
+            {"user_id": 1, "task_id": 1, "completed_at": 1, "created_at": 1}
+        ).to_list(length=None)
+
+    def point_history(self) -> AsyncIterator[dict]:
+        """Every completion's user, group, time and points, oldest first, for the point bucket backfill.
+
+        Legacy completions are placed by ``created_at``. No index serves this
+        order, so the sort may spill to disk.
+        """
+        return self.collection.aggregate([
+            {"$project": {
+                "user_id": 1, "group_id": 1, "completed_at": 1, "created_at": 1, "points_earned": 1,
+                "sorted_at": {"$ifNull": ["$completed_at", "$created_at"]},
+            }},
+            {"$sort": {"sorted_at": 1, "_id": 1}},
+        ], allowDiskUse=True)
+
+    async def newest_first(
+        self,
+        filter_query: dict,
+        response: Response,
+        limit: int,
+        cursor: Optional[str] = None,
+        fields: Optional[Fieldset] = None,
+    ) -> List[dict]:
+        """One page of completions keyed on (completed_at, _id), newest first.
+
+        The cursor of the next page is set on ``response`` when more exist.
+        """
+        projection = sparse_projection(COMPLETION_PROJECTION, TaskCompletion, fields, FEED_KEYS)
+        if cursor:
+            last_completed_at, last_id = decode_cursor(cursor, 2)
+            filter_query = {"$and": [filter_query, keyset_filter("completed_at", last_completed_at, last_id)]}
+
+        # Fetch one extra document to know whether another page exists
+        completions = await self.collection.find(filter_query, projection).sort(
+            NEWEST_FIRST
+        ).limit(limit + 1).to_list(length=limit + 1)
+
+        if len(completions) > limit:
+            completions = completions[:limit]
+            last = completions[-1]
+            set_next_cursor(response, encode_cursor(last.get("completed_at"), last["_id"]))
+        return completions
+
+    async def recent_for_group(self, group_id, limit: int) -> List[dict]:
+        return await self.collection.find({"group_id": object_id(group_id)}, COMPLETION_PROJECTION).sort(
+            NEWEST_FIRST
+        ).limit(limit).to_list(length=limit)
+
+    async def existing_period_keys(self, completions: Iterable[dict]) -> Set[Tuple[str, str, str]]:
+        """(user_id, task_id, period_key) of the given completions already recorded."""
+        keys = [
+            {"user_id": c["user_id"], "task_id": c["task_id"], "period_key": c["period_key"]}
+            for c in completions
+        ]
+        if not keys:
+            return set()
+        cursor = self.collection.find({"$or": keys}, {"user_id": 1, "task_id": 1, "period_key": 1})
+        return {(str(c["user_id"]), str(c["task_id"]), c["period_key"]) async for c in cursor}
+
+    async def legacy_period_keys(
+        self, completions: Iterable[dict], task_types: Dict[str, Optional[str]]
+    ) -> Set[Tuple[str, str, str]]:
+        """(user_id, task_id, period_key) already taken by completions stored without a key.
+
+        Their keys are derived from ``completed_at`` (or ``created_at``) and
+        the type in ``task_types``, keyed by task id string.
+        """
+        pairs = {(c["user_id"], c["task_id"]) for c in completions}
+        if not pairs:
+            return set()
+        cursor = self.collection.find(
+            {"$or": [{"user_id": user_id, "task_id": task_id} for user_id, task_id in pairs],
+             "period_key": {"$exists": False}},
+            {"user_id": 1, "task_id": 1, "completed_at": 1, "created_at": 1}
+        )
+        keys = set()
+        async for c in cursor:
+            completed_at = c.get("completed_at") or c.get("created_at")
+            if isinstance(completed_at, datetime):
+                task_id = str(c["task_id"])
+                keys.add((str(c["user_id"]), task_id, period_key(task_types.get(task_id), completed_at)))
+        return keys
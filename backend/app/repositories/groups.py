@@ -0,0 +1,196 @@
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+
+from fastapi import Response
+from pymongo import ReturnDocument, UpdateOne
+
+from ..fieldsets import Fieldset, sparse_projection
+from ..models.group import Group
+from ..pagination import decode_cursor, encode_cursor, keyset_filter, set_next_cursor
+from ..projections import model_projection
+from .base import Repository, object_id
+
+# The group name folded for prefix search (see ``group_search``)
+SEARCH_FIELD = "name_search"
+
+# Member count for groups whose counter has not been migrated yet
+MEMBER_COUNT_EXPRESSION = {
+    "$ifNull": ["$member_count", {"$size": {"$ifNull": ["$members", []]}}]
+}
+
+# find() projection of the Group fields with the member count instead of the array
+GROUP_PROJECTION = {
+    "name": 1,
+    "type": 1,
+    "admins": 1,
+    "total_points": 1,
+    "point_shards": 1,
+    "created_at": 1,
+    "member_count": MEMBER_COUNT_EXPRESSION,
+}
+
+# $project stage fields of a GroupSummary
+GROUP_SUMMARY_PROJECTION = {
+    "name": 1,
+    "type": 1,
+    "total_points": 1,
+    "point_shards": 1,
+    "member_count": MEMBER_COUNT_EXPRESSION,
+    "admin_count": {"$size": {"$ifNull": ["$admins", []]}},
+}
+
+# Aggregation stages that replace a group's member array by its count
+WITHOUT_MEMBERS_STAGES = [
+    {"$addFields": {"member_count": MEMBER_COUNT_EXPRESSION}},
+    {"$project": {"members": 0}},
+]
+
+# Group documents without the legacy members array and stored-only fields
+LIST_PROJECTION = model_projection(Group)
+LIST_STAGES = [*WITHOUT_MEMBERS_STAGES, {"$project": LIST_PROJECTION}]
+# add_sharded_points reads the shard count whether or not it is selected
+SHARD_KEYS = ("point_shards",)
+
+
+class GroupRepository(Repository):
+    collection_name = "groups"
+
+    async def get(self, group_id) -> Optional[dict]:
+        groups = await self.collection.aggregate(
+            [{"$match": {"_id": object_id(group_id)}}, *LIST_STAGES]
+        ).to_list(length=1)
+        return groups[0] if groups else None
+
+    async def get_summary_with_admins(self, group_id) -> Optional[dict]:
+        """A GroupSummary document plus the admins array."""
+        groups = await self.collection.aggregate([
+            {"$match": {"_id": object_id(group_id)}},
+            {"$project": {**GROUP_SUMMARY_PROJECTION, "admins": 1}},
+        ]).to_list(length=1)
+        return groups[0] if groups else None
+
+    async def admin_ids(self, group_id) -> Optional[List[str]]:
+        """The group's admin ids as strings, or None if the group does not exist."""
+        group = await self.collection.find_one({"_id": object_id(group_id)}, {"admins": 1})
+        if group is None:
+            return None
+        return [str(admin) for admin in group.get("admins", [])]
+
+    async def has_legacy_member(self, group_id, user_id) -> bool:
+        """Whether ``user_id`` is in the group's unmigrated ``members`` array."""
+        group = await self.collection.find_one(
+            {"_id": object_id(group_id), "members": {"$in": [str(user_id), object_id(user_id)]}},
+            {"_id": 1}
+        )
+        return group is not None
+
+    def with_legacy_members(self) -> AsyncIterator[dict]:
+        """Groups that still keep members in their ``members`` array, with that array."""
+        return self.collection.find({"members.0": {"$exists": True}}, {"members": 1})
+
+    def search_names(self) -> AsyncIterator[dict]:
+        """Every group's name and stored search name, for the search name backfill."""
+        return self.collection.find({}, {"name": 1, SEARCH_FIELD: 1})
+
+    async def point_shards(self, group_ids: Iterable) -> Dict[str, int]:
+        """``point_shards`` of the given groups by id string, 0 when unset."""
+        object_ids = list({object_id(group_id) for group_id in group_ids})
+        if not object_ids:
+            return {}
+        return {
+            str(group["_id"]): group.get("point_shards") or 0
+            async for group in self.collection.find({"_id": {"$in": object_ids}}, {"point_shards": 1})
+        }
+
+    async def list(self, limit: int, fields: Optional[Fieldset] = None) -> List[dict]:
+        projection = sparse_projection(LIST_PROJECTION, Group, fields, SHARD_KEYS)
+        return await self.collection.aggregate(
+            [{"$limit": limit}, *WITHOUT_MEMBERS_STAGES, {"$project": projection}]
+        ).to_list(length=limit)
+
+    async def summaries(self, limit: int) -> List[dict]:
+        return await self.collection.aggregate(
+            [{"$limit": limit}, {"$project": GROUP_SUMMARY_PROJECTION}]
+        ).to_list(length=limit)
+
+    async def search(self, filter_query: dict, response: Response, limit: int, cursor: Optional[str] = None) -> List[dict]:
+        """GroupSummary documents matching ``filter_query`` in search-name order.
+
+        The cursor of the next page is set on ``response`` when more exist.
+        """
+        if cursor:
+            last_name, last_id = decode_cursor(cursor, 2)
+            filter_query = {"$and": [filter_query, keyset_filter(SEARCH_FIELD, last_name, last_id, descending=False)]}
+
+        groups = await self.collection.aggregate([
+            {"$match": filter_query},
+            {"$sort": {SEARCH_FIELD: 1, "_id": 1}},
+            {"$limit": limit + 1},
+            {"$project": {**GROUP_SUMMARY_PROJECTION, SEARCH_FIELD: 1}},
+        ]).to_list(length=limit + 1)
+
+        if len(groups) > limit:
+            groups = groups[:limit]
+            set_next_cursor(response, encode_cursor(groups[-1][SEARCH_FIELD], groups[-1]["_id"]))
+        return groups
+
+    async def page(
+        self,
+        filter_query: dict,
+        response: Response,
+        limit: int,
+        cursor=None,
+        skip: int = 0,
+        fields: Optional[Fieldset] = None,
+    ) -> List[dict]:
+        projection = sparse_projection(GROUP_PROJECTION, Group, fields, SHARD_KEYS)
+        return await super().page(filter_query, response, limit, cursor, skip, projection)
+
+    async def names(self, group_ids: Iterable) -> Dict[str, str]:
+        """Names of the given groups by id string, with one $in query."""
+        object_ids = list({object_id(group_id) for group_id in group_ids})
+        if not object_ids:
+            return {}
+        return {
+            str(group["_id"]): group.get("name", "")
+            async for group in self.collection.find({"_id": {"$in": object_ids}}, {"name": 1})
+        }
+
+    async def insert(self, group: dict):
+        result = await self.collection.insert_one(group)
+        return result.inserted_id
+
+    async def set_admins(self, group_id, admin_ids: List) -> Optional[List]:
+        """Replace the admins; returns the stored list, or None if the group does not exist."""
+        group = await self.collection.find_one_and_update(
+            {"_id": object_id(group_id)},
+            {"$set": {"admins": admin_ids}},
+            projection={"admins": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        return group["admins"] if group else None
+
+    async def add_admin(self, group_id, user_id) -> None:
+        await self.collection.update_one({"_id": object_id(group_id)}, {"$addToSet": {"admins": object_id(user_id)}})
+
+    async def add_admins(self, admins_by_group: Dict) -> None:
+        """Add users to the admins of several groups with one bulk write."""
+        if admins_by_group:
+            await self.bulk_write([
+                UpdateOne({"_id": object_id(group_id)}, {"$addToSet": {"admins": {"$each": user_ids}}})
+                for group_id, user_ids in admins_by_group.items()
+            ])
+
+    async def add_to_member_counts(self, increments: Dict) -> None:
+        """``$inc`` the ``member_count`` of several groups with one bulk write."""
+        if increments:
+            await self.bulk_write([
+                UpdateOne({"_id": object_id(group_id)}, {"$inc": {"member_count": increment}})
+                for group_id, increment in increments.items()
+            ])
+
+    async def set_member_count(self, group_id, member_count: int, remove_members: bool = False) -> None:
+        """Store a recomputed ``member_count``, dropping the legacy array with ``remove_members``."""
+        update = {"$set": {"member_count": member_count}}
+        if remove_members:
+            update["$unset"] = {"members": ""}
+        await self.collection.update_one({"_id": object_id(group_id)}, update)
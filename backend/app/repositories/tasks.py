@@ -0,0 +1,74 @@
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+
+from fastapi import Response
+
+from ..fieldsets import Fieldset, sparse_projection
+from ..models.task import Task
+from ..projections import model_projection
+from .base import Repository, object_id
+
+TASK_PROJECTION = model_projection(Task)
+# What recording a completion needs
+SCORING_PROJECTION = {"type": 1, "points": 1}
+# What the group completion feed shows of each task
+HEADLINE_PROJECTION = {"title": 1, "type": 1, "category": 1, "points": 1}
+
+
+class TaskRepository(Repository):
+    collection_name = "tasks"
+
+    async def get(self, task_id) -> Optional[dict]:
+        return await self.collection.find_one({"_id": object_id(task_id)}, TASK_PROJECTION)
+
+    async def get_scoring(self, task_id) -> Optional[dict]:
+        return await self.collection.find_one({"_id": object_id(task_id)}, SCORING_PROJECTION)
+
+    async def by_ids(self, task_ids: Iterable, projection: dict = TASK_PROJECTION) -> Dict[str, dict]:
+        """The given tasks by id string, with one $in query."""
+        object_ids = list({object_id(task_id) for task_id in task_ids})
+        if not object_ids:
+            return {}
+        return {
+            str(task["_id"]): task
+            async for task in self.collection.find({"_id": {"$in": object_ids}}, projection)
+        }
+
+    async def scoring_by_ids(self, task_ids: Iterable) -> Dict[str, dict]:
+        return await self.by_ids(task_ids, SCORING_PROJECTION)
+
+    async def headlines_by_ids(self, task_ids: Iterable) -> Dict[str, dict]:
+        return await self.by_ids(task_ids, HEADLINE_PROJECTION)
+
+    def active(self) -> AsyncIterator[dict]:
+        """Every active task, for the in-process task catalog."""
+        return self.collection.find({"isActive": True}, TASK_PROJECTION)
+
+    async def active_group_tasks(self, group_id: str, limit: int = 100, fields: Optional[Fieldset] = None) -> List[dict]:
+        return await self.collection.find(
+            {"isActive": True, "is_group_task": True, "group_id": group_id},
+            sparse_projection(TASK_PROJECTION, Task, fields)
+        ).to_list(length=limit)
+
+    async def page(
+        self,
+        filter_query: dict,
+        response: Response,
+        limit: int,
+        cursor=None,
+        skip: int = 0,
+        fields: Optional[Fieldset] = None,
+    ) -> List[dict]:
+        projection = sparse_projection(TASK_PROJECTION, Task, fields)
+        return await super().page(filter_query, response, limit, cursor, skip, projection)
+
+    async def insert(self, task: dict):
+        result = await self.collection.insert_one(task)
+        return result.inserted_id
+
+    async def rename_values(self, field: str, mapping: Dict[str, str]) -> int:
+        """Replace old values of ``field``; returns the number of tasks changed."""
+        modified = 0
+        for old_value, new_value in mapping.items():
+            result = await self.collection.update_many({field: old_value}, {"$set": {field: new_value}})
+            modified += result.modified_count
+        return modified
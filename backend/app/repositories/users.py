@@ -0,0 +1,108 @@
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+
+from fastapi import Response
+from pymongo import UpdateOne
+
+from ..fieldsets import Fieldset, sparse_projection
+from ..models.user import User
+from ..projections import model_projection
+from .base import Repository, object_id
+
+# Everything a User response shows; never the password hash or invite fields
+USER_PROJECTION = model_projection(User)
+CREDENTIALS_PROJECTION = {**USER_PROJECTION, "password_hash": 1}
+TOP_USER_PROJECTION = {field: 1 for field in USER_PROJECTION if field != "favorite_tasks"}
+CONTACT_PROJECTION = {"name": 1, "email": 1, "points": 1}
+
+
+class UserRepository(Repository):
+    collection_name = "users"
+
+    async def get(self, user_id) -> Optional[dict]:
+        return await self.collection.find_one({"_id": object_id(user_id)}, USER_PROJECTION)
+
+    async def get_credentials(self, email: str) -> Optional[dict]:
+        """The user with ``email`` and their password hash, for login."""
+        return await self.collection.find_one({"email": email}, CREDENTIALS_PROJECTION)
+
+    async def email_taken(self, email: str) -> bool:
+        return await self.collection.find_one({"email": email}, {"_id": 1}) is not None
+
+    async def page(
+        self,
+        filter_query: dict,
+        response: Response,
+        limit: int,
+        cursor=None,
+        skip: int = 0,
+        fields: Optional[Fieldset] = None,
+    ) -> List[dict]:
+        projection = sparse_projection(USER_PROJECTION, User, fields)
+        return await super().page(filter_query, response, limit, cursor, skip, projection)
+
+    async def names(self, user_ids: Iterable) -> Dict[str, str]:
+        """Names of the given users by id string, with one $in query."""
+        object_ids = list({object_id(user_id) for user_id in user_ids})
+        if not object_ids:
+            return {}
+        return {
+            str(user["_id"]): user.get("name", "")
+            async for user in self.collection.find({"_id": {"$in": object_ids}}, {"name": 1})
+        }
+
+    async def contacts(self, user_ids: List) -> List[dict]:
+        """Name, email and points of the given users."""
+        return await self.collection.find(
+            {"_id": {"$in": user_ids}}, CONTACT_PROJECTION
+        ).to_list(length=len(user_ids))
+
+    def points_and_groups(self) -> AsyncIterator[dict]:
+        """Every user's points and group, for rebuilding the leaderboards."""
+        return self.collection.find({}, {"points": 1, "group_id": 1})
+
+    async def roster_states(self, emails: List[str]) -> Dict[str, dict]:
+        """Users with the given emails by email, with what a roster import checks."""
+        return {
+            user["email"]: user
+            async for user in self.collection.find(
+                {"email": {"$in": emails}},
+                {"email": 1, "group_id": 1, "password_hash": 1, "invite_import_id": 1},
+            )
+        }
+
+    async def ids_by_email(self, emails: List[str]) -> List:
+        return [user["_id"] async for user in self.collection.find({"email": {"$in": emails}}, {"_id": 1})]
+
+    async def add_points(self, increments: Dict[str, int], session=None) -> None:
+        """``$inc`` the points of several users with one bulk write."""
+        await self.bulk_write(
+            [UpdateOne({"_id": object_id(user_id)}, {"$inc": {"points": points}}) for user_id, points in increments.items()],
+            session=session,
+        )
+
+    async def insert(self, user: dict):
+        result = await self.collection.insert_one(user)
+        return result.inserted_id
+
+    async def set_group(self, user_id, group_id) -> None:
+        await self.collection.update_one({"_id": object_id(user_id)}, {"$set": {"group_id": object_id(group_id)}})
+
+    async def add_favorite_task(self, user_id, task_id: str) -> bool:
+        result = await self.collection.update_one({"_id": object_id(user_id)}, {"$addToSet": {"favorite_tasks": task_id}})
+        return result.matched_count > 0
+
+    async def remove_favorite_task(self, user_id, task_id: str) -> bool:
+        result = await self.collection.update_one({"_id": object_id(user_id)}, {"$pull": {"favorite_tasks": task_id}})
+        return result.matched_count > 0
+
+    async def accept_invite(self, token_hash: str, password_hash: str) -> Optional[dict]:
+        """Set the password of the user holding an unexpired invite; returns their email."""
+        return await self.collection.find_one_and_update(
+            {"invite_token_hash": token_hash, "invite_expires_at": {"$gt": datetime.utcnow()}},
+            {
+                "$set": {"password_hash": password_hash},
+                "$unset": {"invite_token_hash": "", "invite_expires_at": "", "invite_import_id": ""}
+            },
+            projection={"email": 1}
+        )
@@ -0,0 +1,286 @@
+"""Bulk roster import: many members of one group from a streamed upload.
+
+Rows are validated one by one and written in batches of
+``bulk_insert_batch_size``. A batch costs one lookup of the existing users,
+one bulk upsert of users (keyed by email), one lookup of their ids, one bulk
+upsert of memberships and one ``member_count`` increment. Existing users
+that belonged to another group are moved: their old membership is deleted
+and that group's ``member_count`` decremented.
+
+Members with a password get it bcrypt-hashed on the password hash pool,
+at most ``roster_import_hash_concurrency`` at a time so logins keep their
+share of the pool. Members without one get a single-use invite token,
+stored as a SHA-256 hash and redeemed through ``POST /auth/accept-invite``.
+
+Progress is kept in ``roster_imports`` under the import id after every batch.
+Uploading the same file again with the same import id skips the rows already
+processed, and every write is an upsert, so restarting an interrupted import
+never creates duplicate users or memberships. Invites are only returned
+when an import completes, so resuming an interrupted import re-issues the
+invite of every user it created that has not set a password yet, in the
+skipped rows as well as in the replayed ones.
+"""
+import asyncio
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from pymongo import UpdateOne
+
+from .auth import get_password_hash, invalidate_principal, password_hash_pool
+from .config import settings
+from .leaderboards import leaderboards
+from .memberships import remove_memberships
+from .models.user import RosterMember
+from .repositories import GroupRepository, UserRepository
+from .streaming import Record
+from .task_import import format_validation_error
+
+# Pause before retrying a hash the pool rejected as saturated
+HASH_RETRY_SECONDS = 0.1
+
+
+class RosterImportError(ValueError):
+    pass
+
+
+def hash_invite_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def new_invite() -> Tuple[str, dict]:
+    """Return a new invite token and the user fields that store it."""
+    token = secrets.token_urlsafe(32)
+    return token, {
+        "invite_token_hash": hash_invite_token(token),
+        "invite_expires_at": datetime.utcnow() + timedelta(days=settings.roster_invite_ttl_days),
+    }
+
+
+async def _hash_passwords(passwords: List[str]) -> List[str]:
+    semaphore = asyncio.Semaphore(settings.roster_import_hash_concurrency)
+
+    async def hash_one(password: str) -> str:
+        async with semaphore:
+            while True:
+                try:
+                    return await password_hash_pool.run(get_password_hash, password)
+                except HTTPException as e:
+                    if e.status_code != status.HTTP_503_SERVICE_UNAVAILABLE:
+                        raise
+                    await asyncio.sleep(HASH_RETRY_SECONDS)
+
+    return await asyncio.gather(*(hash_one(password) for password in passwords))
+
+
+def _member(value: dict) -> RosterMember:
+    return RosterMember(**{key: value for key, value in value.items() if value not in ("", None)})
+
+
+def _progress_fields(progress: dict) -> dict:
+    return {key: value for key, value in progress.items() if key not in ("_id", "invites")}
+
+
+async def get_roster_import(client, import_id: str) -> Optional[dict]:
+    progress = await client.habitgrove.roster_imports.find_one({"_id": import_id})
+    if progress:
+        progress["import_id"] = progress.pop("_id")
+        progress["group_id"] = str(progress["group_id"])
+    return progress
+
+
+async def import_roster(
+    client,
+    group_id: ObjectId,
+    records: AsyncIterator[Record],
+    import_id: Optional[str] = None,
+) -> dict:
+    """Import streamed roster rows into ``group_id``; see the module docstring."""
+    database = client.habitgrove
+    import_id = import_id or uuid.uuid4().hex
+
+    progress = await database.roster_imports.find_one({"_id": import_id})
+    if progress and progress["group_id"] != group_id:
+        raise RosterImportError("This import id belongs to another group")
+    # An earlier run stopped before returning its invites
+    resuming = progress is not None and progress.get("status") != "completed"
+    if not progress:
+        progress = {
+            "_id": import_id,
+            "group_id": group_id,
+            "rows_processed": 0,
+            "users_created": 0,
+            "users_existing": 0,
+            "memberships_added": 0,
+            "failed": 0,
+            "errors": [],
+            "started_at": datetime.utcnow(),
+        }
+    progress.update({"status": "running", "finished_at": None})
+    await database.roster_imports.replace_one({"_id": import_id}, progress, upsert=True)
+
+    resume_after = progress["rows_processed"]
+    invites: List[dict] = []
+    batch: List[Tuple[int, RosterMember]] = []
+    skipped: Dict[str, int] = {}
+    last_row = resume_after
+
+    def add_error(row: int, message: str):
+        progress["failed"] += 1
+        if len(progress["errors"]) < settings.bulk_import_max_errors:
+            progress["errors"].append({"row": row, "error": message})
+
+    async def reissue():
+        if skipped:
+            await _reissue_invites(client, import_id, skipped, invites)
+            skipped.clear()
+
+    async def flush():
+        if batch:
+            await _write_batch(client, group_id, import_id, batch, progress, invites, add_error)
+            batch.clear()
+        progress["rows_processed"] = last_row
+        await database.roster_imports.update_one({"_id": import_id}, {"$set": _progress_fields(progress)})
+
+    try:
+        async for row, value, error in records:
+            if row <= resume_after:
+                if resuming and not error and isinstance(value, dict):
+                    try:
+                        skipped.setdefault(_member(value).email, row)
+                    except ValidationError:
+                        continue
+                    if len(skipped) >= settings.bulk_insert_batch_size:
+                        await reissue()
+                continue
+            await reissue()
+            last_row = row
+            if error:
+                add_error(row, error)
+                continue
+            if not isinstance(value, dict):
+                add_error(row, "Expected an object")
+                continue
+            try:
+                member = _member(value)
+            except ValidationError as e:
+                add_error(row, format_validation_error(e))
+                continue
+            batch.append((row, member))
+            if len(batch) >= settings.bulk_insert_batch_size:
+                await flush()
+        await reissue()
+        await flush()
+    except BaseException:
+        progress["status"] = "interrupted"
+        await database.roster_imports.update_one({"_id": import_id}, {"$set": {"status": "interrupted"}})
+        raise
+
+    progress.update({"status": "completed", "finished_at": datetime.utcnow()})
+    await database.roster_imports.update_one({"_id": import_id}, {"$set": _progress_fields(progress)})
+
+    result = _progress_fields(progress)
+    result.update({"import_id": import_id, "group_id": str(group_id), "invites": invites})
+    return result
+
+
+async def _reissue_invites(client, import_id: str, rows_by_email: Dict[str, int], invites: List[dict]) -> None:
+    """New invites for the users an earlier run of ``import_id`` created that have no password yet."""
+    users = UserRepository(client)
+    writes = []
+    for email, user in (await users.roster_states(list(rows_by_email))).items():
+        if not user.get("password_hash") and user.get("invite_import_id") == import_id:
+            token, invite_fields = new_invite()
+            writes.append(UpdateOne({"_id": user["_id"]}, {"$set": invite_fields}))
+            invites.append({"row": rows_by_email[email], "email": email, "token": token})
+    if writes:
+        await users.bulk_write(writes)
+
+
+async def _write_batch(client, group_id, import_id, batch, progress, invites, add_error) -> None:
+    database = client.habitgrove
+    users = UserRepository(client)
+    now = datetime.utcnow()
+
+    members: Dict[str, Tuple[int, RosterMember]] = {}
+    for row, member in batch:
+        if member.email in members:
+            add_error(row, f"Duplicate email in upload (row {members[member.email][0]})")
+        else:
+            members[member.email] = (row, member)
+
+    existing = await users.roster_states(list(members))
+
+    new_members = [(row, member) for row, member in members.values() if member.email not in existing]
+    hashes = await _hash_passwords([member.password for _, member in new_members if member.password])
+    hashes = iter(hashes)
+
+    writes = []
+    batch_invites = []
+    for row, member in new_members:
+        user = {
+            "name": member.name,
+            "email": member.email,
+            "points": 0,
+            "favorite_tasks": [],
+            "created_at": now,
+        }
+        if member.password:
+            user["password_hash"] = next(hashes)
+        else:
+            token, invite_fields = new_invite()
+            user.update(invite_fields, password_hash=None, invite_import_id=import_id)
+            batch_invites.append({"row": row, "email": member.email, "token": token})
+        writes.append(UpdateOne(
+            {"email": member.email},
+            {"$setOnInsert": user, "$set": {"group_id": group_id}},
+            upsert=True
+        ))
+
+    for email, user in existing.items():
+        update = {"group_id": group_id}
+        if not user.get("password_hash") and user.get("invite_import_id") == import_id:
+            # Created by an interrupted run of this import; its invite was never returned
+            token, invite_fields = new_invite()
+            update.update(invite_fields)
+            batch_invites.append({"row": members[email][0], "email": email, "token": token})
+        writes.append(UpdateOne({"_id": user["_id"]}, {"$set": update}))
+
+    if writes:
+        result = await users.bulk_write(writes)
+        progress["users_created"] += result.upserted_count
+    progress["users_existing"] += len(existing)
+    invites.extend(batch_invites)
+
+    # Existing users moved from another group no longer count as its members
+    await remove_memberships(client, [
+        (user["group_id"], user["_id"])
+        for user in existing.values()
+        if user.get("group_id") and str(user["group_id"]) != str(group_id)
+    ])
+
+    user_ids = await users.ids_by_email(list(members))
+    if not user_ids:
+        return
+
+    result = await database.group_memberships.bulk_write([
+        UpdateOne(
+            {"group_id": group_id, "user_id": user_id},
+            {"$setOnInsert": {"joined_at": now}},
+            upsert=True
+        )
+        for user_id in user_ids
+    ], ordered=False)
+    if result.upserted_count:
+        await GroupRepository(client).add_to_member_counts({group_id: result.upserted_count})
+        progress["memberships_added"] += result.upserted_count
+
+    for user_id in user_ids:
+        leaderboards.move_user(str(user_id), str(group_id))
+    for user in existing.values():
+        invalidate_principal(str(user["_id"]))
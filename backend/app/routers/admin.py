@@ -1,13 +1,33 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+import asyncio
+from collections import defaultdict
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
 from typing import List, Optional
 from datetime import datetime, timedelta
 from bson import ObjectId
-from ..models.user import User, UserUpdate
-from ..models.group import Group, AdminRequest, AdminRequestCreate, AdminRequestUpdate
-from ..models.task import Task, TaskCreate, BulkTaskUpload
+from ..models.user import User, UserUpdate, RosterImportResult
+from ..models.group import Group, AdminRequest, AdminRequestCreate, AdminRequestUpdate, AdminRequestBulkReview
+from ..models.task import Task, TaskCreate, BulkTaskUpload, BulkImportResult
 from ..models.task_completion import TaskCompletion
-from ..auth import get_current_active_user
+from ..auth import get_current_active_user, invalidate_principal, principal_cache, password_hash_pool
 from ..database import get_database
+from ..config import settings
+from ..cache import TTLCache
+from ..task_catalog import task_catalog
+from ..completions import backfill_period_keys
+from ..task_import import insert_tasks, import_task_stream
+from ..streaming import iter_records, StreamFormatError
+from ..fieldsets import FIELDS_DESCRIPTION, parse_fields, sparse_model
+from ..repositories import AdminRequestRepository, CompletionRepository, GroupRepository, TaskRepository, UserRepository
+from ..repositories.groups import GROUP_PROJECTION
+from ..repositories.users import TOP_USER_PROJECTION
+from ..serialization import json_response
+from .. import codec
+from ..leaderboards import leaderboards
+from ..roster_import import RosterImportError, get_roster_import, import_roster
+from ..point_buckets import backfill_point_buckets
+from ..point_counters import add_sharded_points, set_point_shards, shard_counts, shard_totals
+from ..group_search import backfill_group_search_names
+from ..memberships import migrate_group_members, remove_user_memberships
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -24,11 +44,15 @@ async def get_current_admin(current_user: User = Depends(get_current_active_user
 # User Management
 @router.get("/users", response_model=List[User])
 async def get_all_users(
+    response: Response,
     current_admin: User = Depends(get_current_admin),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    search: Optional[str] = None
+    cursor: Optional[str] = None,
+    search: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
+    fieldset = parse_fields(User, fields)
     db = await get_database()
     
     filter_query = {}
@@ -38,16 +62,11 @@ async def get_all_users(
             {"email": {"$regex": search, "$options": "i"}}
         ]
     
-    cursor = db.habitgrove.users.find(filter_query).skip(skip).limit(limit)
-    users = await cursor.to_list(length=limit)
-    
-    for user in users:
-        user["_id"] = str(user["_id"])
-        user["id"] = user["_id"]
-        if "group_id" in user and user["group_id"] is not None:
-            user["group_id"] = str(user["group_id"])
+    users = codec.users.to_api_many(
+        await UserRepository(db).page(filter_query, response, limit, cursor, skip, fieldset)
+    )
     
-    return [User(**user) for user in users]
+    return json_response(List[sparse_model(User, fieldset)], users, response)
 
 
 @router.get("/users/{user_id}", response_model=User)
@@ -59,17 +78,12 @@ async def get_user(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid user ID")
     
     db = await get_database()
-    user = await db.habitgrove.users.find_one({"_id": ObjectId(user_id)})
+    user = await UserRepository(db).get(user_id)
     
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
-    user["_id"] = str(user["_id"])
-    user["id"] = user["_id"]
-    if "group_id" in user and user["group_id"] is not None:
-        user["group_id"] = str(user["group_id"])
-    
-    return User(**user)
+    return json_response(User, codec.users.to_api(user))
 
 
 @router.patch("/users/{user_id}", response_model=User)
@@ -87,22 +101,15 @@ async def update_user(
     if not update_data:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No data to update")
     
-    result = await db.habitgrove.users.update_one(
-        {"_id": ObjectId(user_id)},
-        {"$set": update_data}
-    )
-    
-    if result.matched_count == 0:
+    users = UserRepository(db)
+    if not await users.update_fields(user_id, update_data):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
-    # Return updated user
-    user = await db.habitgrove.users.find_one({"_id": ObjectId(user_id)})
-    user["_id"] = str(user["_id"])
-    user["id"] = user["_id"]
-    if "group_id" in user and user["group_id"] is not None:
-        user["group_id"] = str(user["group_id"])
+    invalidate_principal(user_id)
     
-    return User(**user)
+    # Return updated user
+    user = await users.get(user_id)
+    return json_response(User, codec.users.to_api(user))
 
 
 @router.delete("/users/{user_id}")
@@ -114,23 +121,29 @@ async def delete_user(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid user ID")
     
     db = await get_database()
-    result = await db.habitgrove.users.delete_one({"_id": ObjectId(user_id)})
-    
-    if result.deleted_count == 0:
+    if not await UserRepository(db).delete(user_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     
+    invalidate_principal(user_id)
+    await remove_user_memberships(db, user_id)
+    leaderboards.remove_user(user_id)
+    
     return {"message": "User deleted successfully"}
 
 
 # Task Management
 @router.get("/tasks", response_model=List[Task])
 async def get_all_tasks(
+    response: Response,
     current_admin: User = Depends(get_current_admin),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     type_filter: Optional[str] = None,
-    category_filter: Optional[str] = None
+    category_filter: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
+    fieldset = parse_fields(Task, fields)
     db = await get_database()
     
     filter_query = {}
@@ -139,13 +152,9 @@ async def get_all_tasks(
     if category_filter:
         filter_query["category"] = category_filter
     
-    cursor = db.habitgrove.tasks.find(filter_query).skip(skip).limit(limit)
-    tasks = await cursor.to_list(length=limit)
+    tasks = await TaskRepository(db).page(filter_query, response, limit, cursor, skip, fieldset)
     
-    for task in tasks:
-        task["_id"] = str(task["_id"])
-        task["id"] = task["_id"]
-        
+    for task in codec.tasks.to_api_many(tasks):
         # Convert old categories to new format
         category_mapping = {
             'recycling': 'environment',
@@ -166,7 +175,7 @@ async def get_all_tasks(
         if task.get("type") in type_mapping:
             task["type"] = type_mapping[task["type"]]
     
-    return [Task(**task) for task in tasks]
+    return json_response(List[sparse_model(Task, fieldset)], tasks, response)
 
 
 @router.post("/tasks", response_model=Task)
@@ -179,11 +188,10 @@ async def create_task(
     task_dict = task_data.dict()
     task_dict["created_at"] = datetime.utcnow()
     
-    result = await db.habitgrove.tasks.insert_one(task_dict)
-    task_dict["_id"] = str(result.inserted_id)
-    task_dict["id"] = task_dict["_id"]
+    task_dict["_id"] = await TaskRepository(db).insert(task_dict)
+    task_catalog.invalidate()
     
-    return Task(**task_dict)
+    return json_response(Task, codec.tasks.to_api(task_dict))
 
 
 @router.patch("/tasks/{task_id}", response_model=Task)
@@ -197,19 +205,15 @@ async def update_task(
     
     db = await get_database()
     
-    result = await db.habitgrove.tasks.update_one(
-        {"_id": ObjectId(task_id)},
-        {"$set": task_update}
-    )
-    
-    if result.matched_count == 0:
+    tasks = TaskRepository(db)
+    if not await tasks.update_fields(task_id, task_update):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     
-    task = await db.habitgrove.tasks.find_one({"_id": ObjectId(task_id)})
-    task["_id"] = str(task["_id"])
-    task["id"] = task["_id"]
+    task_catalog.invalidate()
+    
+    task = await tasks.get(task_id)
     
-    return Task(**task)
+    return json_response(Task, codec.tasks.to_api(task))
 
 
 @router.delete("/tasks/{task_id}")
@@ -221,11 +225,11 @@ async def delete_task(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid task ID")
     
     db = await get_database()
-    result = await db.habitgrove.tasks.delete_one({"_id": ObjectId(task_id)})
-    
-    if result.deleted_count == 0:
+    if not await TaskRepository(db).delete(task_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
     
+    task_catalog.invalidate()
+    
     return {"message": "Task deleted successfully"}
 
 
@@ -236,19 +240,36 @@ async def create_bulk_tasks(
 ):
     db = await get_database()
     
-    created_tasks = []
-    
+    now = datetime.utcnow()
+    task_dicts = []
     for task_data in bulk_data.tasks:
         task_dict = task_data.dict()
-        task_dict["created_at"] = datetime.utcnow()
-        
-        result = await db.habitgrove.tasks.insert_one(task_dict)
-        task_dict["_id"] = str(result.inserted_id)
-        task_dict["id"] = task_dict["_id"]
-        
-        created_tasks.append(Task(**task_dict))
+        task_dict["created_at"] = now
+        task_dicts.append(task_dict)
+    
+    created_tasks = codec.tasks.to_api_many(await insert_tasks(db, task_dicts))
     
-    return created_tasks
+    return json_response(List[Task], created_tasks)
+
+
+@router.post("/tasks/bulk/stream", response_model=BulkImportResult)
+async def stream_bulk_tasks(
+    request: Request,
+    current_admin: User = Depends(get_current_admin)
+):
+    """Import a large task catalog from a streamed request body.
+
+    Accepts NDJSON (Content-Type: application/x-ndjson) or a JSON array,
+    optionally wrapped as {"tasks": [...]}. Rows are validated one by one
+    and inserted in batches; invalid rows are reported with their row number.
+    """
+    db = await get_database()
+    
+    records = iter_records(request.stream(), request.headers.get("content-type"))
+    try:
+        return await import_task_stream(db, records)
+    except StreamFormatError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.post("/tasks/migrate-categories")
@@ -272,23 +293,11 @@ async def migrate_task_categories(
         'yearly': 'one_time'
     }
     
-    updated_count = 0
-    
-    # Update categories
-    for old_category, new_category in category_mapping.items():
-        result = await db.habitgrove.tasks.update_many(
-            {"category": old_category},
-            {"$set": {"category": new_category}}
-        )
-        updated_count += result.modified_count
+    tasks = TaskRepository(db)
+    updated_count = await tasks.rename_values("category", category_mapping)
+    updated_count += await tasks.rename_values("type", type_mapping)
     
-    # Update types
-    for old_type, new_type in type_mapping.items():
-        result = await db.habitgrove.tasks.update_many(
-            {"type": old_type},
-            {"$set": {"type": new_type}}
-        )
-        updated_count += result.modified_count
+    task_catalog.invalidate()
     
     return {
         "message": f"Migration completed. {updated_count} tasks updated.",
@@ -299,23 +308,144 @@ async def migrate_task_categories(
 # Group Management
 @router.get("/groups", response_model=List[Group])
 async def get_all_groups(
+    response: Response,
     current_admin: User = Depends(get_current_admin),
     skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000)
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
+    fieldset = parse_fields(Group, fields)
+    db = await get_database()
+    groups = await GroupRepository(db).page({}, response, limit, cursor, skip, fieldset)
+    await add_sharded_points(db, groups)
+    
+    return json_response(List[sparse_model(Group, fieldset)], codec.groups.to_api_many(groups), response)
+
+
+@router.post("/completions/migrate-period-keys")
+async def migrate_completion_period_keys(
+    current_admin: User = Depends(get_current_admin)
+):
+    """Set period keys on completions recorded before they existed"""
+    db = await get_database()
+    
+    result = await backfill_period_keys(db)
+    
+    return {
+        "message": f"Migration completed. {result['completions_updated']} completions updated.",
+        **result
+    }
+
+
+@router.post("/groups/migrate-memberships")
+async def migrate_group_memberships(
+    remove_arrays: bool = Query(False, description="Drop the legacy members arrays after copying them"),
+    current_admin: User = Depends(get_current_admin)
+):
+    """Copy legacy group member arrays into the group_memberships collection"""
+    db = await get_database()
+    
+    result = await migrate_group_members(db, remove_arrays)
+    
+    return {
+        "message": f"Migration completed. {result['groups_migrated']} groups migrated.",
+        **result
+    }
+
+
+@router.post("/groups/{group_id}/roster", response_model=RosterImportResult)
+async def import_group_roster(
+    group_id: str,
+    request: Request,
+    import_id: Optional[str] = Query(None, max_length=64, description="Pass the id of an interrupted import to resume it"),
+    current_admin: User = Depends(get_current_admin)
+):
+    """Create or add many members of a group from a streamed roster.
+
+    Accepts CSV with a header row (Content-Type: text/csv), NDJSON or a JSON
+    array of {"name", "email", "password"?} rows. Members without a password
+    get an invite token, returned once in the result. Progress can be read
+    from GET /admin/roster-imports/{import_id} while the upload runs.
+    """
+    if not ObjectId.is_valid(group_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid group ID")
+    
+    db = await get_database()
+    
+    if not await GroupRepository(db).exists(group_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    
+    records = iter_records(request.stream(), request.headers.get("content-type"))
+    try:
+        return await import_roster(db, ObjectId(group_id), records, import_id)
+    except StreamFormatError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except RosterImportError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.get("/roster-imports/{import_id}", response_model=RosterImportResult)
+async def get_roster_import_progress(
+    import_id: str,
+    current_admin: User = Depends(get_current_admin)
+):
+    """Progress of a roster import; invite tokens are only returned by the import itself"""
+    db = await get_database()
+    
+    progress = await get_roster_import(db, import_id)
+    if not progress:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Roster import not found")
+    
+    return json_response(RosterImportResult, progress)
+
+
+@router.post("/groups/migrate-search-names")
+async def migrate_group_search_names(
+    current_admin: User = Depends(get_current_admin)
+):
+    """Backfill the normalized group names used by /groups/search"""
+    db = await get_database()
+    
+    result = await backfill_group_search_names(db)
+    
+    return {
+        "message": f"Migration completed. {result['groups_updated']} groups updated.",
+        **result
+    }
+
+
+@router.post("/leaderboards/backfill-buckets")
+async def backfill_leaderboard_buckets(
+    current_admin: User = Depends(get_current_admin)
 ):
+    """Rebuild the day/week/month point buckets from all task completions"""
     db = await get_database()
-    cursor = db.habitgrove.groups.find({}).skip(skip).limit(limit)
-    groups = await cursor.to_list(length=limit)
     
-    for group in groups:
-        group["_id"] = str(group["_id"])
-        group["id"] = group["_id"]
-        if "members" in group and group["members"]:
-            group["members"] = [str(member) if isinstance(member, ObjectId) else member for member in group["members"]]
-        if "admins" in group and group["admins"]:
-            group["admins"] = [str(admin) if isinstance(admin, ObjectId) else admin for admin in group["admins"]]
+    result = await backfill_point_buckets(db)
     
-    return [Group(**group) for group in groups]
+    return {
+        "message": f"Backfill completed. {result['buckets']} buckets rebuilt.",
+        **result
+    }
+
+
+@router.patch("/groups/{group_id}/point-shards")
+async def update_group_point_shards(
+    group_id: str,
+    shards: int = Query(..., ge=0, le=settings.group_point_shards_max, description="0 turns sharding off"),
+    current_admin: User = Depends(get_current_admin)
+):
+    """Spread a group's point increments over counter shards to relieve write contention"""
+    if not ObjectId.is_valid(group_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid group ID")
+    
+    db = await get_database()
+    
+    if not await set_point_shards(db, group_id, shards):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    
+    return {"message": "Group point shards updated successfully", "point_shards": shards}
 
 
 @router.patch("/groups/{group_id}/admins")
@@ -329,33 +459,37 @@ async def update_group_admins(
     
     db = await get_database()
     
-    # Validate that all admin IDs are valid users
+    # Validate that all admin IDs are valid users with one $in query
     for admin_id in admin_ids:
         if not ObjectId.is_valid(admin_id):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid admin ID: {admin_id}")
-        
-        user = await db.habitgrove.users.find_one({"_id": ObjectId(admin_id)})
-        if not user:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"User not found: {admin_id}")
     
-    result = await db.habitgrove.groups.update_one(
-        {"_id": ObjectId(group_id)},
-        {"$set": {"admins": [ObjectId(admin_id) for admin_id in admin_ids]}}
-    )
+    admin_object_ids = list(dict.fromkeys(ObjectId(admin_id) for admin_id in admin_ids))
+    found = await UserRepository(db).existing_ids(admin_object_ids)
+    missing = [str(admin_id) for admin_id in admin_object_ids if admin_id not in found]
+    if missing:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"User not found: {', '.join(missing)}")
+    
+    admins = await GroupRepository(db).set_admins(group_id, admin_object_ids)
     
-    if result.matched_count == 0:
+    if admins is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
     
-    return {"message": "Group admins updated successfully"}
+    return {
+        "message": "Group admins updated successfully",
+        "admins": [str(admin_id) for admin_id in admins]
+    }
 
 
 # Admin Requests Management
 @router.get("/admin-requests", response_model=List[AdminRequest])
 async def get_admin_requests(
+    response: Response,
     current_admin: User = Depends(get_current_admin),
     status_filter: Optional[str] = None,
     skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000)
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None
 ):
     db = await get_database()
     
@@ -363,22 +497,13 @@ async def get_admin_requests(
     if status_filter:
         filter_query["status"] = status_filter
     
-    cursor = db.habitgrove.admin_requests.find(filter_query).skip(skip).limit(limit)
-    requests = await cursor.to_list(length=limit)
-    
-    for req in requests:
-        req["_id"] = str(req["_id"])
-        req["id"] = req["_id"]
-        if "group_id" in req and req["group_id"] is not None:
-            req["group_id"] = str(req["group_id"])
-        if "user_id" in req and req["user_id"] is not None:
-            req["user_id"] = str(req["user_id"])
-        if "reviewed_by" in req and req["reviewed_by"] is not None:
-            req["reviewed_by"] = str(req["reviewed_by"])
+    requests = codec.admin_requests.to_api_many(
+        await AdminRequestRepository(db).page(filter_query, response, limit, cursor, skip)
+    )
     
     print(f"DEBUG: Processed requests: {requests}")
     
-    return [AdminRequest(**req) for req in requests]
+    return json_response(List[AdminRequest], requests, response)
 
 
 @router.patch("/admin-requests/{request_id}")
@@ -396,32 +521,79 @@ async def review_admin_request(
     update_data["reviewed_at"] = datetime.utcnow()
     update_data["reviewed_by"] = current_admin.id
     
-    result = await db.habitgrove.admin_requests.update_one(
-        {"_id": ObjectId(request_id)},
-        {"$set": update_data}
-    )
+    request = await AdminRequestRepository(db).review(request_id, update_data)
     
-    if result.matched_count == 0:
+    if not request:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Admin request not found")
     
     # If approved, add user to group admins
     if review_data.status == "approved":
-        request = await db.habitgrove.admin_requests.find_one({"_id": ObjectId(request_id)})
-        if request:
-            await db.habitgrove.groups.update_one(
-                {"_id": ObjectId(request["group_id"])},
-                {"$addToSet": {"admins": ObjectId(request["user_id"])}}
-            )
+        await GroupRepository(db).add_admin(request["group_id"], request["user_id"])
     
     return {"message": f"Admin request {review_data.status}"}
 
 
+@router.post("/admin-requests/review")
+async def bulk_review_admin_requests(
+    review_data: AdminRequestBulkReview,
+    current_admin: User = Depends(get_current_admin)
+):
+    """Approve or reject many pending admin requests at once.
+
+    The pending requests are updated with one write and read back by its
+    review batch, so a request reviewed concurrently by someone else is
+    skipped and listed in the response. Only the requests this call approved
+    are added to their groups' admins, with one bulk write.
+    """
+    for request_id in review_data.request_ids:
+        if not ObjectId.is_valid(request_id):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid request ID: {request_id}")
+    
+    db = await get_database()
+    
+    request_ids = list(dict.fromkeys(ObjectId(request_id) for request_id in review_data.request_ids))
+    review = {
+        "status": review_data.status,
+        "admin_notes": review_data.admin_notes,
+        "reviewed_at": datetime.utcnow(),
+        "reviewed_by": current_admin.id
+    }
+    reviewed = await AdminRequestRepository(db).review_pending(request_ids, review)
+    
+    if reviewed and review_data.status == "approved":
+        new_admins = defaultdict(list)
+        for request in reviewed:
+            new_admins[ObjectId(request["group_id"])].append(ObjectId(request["user_id"]))
+        await GroupRepository(db).add_admins(new_admins)
+    
+    reviewed_ids = {request["_id"] for request in reviewed}
+    return {
+        "message": f"{len(reviewed)} admin requests {review_data.status}",
+        "reviewed": len(reviewed),
+        "skipped": [str(request_id) for request_id in request_ids if request_id not in reviewed_ids]
+    }
+
+
 # Statistics and Analytics
+TOP_N = 10
+
+# Snapshots of the statistics response per (period, estimate)
+statistics_cache = TTLCache(maxsize=32, ttl=settings.statistics_cache_ttl_seconds)
+
+
 @router.get("/statistics")
 async def get_admin_statistics(
     current_admin: User = Depends(get_current_admin),
-    period: str = Query("all", pattern="^(all|daily|weekly|monthly|yearly)$")
+    period: str = Query("all", pattern="^(all|daily|weekly|monthly|yearly)$"),
+    estimate: bool = Query(False, description="Use estimated_document_count for collection totals"),
+    refresh: bool = Query(False, description="Bypass the cached snapshot")
 ):
+    cache_key = (period, estimate)
+    if not refresh:
+        snapshot = statistics_cache.get(cache_key)
+        if snapshot is not None:
+            return snapshot
+    
     db = await get_database()
     
     # Calculate date range based on period
@@ -442,42 +614,58 @@ async def get_admin_statistics(
     if start_date:
         filter_query["completed_at"] = {"$gte": start_date}
     
-    # Get statistics
-    total_users = await db.habitgrove.users.count_documents({})
-    total_tasks = await db.habitgrove.tasks.count_documents({})
-    total_groups = await db.habitgrove.groups.count_documents({})
-    total_completions = await db.habitgrove.task_completions.count_documents(filter_query)
-    
-    # Get top users by points
-    top_users_cursor = db.habitgrove.users.find({}).sort("points", -1).limit(10)
-    top_users = await top_users_cursor.to_list(length=10)
-    
-    for user in top_users:
-        user["_id"] = str(user["_id"])
-        user["id"] = user["_id"]
-        # Convert group_id from ObjectId to string if it exists
-        if "group_id" in user and user["group_id"] is not None:
-            user["group_id"] = str(user["group_id"])
-    
-    # Get top groups by total points
-    top_groups_cursor = db.habitgrove.groups.find({}).sort("total_points", -1).limit(10)
-    top_groups = await top_groups_cursor.to_list(length=10)
-    
-    for group in top_groups:
-        group["_id"] = str(group["_id"])
-        group["id"] = group["_id"]
-        # Convert members and admins from ObjectId to string
-        if "members" in group:
-            group["members"] = [str(member) for member in group["members"]]
-        if "admins" in group:
-            group["admins"] = [str(admin) for admin in group["admins"]]
+    users, tasks, groups = UserRepository(db), TaskRepository(db), GroupRepository(db)
+    completions = CompletionRepository(db)
+    
+    # Top lists never need credentials, favorites or member arrays
+    if estimate:
+        (
+            total_users, total_tasks, total_groups, total_completions, top_users, top_groups
+        ) = await asyncio.gather(
+            users.count(estimate=True),
+            tasks.count(estimate=True),
+            groups.count(estimate=True),
+            completions.count(filter_query, estimate=True),
+            users.top("points", TOP_USER_PROJECTION, TOP_N),
+            groups.top("total_points", GROUP_PROJECTION, TOP_N),
+        )
+    else:
+        (
+            (total_users, top_users), (total_groups, top_groups), total_tasks, total_completions
+        ) = await asyncio.gather(
+            users.count_and_top("points", TOP_USER_PROJECTION, TOP_N),
+            groups.count_and_top("total_points", GROUP_PROJECTION, TOP_N),
+            tasks.count(),
+            completions.count(filter_query),
+        )
+    
+    codec.users.to_api_many(top_users)
+    codec.groups.to_api_many(top_groups)
     
-    return {
+    snapshot = {
         "period": period,
         "total_users": total_users,
         "total_tasks": total_tasks,
         "total_groups": total_groups,
         "total_completions": total_completions,
         "top_users": [User(**user) for user in top_users],
-        "top_groups": [Group(**group) for group in top_groups]
-    } 
\ No newline at end of file
+        "top_groups": [Group(**group) for group in top_groups],
+        "estimated": estimate,
+        "generated_at": now
+    }
+    statistics_cache.set(cache_key, snapshot)
+    return snapshot
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(current_admin: User = Depends(get_current_admin)):
+    """Hit/miss counters of the in-process caches and worker pools"""
+    return {
+        "principal": principal_cache.stats(),
+        "password_hash_pool": password_hash_pool.stats(),
+        "task_catalog": task_catalog.stats(),
+        "statistics": statistics_cache.stats(),
+        "group_point_shards": shard_counts.stats(),
+        "group_point_totals": shard_totals.stats(),
+        "leaderboards": leaderboards.stats()
+    }
@@ -1,11 +1,21 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List
+import asyncio
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Response
+from typing import List, Optional
 from bson import ObjectId
 from pydantic import BaseModel
-from ..models.group import Group, GroupCreate, GroupUpdate
-from ..models.user import User
-from ..auth import get_current_active_user
+from ..models.group import Group, GroupCreate, GroupUpdate, GroupSummary, GroupProfile
+from ..auth import get_current_active_user, invalidate_principal
 from ..database import get_database
+from ..memberships import add_member, is_member, remove_user_memberships
+from ..leaderboards import leaderboards
+from ..point_counters import add_sharded_points
+from ..group_search import SEARCH_FIELD, group_search_filter
+from ..fieldsets import FIELDS_DESCRIPTION, parse_fields, sparse_model
+from ..repositories import AdminRequestRepository, CompletionRepository, GroupRepository, TaskRepository, UserRepository
+from ..text import normalize_search_text
+from ..serialization import json_response
+from .. import codec
 
 router = APIRouter(prefix="/groups", tags=["groups"])
 
@@ -15,23 +25,56 @@ class JoinGroupRequest(BaseModel):
 
 
 @router.get("/", response_model=List[Group])
-async def get_groups(current_user = Depends(get_current_active_user)):
+async def get_groups(
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    current_user = Depends(get_current_active_user)
+):
+    fieldset = parse_fields(Group, fields)
     db = await get_database()
-    cursor = db.habitgrove.groups.find({})
-    groups = await cursor.to_list(length=100)
+    groups = await add_sharded_points(db, await GroupRepository(db).list(100, fieldset))
     
-    # Convert ObjectId to string for each group and its members
-    for group in groups:
-        group["_id"] = str(group["_id"])
-        group["id"] = group["_id"]  # Add id field
-        # Convert member ObjectIds to strings
-        if "members" in group and group["members"]:
-            group["members"] = [str(member) if isinstance(member, ObjectId) else member for member in group["members"]]
-        # Convert admin ObjectIds to strings
-        if "admins" in group and group["admins"]:
-            group["admins"] = [str(admin) if isinstance(admin, ObjectId) else admin for admin in group["admins"]]
+    return json_response(List[sparse_model(Group, fieldset)], codec.groups.to_api_many(groups))
+
+
+@router.get("/summary", response_model=List[GroupSummary])
+async def get_group_summaries(current_user = Depends(get_current_active_user)):
+    """List groups with only id, name, type, member/admin counts and points"""
+    db = await get_database()
+    groups = await add_sharded_points(db, await GroupRepository(db).summaries(100))
+    
+    return json_response(List[GroupSummary], codec.group_summaries.to_api_many(groups))
+
+
+@router.get("/search", response_model=List[GroupSummary])
+async def search_groups(
+    response: Response,
+    q: Optional[str] = Query(None, max_length=100),
+    type: Optional[str] = Query(None, pattern="^(university|school|municipality|ngo|company)$"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user = Depends(get_current_active_user)
+):
+    """Search groups by name prefix, ignoring case and diacritics, in name order"""
+    db = await get_database()
+    
+    groups = await GroupRepository(db).search(group_search_filter(q, type), response, limit, cursor)
+    await add_sharded_points(db, groups)
     
-    return [Group(**group) for group in groups]
+    return json_response(List[GroupSummary], codec.group_summaries.to_api_many(groups), response)
+
+
+@router.get("/mine", response_model=Optional[Group])
+async def get_my_group(current_user = Depends(get_current_active_user)):
+    """Get the current user's group from their group_id, or null"""
+    if not current_user.group_id:
+        return None
+    
+    try:
+        return await get_group(current_user.group_id, current_user)
+    except HTTPException as e:
+        if e.status_code == status.HTTP_404_NOT_FOUND:
+            return None
+        raise
 
 
 @router.post("/", response_model=Group)
@@ -39,21 +82,21 @@ async def create_group(group_data: GroupCreate, current_user = Depends(get_curre
     db = await get_database()
     
     group_dict = group_data.dict()
-    group_dict["members"] = [current_user.id]
+    group_dict[SEARCH_FIELD] = normalize_search_text(group_dict["name"])
     group_dict["admins"] = [current_user.id]  # Creator becomes admin
+    group_dict["member_count"] = 0
     group_dict["total_points"] = 0
     
-    result = await db.habitgrove.groups.insert_one(group_dict)
-    group_dict["_id"] = str(result.inserted_id)
-    group_dict["id"] = group_dict["_id"]  # Add id field
+    group_dict["_id"] = await GroupRepository(db).insert(group_dict)
+    await add_member(db, group_dict["_id"], current_user.id)
+    group_dict["member_count"] = 1
     
     # Update user's group_id
-    await db.habitgrove.users.update_one(
-        {"_id": ObjectId(current_user.id)},
-        {"$set": {"group_id": result.inserted_id}}
-    )
+    await UserRepository(db).set_group(current_user.id, group_dict["_id"])
+    invalidate_principal(current_user.id)
+    leaderboards.move_user(current_user.id, str(group_dict["_id"]))
     
-    return Group(**group_dict)
+    return json_response(Group, codec.groups.to_api(group_dict))
 
 
 @router.get("/{group_id}", response_model=Group)
@@ -62,22 +105,45 @@ async def get_group(group_id: str, current_user = Depends(get_current_active_use
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid group ID")
     
     db = await get_database()
-    group = await db.habitgrove.groups.find_one({"_id": ObjectId(group_id)})
+    group = await GroupRepository(db).get(group_id)
     
     if not group:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    await add_sharded_points(db, [group])
     
-    # Convert ObjectId to string
-    group["_id"] = str(group["_id"])
-    group["id"] = group["_id"]  # Add id field
-    # Convert member ObjectIds to strings
-    if "members" in group and group["members"]:
-        group["members"] = [str(member) if isinstance(member, ObjectId) else member for member in group["members"]]
-    # Convert admin ObjectIds to strings
-    if "admins" in group and group["admins"]:
-        group["admins"] = [str(admin) if isinstance(admin, ObjectId) else admin for admin in group["admins"]]
+    return json_response(Group, codec.groups.to_api(group))
+
+
+async def _get_admin_details(db, group_id: str, admin_ids: List) -> List[dict]:
+    """Admin user details merged with their admin request, in two $in queries"""
+    object_ids = [ObjectId(admin_id) for admin_id in admin_ids if ObjectId.is_valid(str(admin_id))]
+    if not object_ids:
+        return []
+    
+    users, admin_requests = await asyncio.gather(
+        UserRepository(db).contacts(object_ids),
+        AdminRequestRepository(db).profiles(group_id, object_ids),
+    )
+    users_by_id = {user["_id"]: user for user in users}
+    requests_by_user = {request["user_id"]: request for request in admin_requests}
     
-    return Group(**group)
+    admin_details = []
+    for admin_id in object_ids:
+        user = users_by_id.get(admin_id)
+        if not user:
+            continue
+        admin_request = requests_by_user.get(admin_id) or {}
+        admin_details.append({
+            "id": str(user["_id"]),
+            "name": user.get("name", ""),
+            "email": user.get("email", ""),
+            "points": user.get("points", 0),
+            "full_name": admin_request.get("full_name", user.get("name", "")),
+            "profession": admin_request.get("profession", ""),
+            "bio": admin_request.get("bio", "")
+        })
+    
+    return admin_details
 
 
 @router.get("/{group_id}/admins", response_model=List[dict])
@@ -87,34 +153,63 @@ async def get_group_admins(group_id: str, current_user = Depends(get_current_act
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid group ID")
     
     db = await get_database()
-    group = await db.habitgrove.groups.find_one({"_id": ObjectId(group_id)})
+    admin_ids = await GroupRepository(db).admin_ids(group_id)
     
-    if not group:
+    if admin_ids is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
     
-    # Get admin user details
-    admin_details = []
-    for admin_id in group.get("admins", []):
-        user = await db.habitgrove.users.find_one({"_id": ObjectId(admin_id)})
-        if user:
-            # Get admin request details for additional info
-            admin_request = await db.habitgrove.admin_requests.find_one({
-                "user_id": ObjectId(admin_id),
-                "group_id": ObjectId(group_id)
-            })
-            
-            admin_info = {
-                "id": str(user["_id"]),
-                "name": user.get("name", ""),
-                "email": user.get("email", ""),
-                "points": user.get("points", 0),
-                "full_name": admin_request.get("full_name", user.get("name", "")) if admin_request else user.get("name", ""),
-                "profession": admin_request.get("profession", "") if admin_request else "",
-                "bio": admin_request.get("bio", "") if admin_request else ""
-            }
-            admin_details.append(admin_info)
+    return json_response(List[dict], await _get_admin_details(db, group_id, admin_ids))
+
+
+@router.get("/{group_id}/profile", response_model=GroupProfile)
+async def get_group_profile(
+    group_id: str,
+    completions_limit: int = Query(20, ge=1, le=100),
+    current_user = Depends(get_current_active_user)
+):
+    """Get everything the group page shows: summary, admins, active group tasks
+    and the most recent completions, with a fixed number of queries"""
+    if not ObjectId.is_valid(group_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid group ID")
     
-    return admin_details
+    try:
+        db = await get_database()
+        
+        group, member = await asyncio.gather(
+            GroupRepository(db).get_summary_with_admins(group_id),
+            is_member(db, group_id, current_user.id),
+        )
+        if not group:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+        if not member:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You are not a member of this group")
+        await add_sharded_points(db, [group])
+        
+        admins, tasks, completions = await asyncio.gather(
+            _get_admin_details(db, group_id, group.pop("admins", [])),
+            TaskRepository(db).active_group_tasks(group_id),
+            CompletionRepository(db).recent_for_group(group_id, completions_limit),
+        )
+        
+        for completion in codec.completions.to_api_many(completions):
+            if "completed_at" not in completion:
+                completion["completed_at"] = completion.get("created_at", datetime.utcnow())
+        
+        return json_response(GroupProfile, {
+            "group": codec.group_summaries.to_api(group),
+            "admins": admins,
+            "tasks": codec.tasks.to_api_many(tasks),
+            "recent_completions": completions,
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in get_group_profile: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}"
+        )
 
 
 @router.post("/join")
@@ -125,24 +220,22 @@ async def join_group(request: JoinGroupRequest, current_user = Depends(get_curre
     db = await get_database()
     
     # Check if group exists
-    group = await db.habitgrove.groups.find_one({"_id": ObjectId(request.group_id)})
-    if not group:
+    if not await GroupRepository(db).exists(request.group_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
     
-    # Check if user is already a member
-    if current_user.id in group["members"]:
+    if await is_member(db, request.group_id, current_user.id):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Already a member of this group")
     
-    # Add user to group
-    await db.habitgrove.groups.update_one(
-        {"_id": ObjectId(request.group_id)},
-        {"$push": {"members": current_user.id}}
-    )
+    # Leave the previous group, as a roster import moving the user does
+    await remove_user_memberships(db, current_user.id)
+    
+    # Add user to group; the unique membership index rejects concurrent repeat joins
+    if not await add_member(db, request.group_id, current_user.id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Already a member of this group")
     
     # Update user's group_id
-    await db.habitgrove.users.update_one(
-        {"_id": ObjectId(current_user.id)},
-        {"$set": {"group_id": ObjectId(request.group_id)}}
-    )
+    await UserRepository(db).set_group(current_user.id, request.group_id)
+    invalidate_principal(current_user.id)
+    leaderboards.move_user(current_user.id, request.group_id)
     
     return {"message": "Successfully joined group"} 
\ No newline at end of file
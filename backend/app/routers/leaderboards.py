@@ -0,0 +1,123 @@
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from typing import List, Optional
+from datetime import datetime
+from bson import ObjectId
+from ..models.leaderboard import LeaderboardEntry, GroupLeaderboardEntry, LeaderboardPosition
+from ..auth import get_current_active_user
+from ..database import get_database
+from ..leaderboards import leaderboards
+from ..periods import BUCKET_WINDOWS, period_key
+from ..point_buckets import GROUP, USER, top_buckets
+from ..repositories import GroupRepository, UserRepository
+from ..serialization import json_response
+
+router = APIRouter(prefix="/leaderboards", tags=["leaderboards"])
+
+
+async def _with_names(db, entries) -> List[dict]:
+    """Attach user names to (user_id, points, rank) entries with one $in query"""
+    names = await UserRepository(db).names(user_id for user_id, _, _ in entries)
+    
+    return [
+        {"user_id": user_id, "name": names.get(user_id, ""), "points": points, "rank": rank}
+        for user_id, points, rank in entries
+    ]
+
+
+def _validated_group_id(group_id: str) -> str:
+    if not ObjectId.is_valid(group_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid group ID")
+    return group_id
+
+
+@router.get("/users", response_model=List[LeaderboardEntry])
+async def get_global_leaderboard(
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user = Depends(get_current_active_user)
+):
+    """Top users across all groups"""
+    db = await get_database()
+    return json_response(List[LeaderboardEntry], await _with_names(db, leaderboards.board().top(limit, offset)))
+
+
+@router.get("/groups/{group_id}", response_model=List[LeaderboardEntry])
+async def get_group_leaderboard(
+    group_id: str,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user = Depends(get_current_active_user)
+):
+    """Top users of one group"""
+    db = await get_database()
+    board = leaderboards.board(_validated_group_id(group_id))
+    return json_response(List[LeaderboardEntry], await _with_names(db, board.top(limit, offset)))
+
+
+@router.get("/me", response_model=LeaderboardPosition)
+async def get_my_position(
+    group_id: Optional[str] = Query(None, description="Rank within this group instead of globally"),
+    radius: int = Query(5, ge=0, le=50, description="Neighbours shown above and below"),
+    current_user = Depends(get_current_active_user)
+):
+    """The current user's rank, the board size and the users around them"""
+    db = await get_database()
+    board = leaderboards.board(_validated_group_id(group_id) if group_id else None)
+    
+    return json_response(LeaderboardPosition, {
+        "rank": board.rank(current_user.id),
+        "total": len(board),
+        "points": board.points(current_user.id) or 0,
+        "neighbours": await _with_names(db, board.around(current_user.id, radius)),
+    })
+
+
+def _ranked(buckets, offset: int):
+    """(owner_id, points, rank) for buckets in descending points order, ties sharing a rank"""
+    entries = []
+    for position, bucket in enumerate(buckets, start=offset + 1):
+        if entries and entries[-1][1] == bucket["points"]:
+            rank = entries[-1][2]
+        else:
+            rank = position
+        entries.append((str(bucket["owner_id"]), bucket["points"], rank))
+    return entries
+
+
+@router.get("/period/users", response_model=List[LeaderboardEntry])
+async def get_period_user_leaderboard(
+    window: str = Query("week", pattern="^(day|week|month)$"),
+    at: Optional[datetime] = Query(None, description="Any time inside the period; defaults to now"),
+    group_id: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user = Depends(get_current_active_user)
+):
+    """Top users of one day, ISO week or month, optionally within one group"""
+    db = await get_database()
+    period = period_key(BUCKET_WINDOWS[window], at or datetime.utcnow())
+    group = ObjectId(_validated_group_id(group_id)) if group_id else None
+    
+    buckets = await top_buckets(db, USER, period, limit, offset, group_id=group)
+    return json_response(List[LeaderboardEntry], await _with_names(db, _ranked(buckets, offset)))
+
+
+@router.get("/period/groups", response_model=List[GroupLeaderboardEntry])
+async def get_period_group_leaderboard(
+    window: str = Query("week", pattern="^(day|week|month)$"),
+    at: Optional[datetime] = Query(None, description="Any time inside the period; defaults to now"),
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user = Depends(get_current_active_user)
+):
+    """Top groups of one day, ISO week or month"""
+    db = await get_database()
+    period = period_key(BUCKET_WINDOWS[window], at or datetime.utcnow())
+    
+    entries = _ranked(await top_buckets(db, GROUP, period, limit, offset), offset)
+    names = await GroupRepository(db).names(group_id for group_id, _, _ in entries)
+    
+    return json_response(List[GroupLeaderboardEntry], [
+        {"group_id": group_id, "name": names.get(group_id, ""), "points": points, "rank": rank}
+        for group_id, points, rank in entries
+    ])
@@ -1,12 +1,27 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+import asyncio
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
 from typing import List, Optional
 from bson import ObjectId
-from ..models.task import Task, TaskCreate, TaskUpdate, BulkTaskUpload
-from ..models.task_completion import TaskCompletion, TaskCompletionCreate
+from ..models.task import Task, TaskCreate, TaskUpdate, BulkTaskUpload, BulkImportResult
+from ..models.task_completion import (
+    TaskCompletion, TaskCompletionCreate, TaskCompletionBatch, TaskCompletionBatchResult
+)
 from ..models.user import User
-from ..auth import get_current_active_user
+from ..auth import get_current_active_user, invalidate_principal
 from ..database import get_database
-from datetime import datetime, timedelta
+from ..config import settings
+from ..memberships import is_member
+from ..completions import build_completion, record_completion, record_completions
+from ..periods import already_completed_message
+from ..task_catalog import task_catalog
+from ..task_import import insert_tasks, import_task_stream
+from ..streaming import iter_records, StreamFormatError
+from ..fieldsets import FIELDS_DESCRIPTION, parse_fields, sparse_model
+from ..repositories import CompletionRepository, GroupRepository, TaskRepository, UserRepository
+from ..serialization import json_response
+from .. import codec
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
@@ -16,49 +31,17 @@ async def get_tasks(
     type: Optional[str] = Query(None, pattern="^(daily|weekly|monthly|one_time)$"),
     category: Optional[str] = Query(None, pattern="^(health|education|work|social|environment|other|group)$"),
     difficulty: Optional[str] = Query(None, pattern="^(easy|medium|hard)$"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user = Depends(get_current_active_user)
 ):
+    fieldset = parse_fields(Task, fields)
+    
     try:
         db = await get_database()
         
-        # Build filter
-        filter_query = {"isActive": True}
-        if type:
-            filter_query["type"] = type
-        if category:
-            filter_query["category"] = category
-        if difficulty:
-            filter_query["difficulty"] = difficulty
-        
-        cursor = db.habitgrove.tasks.find(filter_query)
-        tasks = await cursor.to_list(length=100)
-        
-        # Convert ObjectId to string for each task and ensure id field is set
-        for task in tasks:
-            task["_id"] = str(task["_id"])
-            task["id"] = task["_id"]  # Ensure id field is also set
-            
-            # Convert old categories to new format
-            category_mapping = {
-                'recycling': 'environment',
-                'water': 'environment', 
-                'energy': 'environment',
-                'transport': 'environment',
-                'consumption': 'other'
-            }
-            
-            # Convert old types to new format
-            type_mapping = {
-                'yearly': 'one_time'
-            }
-            
-            if task.get("category") in category_mapping:
-                task["category"] = category_mapping[task["category"]]
-            
-            if task.get("type") in type_mapping:
-                task["type"] = type_mapping[task["type"]]
-        
-        return [Task(**task) for task in tasks]
+        # Served from the in-process catalog as pre-serialized JSON
+        body = await task_catalog.get_view(db, type, category, difficulty, fieldset)
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         print(f"Error in get_tasks: {e}")
         raise HTTPException(
@@ -70,39 +53,30 @@ async def get_tasks(
 @router.get("/group/{group_id}", response_model=List[Task])
 async def get_group_tasks(
     group_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get tasks specific to a group (group tasks)"""
     if not ObjectId.is_valid(group_id):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid group ID")
+    fieldset = parse_fields(Task, fields)
     
     try:
         db = await get_database()
         
         # Check if user is member of the group
-        group = await db.habitgrove.groups.find_one({"_id": ObjectId(group_id)})
-        if not group:
+        if not await GroupRepository(db).exists(group_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
         
-        if current_user.id not in [str(member) for member in group.get("members", [])]:
+        if not await is_member(db, group_id, current_user.id):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You are not a member of this group")
         
         # Get group tasks
-        filter_query = {
-            "isActive": True,
-            "is_group_task": True,
-            "group_id": group_id
-        }
-        
-        cursor = db.habitgrove.tasks.find(filter_query)
-        tasks = await cursor.to_list(length=100)
-        
-        # Convert ObjectId to string for each task
-        for task in tasks:
-            task["_id"] = str(task["_id"])
-            task["id"] = task["_id"]
+        tasks = codec.tasks.to_api_many(await TaskRepository(db).active_group_tasks(group_id, fields=fieldset))
         
-        return [Task(**task) for task in tasks]
+        return json_response(List[sparse_model(Task, fieldset)], tasks)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in get_group_tasks: {e}")
         raise HTTPException(
@@ -125,12 +99,12 @@ async def create_group_task(
         db = await get_database()
         
         # Check if group exists
-        group = await db.habitgrove.groups.find_one({"_id": ObjectId(group_id)})
-        if not group:
+        admin_ids = await GroupRepository(db).admin_ids(group_id)
+        if admin_ids is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
         
         # Check if user is admin of the group
-        if current_user.id not in [str(admin) for admin in group.get("admins", [])]:
+        if current_user.id not in admin_ids:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only group admins can create group tasks")
         
         # Create group task
@@ -139,11 +113,12 @@ async def create_group_task(
         task_dict["group_id"] = group_id
         task_dict["created_at"] = datetime.utcnow()
         
-        result = await db.habitgrove.tasks.insert_one(task_dict)
-        task_dict["_id"] = str(result.inserted_id)
-        task_dict["id"] = task_dict["_id"]
+        task_dict["_id"] = await TaskRepository(db).insert(task_dict)
+        task_catalog.invalidate()
         
-        return Task(**task_dict)
+        return json_response(Task, codec.tasks.to_api(task_dict))
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in create_group_task: {e}")
         raise HTTPException(
@@ -166,28 +141,29 @@ async def create_bulk_group_tasks(
         db = await get_database()
         
         # Check if group exists
-        group = await db.habitgrove.groups.find_one({"_id": ObjectId(group_id)})
-        if not group:
+        admin_ids = await GroupRepository(db).admin_ids(group_id)
+        if admin_ids is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
         
         # Check if user is admin of the group
-        if current_user.id not in [str(admin) for admin in group.get("admins", [])]:
+        if current_user.id not in admin_ids:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only group admins can create group tasks")
         
-        # Create group tasks
-        created_tasks = []
+        # Create group tasks with one insert_many
+        now = datetime.utcnow()
+        task_dicts = []
         for task_data in bulk_data.tasks:
             task_dict = task_data.dict()
             task_dict["is_group_task"] = True
             task_dict["group_id"] = group_id
-            task_dict["created_at"] = datetime.utcnow()
-            
-            result = await db.habitgrove.tasks.insert_one(task_dict)
-            task_dict["_id"] = str(result.inserted_id)
-            task_dict["id"] = task_dict["_id"]
-            created_tasks.append(Task(**task_dict))
+            task_dict["created_at"] = now
+            task_dicts.append(task_dict)
+        
+        created_tasks = codec.tasks.to_api_many(await insert_tasks(db, task_dicts))
         
-        return created_tasks
+        return json_response(List[Task], created_tasks)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in create_bulk_group_tasks: {e}")
         raise HTTPException(
@@ -196,6 +172,34 @@ async def create_bulk_group_tasks(
         )
 
 
+@router.post("/group/{group_id}/bulk/stream", response_model=BulkImportResult)
+async def stream_bulk_group_tasks(
+    group_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Import group tasks from a streamed NDJSON or JSON array body (only group admins)"""
+    if not ObjectId.is_valid(group_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid group ID")
+    
+    db = await get_database()
+    
+    # Check if group exists
+    admin_ids = await GroupRepository(db).admin_ids(group_id)
+    if admin_ids is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    
+    # Check if user is admin of the group
+    if current_user.id not in admin_ids:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only group admins can create group tasks")
+    
+    records = iter_records(request.stream(), request.headers.get("content-type"))
+    try:
+        return await import_task_stream(db, records, {"is_group_task": True, "group_id": group_id})
+    except StreamFormatError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.get("/{task_id}", response_model=Task)
 async def get_task(task_id: str, current_user = Depends(get_current_active_user)):
     if not ObjectId.is_valid(task_id):
@@ -203,14 +207,12 @@ async def get_task(task_id: str, current_user = Depends(get_current_active_user)
     
     try:
         db = await get_database()
-        task = await db.habitgrove.tasks.find_one({"_id": ObjectId(task_id)})
+        task = await TaskRepository(db).get(task_id)
         
         if not task:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
         
-        # Convert ObjectId to string and ensure id field is set
-        task["_id"] = str(task["_id"])
-        task["id"] = task["_id"]  # Ensure id field is also set
+        codec.tasks.to_api(task)
         
         # Convert old categories to new format
         category_mapping = {
@@ -232,7 +234,7 @@ async def get_task(task_id: str, current_user = Depends(get_current_active_user)
         if task.get("type") in type_mapping:
             task["type"] = type_mapping[task["type"]]
         
-        return Task(**task)
+        return json_response(Task, task)
     except HTTPException:
         raise
     except Exception as e:
@@ -250,11 +252,10 @@ async def create_task(task_data: TaskCreate, current_user = Depends(get_current_
         db = await get_database()
         
         task_dict = task_data.dict()
-        result = await db.habitgrove.tasks.insert_one(task_dict)
-        task_dict["_id"] = str(result.inserted_id)
-        task_dict["id"] = task_dict["_id"]  # Ensure id field is also set
+        task_dict["_id"] = await TaskRepository(db).insert(task_dict)
+        task_catalog.invalidate()
         
-        return Task(**task_dict)
+        return json_response(Task, codec.tasks.to_api(task_dict))
     except Exception as e:
         print(f"Error in create_task: {e}")
         raise HTTPException(
@@ -268,112 +269,157 @@ async def complete_task(
     completion_data: TaskCompletionCreate, 
     current_user = Depends(get_current_active_user)
 ):
+    if not ObjectId.is_valid(completion_data.task_id) or not ObjectId.is_valid(completion_data.user_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid task or user ID")
+    
     try:
         db = await get_database()
         
         # Validate task exists
-        task = await db.habitgrove.tasks.find_one({"_id": ObjectId(completion_data.task_id)})
+        task = await TaskRepository(db).get_scoring(completion_data.task_id)
         if not task:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
         
-        # Validate user exists
-        user = await db.habitgrove.users.find_one({"_id": ObjectId(completion_data.user_id)})
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-        
-        # Check if task is already completed by this user based on task type
-        now = datetime.now()
-        
-        # Calculate the time window based on task type
-        if task["type"] == "daily":
-            # Daily tasks: can be completed once per day
-            start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_time = start_time.replace(day=start_time.day + 1)
-        elif task["type"] == "weekly":
-            # Weekly tasks: can be completed once per week (Monday to Sunday)
-            days_since_monday = now.weekday()
-            start_time = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days_since_monday)
-            end_time = start_time + timedelta(days=7)
-        elif task["type"] == "monthly":
-            # Monthly tasks: can be completed once per month
-            start_time = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            if now.month == 12:
-                end_time = now.replace(year=now.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-            else:
-                end_time = now.replace(month=now.month + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
-        elif task["type"] == "yearly":
-            # Yearly tasks: can be completed once per year
-            start_time = now.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-            end_time = now.replace(year=now.year + 1, month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-        else:
-            # Default to daily
-            start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_time = start_time.replace(day=start_time.day + 1)
-        
-        existing_completion = await db.habitgrove.task_completions.find_one({
-            "task_id": ObjectId(completion_data.task_id),
-            "user_id": ObjectId(completion_data.user_id),
-            "completed_at": {"$gte": start_time, "$lt": end_time}
-        })
+        # Validate user exists (the authenticated user was already loaded by get_current_user)
+        if completion_data.user_id != current_user.id:
+            if not await UserRepository(db).exists(completion_data.user_id):
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         
-        if existing_completion:
-            if task["type"] == "daily":
-                error_msg = "Bu görev bugün zaten tamamlandı"
-            elif task["type"] == "weekly":
-                error_msg = "Bu görev bu hafta zaten tamamlandı"
-            elif task["type"] == "monthly":
-                error_msg = "Bu görev bu ay zaten tamamlandı"
-            elif task["type"] == "yearly":
-                error_msg = "Bu görev bu yıl zaten tamamlandı"
-            else:
-                error_msg = "Bu görev zaten tamamlandı"
-                
+        # The unique (user_id, task_id, period_key) index rejects a second
+        # completion in the same day/week/month, even for concurrent requests
+        completion_dict = build_completion(
+            task, completion_data.user_id, completion_data.group_id, datetime.utcnow()
+        )
+        if settings.completion_window_fallback:
+            # Completions stored before period keys are not covered by the index
+            key = (completion_data.user_id, completion_data.task_id, completion_dict["period_key"])
+            task_types = {completion_data.task_id: task.get("type")}
+            if key in await CompletionRepository(db).legacy_period_keys([completion_dict], task_types):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=already_completed_message(task.get("type"))
+                )
+        try:
+            inserted_id = await record_completion(db, completion_dict)
+        except DuplicateKeyError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, 
-                detail=error_msg
+                detail=already_completed_message(task.get("type"))
             )
+        invalidate_principal(completion_data.user_id)
         
-        # Create completion record
-        completion_dict = completion_data.dict()
-        completion_dict["completed_at"] = datetime.utcnow()
-        completion_dict["points_earned"] = task["points"]  # Add points_earned field
-        
-        # Convert string IDs to ObjectId for database
-        completion_dict["task_id"] = ObjectId(completion_data.task_id)
-        completion_dict["user_id"] = ObjectId(completion_data.user_id)
-        if completion_data.group_id:
-            completion_dict["group_id"] = ObjectId(completion_data.group_id)
+        completion_dict["_id"] = inserted_id
         
-        result = await db.habitgrove.task_completions.insert_one(completion_dict)
+        return json_response(TaskCompletion, codec.completions.to_api(completion_dict))
         
-        # Update user points
-        points_to_add = task["points"]
-        await db.habitgrove.users.update_one(
-            {"_id": ObjectId(completion_data.user_id)},
-            {"$inc": {"points": points_to_add}}
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in complete_task: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}"
         )
+
+
+@router.post("/complete/batch", response_model=TaskCompletionBatchResult)
+async def complete_tasks_batch(
+    batch: TaskCompletionBatch,
+    current_user = Depends(get_current_active_user)
+):
+    """Record many completions at once (kiosk and offline clients).
+
+    Tasks and users are resolved with one $in query each, existing
+    completions in the current periods with one query, and the remaining
+    completions are inserted with a single unordered insert_many. Each item
+    reports its own success or error.
+    """
+    try:
+        db = await get_database()
+        now = datetime.utcnow()
+        errors = {}
+        
+        for index, item in enumerate(batch.completions):
+            if not ObjectId.is_valid(item.task_id) or not ObjectId.is_valid(item.user_id):
+                errors[index] = "Invalid task or user ID"
+            elif item.group_id and not ObjectId.is_valid(item.group_id):
+                errors[index] = "Invalid group ID"
+        
+        valid_items = [(index, item) for index, item in enumerate(batch.completions) if index not in errors]
+        
+        # Resolve every referenced task and user with one query each
+        tasks = await TaskRepository(db).scoring_by_ids(item.task_id for _, item in valid_items)
+        
+        other_user_ids = {item.user_id for _, item in valid_items if item.user_id != current_user.id}
+        known_users = {current_user.id}
+        known_users.update(str(user_id) for user_id in await UserRepository(db).existing_ids(other_user_ids))
+        
+        # Build completion documents, rejecting repeats within the batch itself
+        candidates = []
+        seen = set()
+        for index, item in valid_items:
+            task = tasks.get(item.task_id)
+            if not task:
+                errors[index] = "Task not found"
+                continue
+            if item.user_id not in known_users:
+                errors[index] = "User not found"
+                continue
+            
+            completion = build_completion(task, item.user_id, item.group_id, now)
+            key = (item.user_id, item.task_id, completion["period_key"])
+            if key in seen:
+                errors[index] = already_completed_message(task.get("type"))
+                continue
+            seen.add(key)
+            candidates.append((index, completion))
+        
+        # Check every period window with one query
+        if candidates:
+            completions = CompletionRepository(db)
+            existing = await completions.existing_period_keys(c for _, c in candidates)
+            if settings.completion_window_fallback:
+                task_types = {task_id: task.get("type") for task_id, task in tasks.items()}
+                existing |= await completions.legacy_period_keys((c for _, c in candidates), task_types)
+            remaining = []
+            for index, completion in candidates:
+                if (str(completion["user_id"]), str(completion["task_id"]), completion["period_key"]) in existing:
+                    errors[index] = already_completed_message(tasks[str(completion["task_id"])].get("type"))
+                else:
+                    remaining.append((index, completion))
+            candidates = remaining
+        
+        # Insert the rest; the unique index still catches concurrent duplicates
+        failed = await record_completions(db, [completion for _, completion in candidates])
+        
+        results = []
+        completed = {}
+        for position, (index, completion) in enumerate(candidates):
+            if position in failed:
+                if failed[position] == "duplicate":
+                    errors[index] = already_completed_message(tasks[str(completion["task_id"])].get("type"))
+                else:
+                    errors[index] = failed[position]
+                continue
+            invalidate_principal(completion["user_id"])
+            completed[index] = codec.completions.to_api(completion)
+        
+        for index in range(len(batch.completions)):
+            if index in completed:
+                results.append({"index": index, "success": True, "completion": completed[index]})
+            else:
+                results.append({"index": index, "success": False, "error": errors.get(index)})
         
-        # Update group points if group_id is provided
-        if completion_data.group_id:
-            await db.habitgrove.groups.update_one(
-                {"_id": ObjectId(completion_data.group_id)},
-                {"$inc": {"total_points": points_to_add}}
-            )
-        
-        # Convert ObjectId back to string for response
-        completion_dict["_id"] = str(result.inserted_id)
-        completion_dict["id"] = completion_dict["_id"]
-        completion_dict["task_id"] = str(completion_dict["task_id"])
-        completion_dict["user_id"] = str(completion_dict["user_id"])
-        if completion_data.group_id:
-            completion_dict["group_id"] = str(completion_dict["group_id"])
-        
-        return TaskCompletion(**completion_dict)
+        return json_response(TaskCompletionBatchResult, {
+            "completed": len(completed),
+            "failed": len(batch.completions) - len(completed),
+            "results": results
+        })
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in complete_task: {e}")
+        print(f"Error in complete_tasks_batch: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
@@ -383,36 +429,46 @@ async def complete_task(
 @router.get("/user/{user_id}", response_model=List[TaskCompletion])
 async def get_user_completions(
     user_id: str, 
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user = Depends(get_current_active_user)
 ):
+    """Get a user's completions, newest first, with their task details.
+
+    Pages are keyed on (completed_at, _id); the cursor for the next page is
+    returned in the X-Next-Cursor header. start/end limit completed_at.
+    """
     if not ObjectId.is_valid(user_id):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid user ID")
+    fieldset = parse_fields(TaskCompletion, fields)
     
     try:
         db = await get_database()
         
-        print(f"Fetching completions for user: {user_id}")
-        
-        # Get user's task completions
-        cursor = db.habitgrove.task_completions.find({"user_id": ObjectId(user_id)})
-        completions = await cursor.to_list(length=100)
-        
-        print(f"Found {len(completions)} completions")
+        filter_query = {"user_id": ObjectId(user_id)}
+        if start or end:
+            filter_query["completed_at"] = {}
+            if start:
+                filter_query["completed_at"]["$gte"] = start
+            if end:
+                filter_query["completed_at"]["$lt"] = end
+        completions = await CompletionRepository(db).newest_first(filter_query, response, limit, cursor, fieldset)
+        
+        # Fetch the task details of the whole page with one query, unless
+        # neither the task nor the points it supplies were asked for
+        tasks = {}
+        if fieldset is None or "task" in fieldset or "points_earned" in fieldset:
+            tasks = await TaskRepository(db).by_ids(completion["task_id"] for completion in completions)
+            codec.tasks.to_api_many(list(tasks.values()))
         
         # Convert ObjectIds to strings and add task details
-        for completion in completions:
-            completion["_id"] = str(completion["_id"])
-            completion["id"] = completion["_id"]
-            completion["task_id"] = str(completion["task_id"])
-            completion["user_id"] = str(completion["user_id"])
-            if completion.get("group_id"):
-                completion["group_id"] = str(completion["group_id"])
-            
-            # Get task details
-            task = await db.habitgrove.tasks.find_one({"_id": ObjectId(completion["task_id"])})
+        for completion in codec.completions.to_api_many(completions):
+            task = tasks.get(completion["task_id"])
             if task:
-                task["_id"] = str(task["_id"])
-                task["id"] = task["_id"]
                 completion["task"] = task
                 
                 # Add points_earned if it doesn't exist
@@ -423,7 +479,7 @@ async def get_user_completions(
                 if "points_earned" not in completion:
                     completion["points_earned"] = 10
         
-        return [TaskCompletion(**completion) for completion in completions]
+        return json_response(List[sparse_model(TaskCompletion, fieldset)], completions, response)
         
     except HTTPException:
         raise
@@ -438,37 +494,53 @@ async def get_user_completions(
 @router.get("/group/{group_id}/completions", response_model=List[TaskCompletion])
 async def get_group_completions(
     group_id: str, 
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user = Depends(get_current_active_user)
 ):
+    """Get a group's completion feed, newest first, with task titles and member names.
+
+    Pages are keyed on (completed_at, _id) and read from the
+    (group_id, completed_at, _id) index; the cursor for the next page is
+    returned in the X-Next-Cursor header.
+    """
     if not ObjectId.is_valid(group_id):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid group ID")
+    fieldset = parse_fields(TaskCompletion, fields)
     
     try:
         db = await get_database()
         
-        print(f"Fetching completions for group: {group_id}")
-        
-        # Get group's task completions
-        cursor = db.habitgrove.task_completions.find({"group_id": ObjectId(group_id)})
-        completions = await cursor.to_list(length=100)
-        
-        print(f"Found {len(completions)} completions for group {group_id}")
+        filter_query = {"group_id": ObjectId(group_id)}
+        completions = await CompletionRepository(db).newest_first(filter_query, response, limit, cursor, fieldset)
+        
+        # Fetch the tasks and members of the whole page with one query each,
+        # skipping whichever the fieldset leaves out
+        task_ids = [completion["task_id"] for completion in completions]
+        user_ids = [completion["user_id"] for completion in completions]
+        if fieldset is not None:
+            task_ids = task_ids if "task" in fieldset else []
+            user_ids = user_ids if "user" in fieldset else []
+        tasks, names = await asyncio.gather(
+            TaskRepository(db).headlines_by_ids(task_ids),
+            UserRepository(db).names(user_ids),
+        )
         
-        # Convert ObjectIds to strings
-        for completion in completions:
-            completion["_id"] = str(completion["_id"])
-            completion["id"] = completion["_id"]
-            completion["task_id"] = str(completion["task_id"])
-            completion["user_id"] = str(completion["user_id"])
-            completion["group_id"] = str(completion["group_id"])
-            
-            # Ensure completed_at field exists and is properly formatted
+        # Convert ObjectIds to strings and add task and member details
+        for completion in codec.completions.to_api_many(completions):
+            # Ensure completed_at field exists
             if "completed_at" not in completion:
                 completion["completed_at"] = completion.get("created_at", datetime.utcnow())
-            elif isinstance(completion["completed_at"], str):
-                completion["completed_at"] = datetime.fromisoformat(completion["completed_at"].replace('Z', '+00:00'))
+            
+            task = tasks.get(completion["task_id"])
+            if task:
+                completion["task"] = codec.tasks.to_api(task)
+            if completion["user_id"] in names:
+                completion["user"] = {"id": completion["user_id"], "name": names[completion["user_id"]]}
         
-        return [TaskCompletion(**completion) for completion in completions]
+        return json_response(List[sparse_model(TaskCompletion, fieldset)], completions, response)
         
     except HTTPException:
         raise
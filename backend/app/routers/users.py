@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from bson import ObjectId
 from ..models.user import User, UserUpdate
-from ..auth import get_current_active_user
+from ..auth import get_current_active_user, invalidate_principal
 from ..database import get_database
+from ..repositories import TaskRepository, UserRepository
+from ..serialization import json_response
+from .. import codec
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -14,16 +17,12 @@ async def get_user(user_id: str, current_user = Depends(get_current_active_user)
     
     try:
         db = await get_database()
-        user = await db.habitgrove.users.find_one({"_id": ObjectId(user_id)})
+        user = await UserRepository(db).get(user_id)
         
         if not user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         
-        # Convert ObjectId to string and ensure both id and _id are set
-        user["_id"] = str(user["_id"])
-        user["id"] = user["_id"]
-        
-        return User(**user)
+        return json_response(User, codec.users.to_api(user))
         
     except HTTPException:
         raise
@@ -58,20 +57,16 @@ async def update_user(
         if not update_data:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No fields to update")
         
-        result = await db.habitgrove.users.update_one(
-            {"_id": ObjectId(user_id)},
-            {"$set": update_data}
-        )
-        
-        if result.matched_count == 0:
+        users = UserRepository(db)
+        if not await users.update_fields(user_id, update_data):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         
+        invalidate_principal(user_id)
+        
         # Get updated user
-        user = await db.habitgrove.users.find_one({"_id": ObjectId(user_id)})
-        user["_id"] = str(user["_id"])
-        user["id"] = user["_id"]
+        user = await users.get(user_id)
         
-        return User(**user)
+        return json_response(User, codec.users.to_api(user))
         
     except HTTPException:
         raise
@@ -95,19 +90,15 @@ async def add_favorite_task(
         db = await get_database()
         
         # Check if task exists
-        task = await db.habitgrove.tasks.find_one({"_id": ObjectId(task_id)})
-        if not task:
+        if not await TaskRepository(db).exists(task_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
         
         # Add task to user's favorites
-        result = await db.habitgrove.users.update_one(
-            {"_id": ObjectId(user_id)},
-            {"$addToSet": {"favorite_tasks": task_id}}
-        )
-        
-        if result.matched_count == 0:
+        if not await UserRepository(db).add_favorite_task(user_id, task_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         
+        invalidate_principal(user_id)
+        
         return {"message": "Task added to favorites"}
         
     except HTTPException:
@@ -132,14 +123,11 @@ async def remove_favorite_task(
         db = await get_database()
         
         # Remove task from user's favorites
-        result = await db.habitgrove.users.update_one(
-            {"_id": ObjectId(user_id)},
-            {"$pull": {"favorite_tasks": task_id}}
-        )
-        
-        if result.matched_count == 0:
+        if not await UserRepository(db).remove_favorite_task(user_id, task_id):
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         
+        invalidate_principal(user_id)
+        
         return {"message": "Task removed from favorites"}
         
     except HTTPException:
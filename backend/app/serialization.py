@@ -0,0 +1,55 @@
+"""Single-pass JSON responses for documents read from MongoDB.
+
+Returning ``[Task(**task) for task in tasks]`` validates every document
+twice: once when the models are built and again when FastAPI checks them
+against ``response_model``, before the stdlib encoder serializes the result.
+``json_response`` instead validates the raw documents once with a cached
+``TypeAdapter`` and serializes them with pydantic-core's JSON encoder, and
+FastAPI sends the returned ``Response`` as is. Endpoints keep their
+``response_model`` for the OpenAPI schema.
+
+Responses that do not go through ``json_response`` are rendered with orjson
+(see ``default_response_class`` in ``app.main``).
+"""
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+# Headers of the injected response that describe its own (empty) body
+_BODY_HEADERS = {b"content-length", b"content-type"}
+
+
+# Response types include sparse fieldset models, which are created per selection
+TYPE_ADAPTER_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=TYPE_ADAPTER_CACHE_SIZE)
+def type_adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def dump_json(response_type: Any, data: Any) -> bytes:
+    """Validate ``data`` as ``response_type`` once and encode it to JSON bytes."""
+    adapter = type_adapter(response_type)
+    return adapter.dump_json(adapter.validate_python(data), by_alias=True)
+
+
+def json_response(
+    response_type: Any,
+    data: Any,
+    response: Optional[Response] = None,
+    status_code: int = 200,
+) -> Response:
+    """Build the JSON response of an endpoint declared with ``response_model=response_type``.
+
+    Pass the endpoint's injected ``response`` to keep headers set on it,
+    such as the ``X-Next-Cursor`` of paginated lists.
+    """
+    result = Response(content=dump_json(response_type, data), media_type="application/json", status_code=status_code)
+    if response is not None:
+        result.raw_headers.extend(
+            (name, value) for name, value in response.raw_headers if name not in _BODY_HEADERS
+        )
+    return result
@@ -0,0 +1,186 @@
+"""Incremental parsing of large uploads with bounded memory.
+
+Request bodies are consumed chunk by chunk and records are yielded as soon
+as they are complete, so an upload of thousands of rows never has to be
+held in memory at once. Supported formats:
+
+* NDJSON (``application/x-ndjson``): one JSON object per line.
+* A JSON array of objects, or an object whose first key holds that array
+  (``{"tasks": [...]}``, the shape of the sample catalog files).
+* CSV (``text/csv``) with a header row; each row becomes an object keyed by
+  the header names.
+
+Each record is yielded as ``(row, value, error)`` with 1-based row numbers;
+a record that cannot be parsed carries an error message instead of a value.
+Errors that make the rest of a JSON array unreadable raise ``StreamFormatError``.
+"""
+import codecs
+import csv
+import json
+import re
+from typing import Any, AsyncIterator, Optional, Tuple
+
+# A single record larger than this is rejected instead of buffered further
+MAX_RECORD_BYTES = 1024 * 1024
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl", "application/ndjson")
+CSV_CONTENT_TYPES = ("text/csv", "application/csv")
+
+_WRAPPED_ARRAY = re.compile(r'\{\s*"[^"\\]*"\s*:\s*\[')
+
+Record = Tuple[int, Optional[Any], Optional[str]]
+
+
+class StreamFormatError(ValueError):
+    pass
+
+
+def _media_type(content_type: Optional[str]) -> str:
+    return (content_type or "").split(";")[0].strip().lower()
+
+
+def is_ndjson(content_type: Optional[str]) -> bool:
+    return _media_type(content_type) in NDJSON_CONTENT_TYPES
+
+
+def is_csv(content_type: Optional[str]) -> bool:
+    return _media_type(content_type) in CSV_CONTENT_TYPES
+
+
+async def _decode(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    buffer = ""
+    row = 0
+    async for text in _decode(chunks):
+        buffer += text
+        *lines, buffer = buffer.split("\n")
+        if len(buffer) > MAX_RECORD_BYTES:
+            raise StreamFormatError(f"Row {row + len(lines) + 1} exceeds {MAX_RECORD_BYTES} bytes")
+        for line in lines:
+            row += 1
+            if line.strip():
+                yield _parse_line(row, line)
+    if buffer.strip():
+        yield _parse_line(row + 1, buffer)
+
+
+def _parse_line(row: int, line: str) -> Record:
+    try:
+        return row, json.loads(line), None
+    except json.JSONDecodeError as e:
+        return row, None, f"Invalid JSON: {e.msg}"
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    decoder = json.JSONDecoder()
+    buffer = ""
+    in_array = False
+    done = False
+    row = 0
+    at_eof = False
+    texts = _decode(chunks)
+
+    while not done:
+        try:
+            buffer += await texts.__anext__()
+        except StopAsyncIteration:
+            at_eof = True
+
+        while not done:
+            if not in_array:
+                buffer = buffer.lstrip()
+                if buffer.startswith("["):
+                    buffer, in_array = buffer[1:], True
+                    continue
+                match = _WRAPPED_ARRAY.match(buffer)
+                if match:
+                    buffer, in_array = buffer[match.end():], True
+                    continue
+                if at_eof or len(buffer) > 256 or (buffer and buffer[0] not in "[{"):
+                    raise StreamFormatError("Expected a JSON array or an object holding one")
+                break
+
+            buffer = buffer.lstrip(" \t\r\n,")
+            if buffer.startswith("]"):
+                done = True
+                break
+            if not buffer:
+                break
+            try:
+                value, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError as e:
+                if at_eof:
+                    raise StreamFormatError(f"Invalid JSON in row {row + 1}: {e.msg}")
+                if len(buffer) > MAX_RECORD_BYTES:
+                    raise StreamFormatError(f"Row {row + 1} exceeds {MAX_RECORD_BYTES} bytes")
+                break
+            if not at_eof and end == len(buffer) and not isinstance(value, (dict, list)):
+                # A scalar at the end of the buffer may continue in the next chunk
+                break
+            row += 1
+            buffer = buffer[end:]
+            yield row, value, None
+
+        if at_eof and not done:
+            raise StreamFormatError("Unexpected end of JSON array")
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    buffer = ""
+    number = 0
+    async for text in _decode(chunks):
+        buffer += text
+        *lines, buffer = buffer.split("\n")
+        if len(buffer) > MAX_RECORD_BYTES:
+            raise StreamFormatError(f"Line {number + len(lines) + 1} exceeds {MAX_RECORD_BYTES} bytes")
+        for line in lines:
+            number += 1
+            yield line.rstrip("\r")
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    header = None
+    record = ""
+    row = 0
+    async for line in _iter_lines(chunks):
+        record = f"{record}\n{line}" if record else line
+        if record.count('"') % 2:
+            # A quoted field continues on the next line
+            if len(record) > MAX_RECORD_BYTES:
+                raise StreamFormatError(f"Row {row + 1} exceeds {MAX_RECORD_BYTES} bytes")
+            continue
+        line, record = record, ""
+        if not line.strip():
+            continue
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, None, f"Expected {len(header)} columns, got {len(values)}"
+        else:
+            yield row, dict(zip(header, values)), None
+    if record:
+        raise StreamFormatError(f"Unterminated quoted field in row {row + 1}")
+
+
+def iter_records(chunks: AsyncIterator[bytes], content_type: Optional[str]) -> AsyncIterator[Record]:
+    """Pick the parser for ``content_type`` and iterate the uploaded records."""
+    if is_ndjson(content_type):
+        return iter_ndjson(chunks)
+    if is_csv(content_type):
+        return iter_csv(chunks)
+    return iter_json_array(chunks)
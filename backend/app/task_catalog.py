@@ -0,0 +1,138 @@
+"""In-process cache of the active task catalog served by GET /tasks/.
+
+The catalog is loaded from MongoDB once, each task is validated once, and the
+serialized JSON of every (type, category, difficulty) combination is kept,
+so repeated reads need neither a database call nor re-serialization. Sparse
+fieldsets are chosen by the client, so their bodies are serialized from the
+validated tasks on each request instead of being kept.
+
+Write endpoints call ``task_catalog.invalidate()``, which bumps ``version``;
+the next read reloads. Other worker processes do not see that bump, so the
+catalog is also reloaded after ``task_catalog_ttl_seconds``.
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from . import codec
+from .config import settings
+from .fieldsets import Fieldset
+from .models.task import Task
+from .repositories import TaskRepository
+
+# Old categories and types still present in some task documents
+LEGACY_CATEGORY_MAPPING = {
+    'recycling': 'environment',
+    'water': 'environment',
+    'energy': 'environment',
+    'transport': 'environment',
+    'consumption': 'other'
+}
+LEGACY_TYPE_MAPPING = {
+    'yearly': 'one_time'
+}
+
+# GET /tasks/ has always returned at most this many tasks
+MAX_TASKS_PER_VIEW = 100
+
+_task_list_adapter = TypeAdapter(List[Task])
+
+ViewKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+def normalize_legacy_task(task: dict) -> dict:
+    """Map old category and type values of a task document in place."""
+    if task.get("category") in LEGACY_CATEGORY_MAPPING:
+        task["category"] = LEGACY_CATEGORY_MAPPING[task["category"]]
+    if task.get("type") in LEGACY_TYPE_MAPPING:
+        task["type"] = LEGACY_TYPE_MAPPING[task["type"]]
+    return task
+
+
+class TaskCatalog:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self._loaded_version: Optional[int] = None
+        self._loaded_at = 0.0
+        # (stored type, stored category, difficulty, validated task)
+        self._entries: List[Tuple[str, str, str, Task]] = []
+        self._views: Dict[ViewKey, bytes] = {}
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Mark the catalog stale; call after any write to the tasks collection."""
+        self.version += 1
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._loaded_version == self.version
+            and time.monotonic() - self._loaded_at < self.ttl
+        )
+
+    async def _load(self, client) -> None:
+        version = self.version
+        entries = []
+        async for task in TaskRepository(client).active():
+            stored_type, stored_category = task.get("type"), task.get("category")
+            codec.tasks.to_api(task)
+            normalize_legacy_task(task)
+            entries.append((stored_type, stored_category, task.get("difficulty"), Task(**task)))
+
+        self._entries = entries
+        self._views = {}
+        self._loaded_version = version
+        self._loaded_at = time.monotonic()
+        self.loads += 1
+
+    async def get_view(
+        self,
+        client,
+        type: Optional[str] = None,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        fields: Optional[Fieldset] = None,
+    ) -> bytes:
+        """Return the JSON body of GET /tasks/ for the given filters and fieldset."""
+        if not self._is_fresh():
+            async with self._lock:
+                if not self._is_fresh():
+                    await self._load(client)
+
+        key = (type, category, difficulty)
+        body = None if fields else self._views.get(key)
+        if body is not None:
+            self.hits += 1
+            return body
+
+        self.misses += 1
+        tasks = [
+            task for stored_type, stored_category, stored_difficulty, task in self._entries
+            if (type is None or stored_type == type)
+            and (category is None or stored_category == category)
+            and (difficulty is None or stored_difficulty == difficulty)
+        ][:MAX_TASKS_PER_VIEW]
+        if fields:
+            return _task_list_adapter.dump_json(tasks, by_alias=True, include={"__all__": set(fields)})
+        body = _task_list_adapter.dump_json(tasks, by_alias=True)
+        self._views[key] = body
+        return body
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "loaded_version": self._loaded_version,
+            "tasks": len(self._entries),
+            "views": len(self._views),
+            "hits": self.hits,
+            "misses": self.misses,
+            "loads": self.loads,
+        }
+
+
+task_catalog = TaskCatalog(ttl=settings.task_catalog_ttl_seconds)
@@ -0,0 +1,100 @@
+"""Batched task inserts shared by the admin and group bulk upload endpoints."""
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from .config import settings
+from .models.task import TaskCreate
+from .repositories import TaskRepository
+from .streaming import Record
+from .task_catalog import task_catalog
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+async def insert_tasks(client, tasks: List[dict]) -> List[dict]:
+    """Insert ``tasks`` with one unordered ``insert_many``.
+
+    pymongo assigns ``_id`` to each document before sending it; documents the
+    server rejected are left out of the returned list.
+    """
+    if not tasks:
+        return []
+
+    failed = set()
+    try:
+        await TaskRepository(client).insert_many(tasks)
+    except BulkWriteError as e:
+        failed = {write_error["index"] for write_error in e.details.get("writeErrors", [])}
+    finally:
+        task_catalog.invalidate()
+
+    return [task for index, task in enumerate(tasks) if index not in failed]
+
+
+async def import_task_stream(
+    client,
+    records: AsyncIterator[Record],
+    extra_fields: Optional[dict] = None,
+) -> dict:
+    """Validate and insert streamed task records in batches.
+
+    At most ``bulk_insert_batch_size`` documents are held at a time, so memory
+    stays bounded however long the upload is. Invalid rows are reported with
+    their row number and skipped; up to ``bulk_import_max_errors`` of them
+    are listed in the result.
+    """
+    inserted = 0
+    failed = 0
+    errors = []
+    batch, batch_rows = [], []
+
+    def add_error(row: int, message: str):
+        nonlocal failed
+        failed += 1
+        if len(errors) < settings.bulk_import_max_errors:
+            errors.append({"row": row, "error": message})
+
+    async def flush():
+        nonlocal inserted
+        stored = await insert_tasks(client, batch)
+        inserted += len(stored)
+        if len(stored) < len(batch):
+            stored_ids = {id(task) for task in stored}
+            for row, task in zip(batch_rows, batch):
+                if id(task) not in stored_ids:
+                    add_error(row, "Insert failed")
+        batch.clear()
+        batch_rows.clear()
+
+    async for row, value, error in records:
+        if error:
+            add_error(row, error)
+            continue
+        if not isinstance(value, dict):
+            add_error(row, "Expected a JSON object")
+            continue
+        try:
+            task_dict = TaskCreate(**value).dict()
+        except ValidationError as e:
+            add_error(row, format_validation_error(e))
+            continue
+
+        task_dict.update(extra_fields or {})
+        task_dict["created_at"] = datetime.utcnow()
+        batch.append(task_dict)
+        batch_rows.append(row)
+        if len(batch) >= settings.bulk_insert_batch_size:
+            await flush()
+
+    if batch:
+        await flush()
+
+    return {"inserted": inserted, "failed": failed, "errors": errors}
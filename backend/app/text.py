@@ -0,0 +1,24 @@
+import unicodedata
+
+# Letters without a Unicode decomposition to their base letter
+_FOLD = str.maketrans({
+    "ı": "i",
+    "İ": "i",
+    "ß": "ss",
+    "ø": "o",
+    "Ø": "o",
+    "ł": "l",
+    "Ł": "l",
+})
+
+
+def normalize_search_text(text: str) -> str:
+    """Fold ``text`` for case- and diacritic-insensitive prefix search.
+
+    "Şahinbey Belediyesi" and "sahinbey belediyesi" normalize to the same
+    value; Turkish dotted and dotless i both become "i".
+    """
+    text = text.translate(_FOLD)
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
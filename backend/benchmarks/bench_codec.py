@@ -0,0 +1,98 @@
+"""Measure the cost of converting MongoDB documents for the API.
+
+Converts batches of freshly built documents per collection, first with the
+per-field conversions the routers used to do by hand and then with the
+``app.codec`` converters, e.g.:
+
+    python benchmarks/bench_codec.py --batch 10000 --rounds 20
+
+No database is needed. Each line reports the median time per batch and
+per document.
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bson import ObjectId  # noqa: E402
+
+from app import codec  # noqa: E402
+
+
+def user_doc(i):
+    return {"_id": ObjectId(), "name": f"User {i}", "email": f"user{i}@example.com", "points": i,
+            "group_id": ObjectId() if i % 4 else None, "favorite_tasks": [], "created_at": datetime.utcnow()}
+
+
+def group_doc(i):
+    return {"_id": ObjectId(), "name": f"Group {i}", "type": "ngo", "admins": [ObjectId(), ObjectId()],
+            "member_count": i, "total_points": i * 10}
+
+
+def completion_doc(i):
+    return {"_id": ObjectId(), "task_id": ObjectId(), "user_id": ObjectId(), "group_id": ObjectId(),
+            "completed_at": datetime.utcnow(), "points_earned": 10}
+
+
+def convert_user_by_hand(user):
+    user["_id"] = str(user["_id"])
+    user["id"] = user["_id"]
+    if "group_id" in user and user["group_id"] is not None:
+        user["group_id"] = str(user["group_id"])
+
+
+def convert_group_by_hand(group):
+    group["_id"] = str(group["_id"])
+    group["id"] = group["_id"]
+    if "admins" in group and group["admins"]:
+        group["admins"] = [str(admin) if isinstance(admin, ObjectId) else admin for admin in group["admins"]]
+
+
+def convert_completion_by_hand(completion):
+    completion["_id"] = str(completion["_id"])
+    completion["id"] = completion["_id"]
+    completion["task_id"] = str(completion["task_id"])
+    completion["user_id"] = str(completion["user_id"])
+    if completion.get("group_id"):
+        completion["group_id"] = str(completion["group_id"])
+
+
+def measure(make, convert, args):
+    samples = []
+    for _ in range(args.rounds):
+        docs = [make(i) for i in range(args.batch)]
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        convert(docs)
+        samples.append(time.perf_counter() - start)
+        gc.enable()
+    return statistics.median(samples)
+
+
+def main(args):
+    cases = (
+        ("users", user_doc, convert_user_by_hand, codec.users),
+        ("groups", group_doc, convert_group_by_hand, codec.groups),
+        ("task_completions", completion_doc, convert_completion_by_hand, codec.completions),
+    )
+    for name, make, by_hand, document_codec in cases:
+        print(name)
+        for label, convert in (
+            ("by hand", lambda docs: [by_hand(doc) for doc in docs]),
+            ("codec", document_codec.to_api_many),
+        ):
+            median = measure(make, convert, args)
+            print(f"  {label:<8} {median * 1000:8.2f}ms per batch  {median / args.batch * 1e6:6.2f}us per document")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch", type=int, default=10000, help="documents per batch")
+    parser.add_argument("--rounds", type=int, default=20)
+    main(parser.parse_args())
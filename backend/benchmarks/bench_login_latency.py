@@ -0,0 +1,90 @@
+"""Measure GET /tasks/ latency while a burst of logins runs concurrently.
+
+Run against a live server, e.g.:
+
+    python benchmarks/bench_login_latency.py --base-url http://localhost:8000 \
+        --email ahmet@example.com --password password123
+
+With bcrypt running on the event loop the /tasks/ p99 grows with every
+concurrent login; with the password hash pool it should stay close to the
+idle baseline, and logins beyond the pool capacity fail fast with 503.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def login(client, email, password):
+    return await client.post("/auth/login", data={"username": email, "password": password})
+
+
+async def login_burst(client, args, stop, results):
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await login(client, args.email, args.password)
+        results.setdefault(response.status_code, []).append(time.perf_counter() - start)
+
+
+async def sample_tasks(client, token, args):
+    headers = {"Authorization": f"Bearer {token}"}
+    samples = []
+    deadline = time.perf_counter() + args.duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get("/tasks/", headers=headers)
+        response.raise_for_status()
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(args.interval)
+    return samples
+
+
+def report(label, samples):
+    ms = [s * 1000 for s in samples]
+    print(
+        f"{label:<22} n={len(ms):<5} p50={percentile(ms, 50):8.1f}ms "
+        f"p99={percentile(ms, 99):8.1f}ms mean={statistics.fmean(ms) if ms else 0:8.1f}ms"
+    )
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.logins + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        response = await login(client, args.email, args.password)
+        response.raise_for_status()
+        token = response.json()["access_token"]
+
+        report("/tasks/ idle", await sample_tasks(client, token, args))
+
+        stop = asyncio.Event()
+        login_results = {}
+        burst = [asyncio.create_task(login_burst(client, args, stop, login_results)) for _ in range(args.logins)]
+        try:
+            report(f"/tasks/ +{args.logins} logins", await sample_tasks(client, token, args))
+        finally:
+            stop.set()
+            await asyncio.gather(*burst)
+
+        for status_code, samples in sorted(login_results.items()):
+            report(f"/auth/login {status_code}", samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=50, help="concurrent login loops")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per phase")
+    parser.add_argument("--interval", type=float, default=0.01, help="pause between /tasks/ samples")
+    asyncio.run(main(parser.parse_args()))
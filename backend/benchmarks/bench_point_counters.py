@@ -0,0 +1,88 @@
+"""Measure group point write throughput with and without sharded counters.
+
+Runs many concurrent completions' point increments against one group,
+first with plain ``$inc total_points`` and then with N counter shards, e.g.:
+
+    python benchmarks/bench_point_counters.py --mongo-url mongodb://localhost:27017 \
+        --workers 200 --shards 16
+
+A throwaway group is created in the habitgrove database and removed
+afterwards. Each mode reports increments per second and latency;
+the final totals check that no points were lost.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+from app.completions import apply_point_increments  # noqa: E402
+from app.point_counters import add_sharded_points, set_point_shards  # noqa: E402
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def worker(client, group_id, deadline, samples):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await apply_point_increments(client, {}, {group_id: 1})
+        samples.append(time.perf_counter() - start)
+
+
+async def run_phase(client, group_id, args):
+    samples = []
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(*[worker(client, group_id, deadline, samples) for _ in range(args.workers)])
+    return samples
+
+
+def report(label, samples, duration):
+    ms = [s * 1000 for s in samples]
+    print(
+        f"{label:<16} writes={len(ms):<7} {len(ms) / duration:9.0f}/s "
+        f"p50={percentile(ms, 50):7.1f}ms p99={percentile(ms, 99):7.1f}ms "
+        f"mean={statistics.fmean(ms) if ms else 0:7.1f}ms"
+    )
+
+
+async def main(args):
+    client = AsyncIOMotorClient(args.mongo_url, maxPoolSize=args.workers + 10)
+    database = client.habitgrove
+    group_id = (await database.groups.insert_one({"name": "bench-point-counters", "type": "ngo", "total_points": 0})).inserted_id
+    try:
+        expected = 0
+        for label, shards in (("single document", 0), (f"{args.shards} shards", args.shards)):
+            await set_point_shards(client, str(group_id), shards)
+            samples = await run_phase(client, str(group_id), args)
+            expected += len(samples)
+            report(label, samples, args.duration)
+
+        # Bypass the cached shard sums for the final check
+        await set_point_shards(client, str(group_id), 0)
+        group = await database.groups.find_one({"_id": group_id}, {"total_points": 1, "point_shards": 1})
+        (group,) = await add_sharded_points(client, [group])
+        print(f"total points {group['total_points']} (expected {expected})")
+    finally:
+        await database.groups.delete_one({"_id": group_id})
+        await database.group_point_shards.delete_many({"group_id": group_id})
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--workers", type=int, default=200, help="concurrent increment loops")
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per mode")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,105 @@
+"""Measure the cost of turning list endpoint documents into a JSON body.
+
+Compares, per item of a list of Mongo-shaped documents:
+
+* models: build ``Model(**doc)`` for every document and let FastAPI check them
+  against ``response_model``, run ``jsonable_encoder`` and ``json.dumps``
+  (what the endpoints did before ``app.serialization``);
+* json_response: one ``TypeAdapter`` validation and pydantic-core's encoder.
+
+No database is needed, e.g.:
+
+    python benchmarks/bench_serialization.py --items 100 --rounds 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bson import ObjectId  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.models.group import Group  # noqa: E402
+from app.models.task import Task  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.serialization import json_response  # noqa: E402
+
+
+def task_doc(i):
+    task_id = str(ObjectId())
+    return {
+        "_id": task_id, "id": task_id, "title": f"Task number {i}",
+        "description": "Walk or cycle instead of driving today", "type": "daily",
+        "category": "environment", "difficulty": "easy", "points": 10 + i % 50,
+        "isActive": True, "is_group_task": False, "group_id": None, "created_at": datetime.utcnow(),
+    }
+
+
+def user_doc(i):
+    user_id = str(ObjectId())
+    return {
+        "_id": user_id, "id": user_id, "name": f"User {i}", "email": f"user{i}@example.com",
+        "points": i * 7, "group_id": str(ObjectId()), "favorite_tasks": [str(ObjectId()) for _ in range(3)],
+        "is_admin": False, "created_at": datetime.utcnow(),
+    }
+
+
+def group_doc(i):
+    group_id = str(ObjectId())
+    return {
+        "_id": group_id, "id": group_id, "name": f"Group {i}", "type": "university",
+        "description": "A campus sustainability group", "admins": [str(ObjectId())],
+        "member_count": 40 + i, "total_points": i * 100, "created_at": datetime.utcnow(),
+    }
+
+
+async def encode_with_models(field, model, docs):
+    content = await serialize_response(field=field, response_content=[model(**doc) for doc in docs], is_coroutine=True)
+    return JSONResponse(content).body
+
+
+async def encode_with_json_response(model, docs):
+    return json_response(List[model], docs).body
+
+
+def timed(rounds, run):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main(args):
+    loop = asyncio.new_event_loop()
+    for name, model, make in (("Task", Task, task_doc), ("User", User, user_doc), ("Group", Group, group_doc)):
+        docs = [make(i) for i in range(args.items)]
+        field = create_response_field(name=f"Response_{name}", type_=List[model])
+        before = loop.run_until_complete(encode_with_models(field, model, docs))
+        after = loop.run_until_complete(encode_with_json_response(model, docs))
+        print(f"{name}: {len(before)} -> {len(after)} bytes")
+
+        for label, make_coro in (
+            ("models", lambda: encode_with_models(field, model, [dict(doc) for doc in docs])),
+            ("json_response", lambda: encode_with_json_response(model, [dict(doc) for doc in docs])),
+        ):
+            samples = timed(args.rounds, lambda: loop.run_until_complete(make_coro()))
+            per_item = statistics.median(samples) / args.items * 1e6
+            print(f"  {label:<14} {statistics.median(samples) * 1000:8.2f}ms per list  {per_item:6.1f}us per item")
+    loop.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100, help="documents per list")
+    parser.add_argument("--rounds", type=int, default=200)
+    main(parser.parse_args())
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
+from app.text import normalize_search_text
 
 # Load environment variables
 load_dotenv()
@@ -51,21 +52,21 @@ groups_data = [
     {
         "name": "Gaziantep Üniversitesi",
         "type": "university",
-        "members": [],
+        "member_count": 0,
         "total_points": 0,
         "created_at": datetime.utcnow() - timedelta(days=30)
     },
     {
         "name": "Şahinbey Belediyesi",
         "type": "municipality",
-        "members": [],
+        "member_count": 0,
         "total_points": 0,
         "created_at": datetime.utcnow() - timedelta(days=25)
     },
     {
         "name": "Ekoloji Derneği",
         "type": "ngo",
-        "members": [],
+        "member_count": 0,
         "total_points": 0,
         "created_at": datetime.utcnow() - timedelta(days=20)
     }
@@ -337,6 +338,7 @@ async def seed_database():
     await db.groups.delete_many({})
     await db.tasks.delete_many({})
     await db.task_completions.delete_many({})
+    await db.group_memberships.delete_many({})
     
     print("🗑️  Cleared existing data")
     
@@ -351,6 +353,7 @@ async def seed_database():
     # Insert groups
     group_ids = []
     for group_data in groups_data:
+        group_data["name_search"] = normalize_search_text(group_data["name"])
         result = await db.groups.insert_one(group_data)
         group_ids.append(result.inserted_id)
     
@@ -381,16 +384,20 @@ async def seed_database():
         {"_id": user_ids[4]}, {"$set": {"group_id": group_ids[2]}}
     )
     
-    # Update group members
-    await db.groups.update_one(
-        {"_id": group_ids[0]}, {"$set": {"members": [user_ids[0], user_ids[1]]}}
-    )
-    await db.groups.update_one(
-        {"_id": group_ids[1]}, {"$set": {"members": [user_ids[2], user_ids[3]]}}
-    )
-    await db.groups.update_one(
-        {"_id": group_ids[2]}, {"$set": {"members": [user_ids[4]]}}
-    )
+    # Add group memberships
+    memberships = {
+        group_ids[0]: [user_ids[0], user_ids[1]],
+        group_ids[1]: [user_ids[2], user_ids[3]],
+        group_ids[2]: [user_ids[4]],
+    }
+    for group_id, member_ids in memberships.items():
+        await db.group_memberships.insert_many([
+            {"group_id": group_id, "user_id": member_id, "joined_at": datetime.utcnow()}
+            for member_id in member_ids
+        ])
+        await db.groups.update_one(
+            {"_id": group_id}, {"$set": {"member_count": len(member_ids)}}
+        )
     
     print("👥 Assigned users to groups")
     
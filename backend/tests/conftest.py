@@ -0,0 +1,39 @@
+import os
+
+import pytest
+import pytest_asyncio
+
+# Settings are read at import time; the database tests below never connect
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+
+
+@pytest.fixture
+def mongo():
+    """An in-memory MongoDB client, also served by ``get_database``."""
+    from mongomock_motor import AsyncMongoMockClient
+    from app import database
+
+    previous = database.db.client
+    database.db.client = AsyncMongoMockClient()
+    yield database.db.client
+    database.db.client = previous
+
+
+@pytest_asyncio.fixture
+async def admin_api(mongo):
+    """An HTTP client for the app, authenticated as an admin user stored in ``mongo``."""
+    from httpx import AsyncClient
+    from app.auth import create_access_token, principal_cache
+    from app.main import app
+    from app.task_catalog import task_catalog
+
+    result = await mongo.habitgrove.users.insert_one(
+        {"name": "Admin", "email": "admin@example.com", "points": 0, "is_admin": True, "favorite_tasks": []}
+    )
+    token = create_access_token({"sub": str(result.inserted_id)})
+    async with AsyncClient(app=app, base_url="http://test", headers={"Authorization": f"Bearer {token}"}) as client:
+        client.user_id = str(result.inserted_id)
+        yield client
+    principal_cache.clear()
+    task_catalog.invalidate()
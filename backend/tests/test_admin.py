@@ -0,0 +1,91 @@
+import pytest
+from bson import ObjectId
+
+
+@pytest.mark.asyncio
+async def test_statistics_count_and_rank_users_and_groups(mongo, admin_api):
+    await mongo.habitgrove.users.insert_many([
+        {"name": f"User {points}", "email": f"u{points}@example.com", "points": points, "password_hash": "x"}
+        for points in (5, 30, 20)
+    ])
+    await mongo.habitgrove.groups.insert_many([
+        {"name": "Small", "type": "ngo", "admins": [], "total_points": 3, "members": ["a"]},
+        {"name": "Big", "type": "ngo", "admins": [], "total_points": 9, "member_count": 4},
+    ])
+
+    for estimate in ("false", "true"):
+        response = await admin_api.get("/admin/statistics", params={"estimate": estimate, "refresh": "true"})
+        assert response.status_code == 200
+        statistics = response.json()
+        assert statistics["total_users"] == 4 and statistics["total_groups"] == 2
+        assert [user["points"] for user in statistics["top_users"]] == [30, 20, 5, 0]
+        assert "password_hash" not in statistics["top_users"][0]
+        assert [(group["name"], group["member_count"]) for group in statistics["top_groups"]] == [("Big", 4), ("Small", 1)]
+
+
+async def add_admin_requests(mongo, count):
+    groups = await mongo.habitgrove.groups.insert_many([
+        {"name": f"Group {index}", "type": "ngo", "admins": []} for index in range(count)
+    ])
+    requests = await mongo.habitgrove.admin_requests.insert_many([
+        {"user_id": str(ObjectId()), "group_id": str(group_id), "status": "pending"}
+        for group_id in groups.inserted_ids
+    ])
+    return [str(request_id) for request_id in requests.inserted_ids]
+
+
+async def group_admins(mongo):
+    return {
+        str(group["_id"]): {str(admin_id) for admin_id in group["admins"]}
+        async for group in mongo.habitgrove.groups.find({}, {"admins": 1})
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_review_grants_admin_only_for_pending_requests(mongo, admin_api):
+    request_ids = await add_admin_requests(mongo, 3)
+    await mongo.habitgrove.admin_requests.update_one({"_id": ObjectId(request_ids[2])}, {"$set": {"status": "rejected"}})
+
+    response = await admin_api.post(
+        "/admin/admin-requests/review",
+        json={"request_ids": request_ids + [request_ids[0]], "status": "approved"},
+    )
+    assert response.status_code == 200
+    assert response.json()["reviewed"] == 2 and response.json()["skipped"] == [request_ids[2]]
+
+    admins = await group_admins(mongo)
+    async for request in mongo.habitgrove.admin_requests.find():
+        expected = {request["user_id"]} if str(request["_id"]) != request_ids[2] else set()
+        assert admins[request["group_id"]] == expected
+    batches = await mongo.habitgrove.admin_requests.distinct("review_batch", {"status": "approved"})
+    assert len(batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_review_skips_requests_rejected_while_it_runs(mongo, admin_api, monkeypatch):
+    from mongomock.collection import Collection
+
+    request_ids = await add_admin_requests(mongo, 2)
+    rejected = ObjectId(request_ids[1])
+
+    # Another admin rejects a request after the review started, before it writes
+    def rejecting_first(write):
+        def wrapper(self, *args, **kwargs):
+            if self.name == "admin_requests" and not wrapper.done:
+                wrapper.done = True
+                Collection.update_one(self, {"_id": rejected}, {"$set": {"status": "rejected"}})
+            return write(self, *args, **kwargs)
+        wrapper.done = False
+        return wrapper
+
+    for name in ("find_one_and_update", "update_many", "update_one"):
+        monkeypatch.setattr(Collection, name, rejecting_first(getattr(Collection, name)))
+
+    response = await admin_api.post("/admin/admin-requests/review", json={"request_ids": request_ids, "status": "approved"})
+    assert response.json()["reviewed"] == 1 and response.json()["skipped"] == [request_ids[1]]
+
+    admins = await group_admins(mongo)
+    async for request in mongo.habitgrove.admin_requests.find():
+        approved = request["_id"] != rejected
+        assert request["status"] == ("approved" if approved else "rejected")
+        assert admins[request["group_id"]] == ({request["user_id"]} if approved else set())
@@ -0,0 +1,58 @@
+from app.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_hit_and_miss_counters():
+    cache = TTLCache(maxsize=10, ttl=30)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+def test_cache_entries_expire():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=30, timer=clock)
+    cache.set("a", 1)
+    
+    clock.now = 29
+    assert cache.get("a") == 1
+    
+    clock.now = 30
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_invalidate_and_disabled():
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("a", 1)
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    
+    disabled = TTLCache(maxsize=10, ttl=0)
+    disabled.set("a", 1)
+    assert disabled.get("a") is None
@@ -0,0 +1,36 @@
+from bson import ObjectId
+
+from app import codec
+from app.models.group import Group
+from app.models.task_completion import TaskCompletion
+
+
+def test_document_is_converted_in_place():
+    group_id, admin_id = ObjectId(), ObjectId()
+    doc = {"_id": group_id, "name": "Green", "type": "ngo", "admins": [admin_id, "legacy"]}
+
+    assert codec.groups.to_api(doc) is doc
+    assert doc["_id"] == doc["id"] == str(group_id)
+    assert doc["admins"] == [str(admin_id), "legacy"]
+
+
+def test_summary_moves_id_and_missing_refs_are_left_alone():
+    doc = codec.group_summaries.to_api({"_id": ObjectId(), "name": "Green"})
+    assert "_id" not in doc and isinstance(doc["id"], str)
+
+    completion = codec.completions.to_api({"_id": ObjectId(), "task_id": ObjectId(), "user_id": "u1", "group_id": None})
+    assert completion["user_id"] == "u1" and completion["group_id"] is None
+
+
+def test_models_accept_object_ids():
+    group = Group(id=ObjectId(), name="Green", type="ngo", admins=[ObjectId()])
+    assert isinstance(group.id, str) and isinstance(group.admins[0], str)
+
+    completion = TaskCompletion(_id=ObjectId(), task_id=ObjectId(), user_id=ObjectId(), points_earned=5)
+    assert all(isinstance(value, str) for value in (completion.id, completion.task_id, completion.user_id))
+
+
+def test_object_id_accepts_strings_and_object_ids():
+    value = ObjectId()
+    assert codec.object_id(value) is value
+    assert codec.object_id(str(value)) == value
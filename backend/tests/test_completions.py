@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.completions import backfill_period_keys
+from app.periods import already_completed_message
+
+NOW = datetime.utcnow()
+
+
+async def add_task(mongo, task_type="daily", points=10):
+    result = await mongo.habitgrove.tasks.insert_one({
+        "title": "Recycle", "description": "Recycle one bottle", "type": task_type,
+        "category": "environment", "difficulty": "easy", "points": points, "isActive": True,
+    })
+    return str(result.inserted_id)
+
+
+async def add_legacy_completion(mongo, user_id, task_id, completed_at=NOW):
+    """A completion stored before period keys existed."""
+    await mongo.habitgrove.task_completions.insert_one({
+        "user_id": ObjectId(user_id), "task_id": ObjectId(task_id), "completed_at": completed_at, "points_earned": 10,
+    })
+
+
+@pytest.mark.asyncio
+async def test_legacy_completion_in_current_period_blocks_completion(mongo, admin_api):
+    task_id = await add_task(mongo)
+    await add_legacy_completion(mongo, admin_api.user_id, task_id)
+
+    response = await admin_api.post("/tasks/complete", json={"task_id": task_id, "user_id": admin_api.user_id})
+    assert response.status_code == 400
+
+    await add_legacy_completion(mongo, admin_api.user_id, task_id, datetime(2020, 1, 1))
+    other_task_id = await add_task(mongo)
+    await add_legacy_completion(mongo, admin_api.user_id, other_task_id, datetime(2020, 1, 1))
+    response = await admin_api.post("/tasks/complete", json={"task_id": other_task_id, "user_id": admin_api.user_id})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_backfill_sets_period_keys_once_per_period(mongo, admin_api):
+    task_id = await add_task(mongo, "weekly")
+    await add_legacy_completion(mongo, admin_api.user_id, task_id, datetime(2026, 1, 12))
+    await add_legacy_completion(mongo, admin_api.user_id, task_id, datetime(2026, 1, 14))
+    await add_legacy_completion(mongo, admin_api.user_id, task_id, datetime(2026, 1, 20))
+
+    result = await backfill_period_keys(mongo)
+
+    assert result == {"completions_updated": 2, "duplicates": 1, "skipped": 0}
+    keys = await mongo.habitgrove.task_completions.distinct("period_key")
+    assert sorted(keys) == ["week:2026-W03", "week:2026-W04"]
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_repeats_within_the_batch_and_of_stored_completions(mongo, admin_api):
+    stored_task_id = await add_task(mongo)
+    weekly_task_id = await add_task(mongo, "weekly")
+    legacy_task_id = await add_task(mongo)
+    response = await admin_api.post("/tasks/complete", json={"task_id": stored_task_id, "user_id": admin_api.user_id})
+    assert response.status_code == 200
+    await add_legacy_completion(mongo, admin_api.user_id, legacy_task_id)
+    other_user = await mongo.habitgrove.users.insert_one({"name": "Other", "email": "o@example.com", "points": 0})
+
+    items = [
+        {"task_id": stored_task_id, "user_id": admin_api.user_id},
+        {"task_id": weekly_task_id, "user_id": admin_api.user_id},
+        {"task_id": weekly_task_id, "user_id": admin_api.user_id},
+        {"task_id": weekly_task_id, "user_id": str(other_user.inserted_id)},
+        {"task_id": legacy_task_id, "user_id": admin_api.user_id},
+        {"task_id": str(ObjectId()), "user_id": admin_api.user_id},
+        {"task_id": "not-an-id", "user_id": admin_api.user_id},
+    ]
+    response = await admin_api.post("/tasks/complete/batch", json={"completions": items})
+    assert response.status_code == 200
+    body = response.json()
+
+    assert [result["success"] for result in body["results"]] == [False, True, False, True, False, False, False]
+    assert body["completed"] == 2 and body["failed"] == 5
+    errors = [result.get("error") for result in body["results"]]
+    assert errors[0] == errors[4] == already_completed_message("daily")
+    assert errors[2] == already_completed_message("weekly")
+    assert body["results"][5]["error"] == "Task not found"
+    assert body["results"][6]["error"] == "Invalid task or user ID"
+    assert await mongo.habitgrove.task_completions.count_documents({"task_id": ObjectId(weekly_task_id)}) == 2
+    user = await mongo.habitgrove.users.find_one({"_id": ObjectId(admin_api.user_id)})
+    assert user["points"] == 20
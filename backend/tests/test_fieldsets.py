@@ -0,0 +1,38 @@
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.fieldsets import parse_fields, sparse_model, sparse_projection
+from app.models.task import Task
+from app.models.task_completion import TaskCompletion
+from app.projections import model_projection
+from app.serialization import dump_json, type_adapter
+
+
+def test_parse_fields_keeps_model_order_and_adds_id():
+    assert parse_fields(Task, None) is None
+    assert parse_fields(Task, "points, title,_id") == ("title", "points", "id")
+    with pytest.raises(HTTPException) as error:
+        parse_fields(Task, "title,password_hash")
+    assert error.value.status_code == 400
+
+
+def test_sparse_model_serializes_selected_fields_only():
+    fieldset = parse_fields(Task, "title,points")
+    model = sparse_model(Task, fieldset)
+    assert model is sparse_model(Task, fieldset)
+    assert sparse_model(Task, None) is Task
+    assert sparse_model.cache_info().maxsize and type_adapter.cache_info().maxsize
+
+    task_id = ObjectId()
+    body = dump_json(model, {"_id": task_id, "title": "Recycle", "points": 5, "description": "x" * 1000})
+    assert body == b'{"title":"Recycle","points":5,"_id":"%s"}' % str(task_id).encode()
+
+
+def test_sparse_projection_keeps_id_and_requested_keys():
+    projection = model_projection(TaskCompletion)
+    fieldset = parse_fields(TaskCompletion, "points_earned")
+    assert sparse_projection(projection, TaskCompletion, None) is projection
+    assert sparse_projection(projection, TaskCompletion, fieldset, ["completed_at"]) == {
+        "_id": 1, "completed_at": 1, "points_earned": 1,
+    }
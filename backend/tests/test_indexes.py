@@ -0,0 +1,25 @@
+import pytest
+
+from app.indexes import INDEXES, REQUIRED_INDEXES, MissingIndexError, check_required_indexes, declared_indexes
+
+
+def test_index_names_are_unique_per_collection():
+    names = [(spec.collection, spec.name) for spec in INDEXES]
+    assert len(names) == len(set(names))
+
+
+def test_unique_email_is_optional():
+    by_name = {spec.name: spec for spec in declared_indexes()}
+    assert not by_name["users_email"].unique
+    
+    by_name = {spec.name: spec for spec in declared_indexes(unique_email=True)}
+    assert by_name["users_email"].unique
+
+
+def test_required_indexes_are_declared_and_checked():
+    declared = {f"{spec.collection}.{spec.name}" for spec in INDEXES if spec.unique}
+    assert set(REQUIRED_INDEXES) <= declared
+    
+    check_required_indexes({"missing": ["users.users_points"], "extra": []})
+    with pytest.raises(MissingIndexError):
+        check_required_indexes({"missing": ["task_completions.completions_user_task_period"], "extra": []})
@@ -0,0 +1,44 @@
+from app.leaderboards import Leaderboard, LeaderboardRegistry
+
+
+def make_board(points):
+    board = Leaderboard()
+    for user_id, score in points.items():
+        board.set(user_id, score)
+    return board
+
+
+def test_top_is_ordered_by_points_with_shared_ranks():
+    board = make_board({"a": 10, "b": 30, "c": 20, "d": 20})
+    assert board.top(4) == [("b", 30, 1), ("c", 20, 2), ("d", 20, 2), ("a", 10, 4)]
+    assert board.top(2, offset=2) == [("d", 20, 2), ("a", 10, 4)]
+
+
+def test_rank_and_neighbours_follow_updates():
+    board = make_board({f"u{i}": i for i in range(10)})
+    assert board.rank("u0") == 10
+    board.add("u0", 100)
+    assert board.rank("u0") == 1
+    assert board.around("u5", 1) == [("u6", 6, 5), ("u5", 5, 6), ("u4", 4, 7)]
+    assert board.around("u0", 1) == [("u0", 100, 1), ("u9", 9, 2)]
+    board.remove("u0")
+    assert board.rank("u0") is None
+    assert len(board) == 9
+
+
+def test_registry_keeps_group_boards_in_step():
+    registry = LeaderboardRegistry()
+    registry.set_user("a", 5, "g1")
+    registry.set_user("b", 7, "g1")
+    registry.set_user("c", 9)
+    registry.apply_increments({"a": 10, "c": 1})
+    assert registry.board("g1").top(2) == [("a", 15, 1), ("b", 7, 2)]
+    assert registry.board().rank("a") == 1
+
+    registry.move_user("a", "g2")
+    assert registry.board("g1").top(5) == [("b", 7, 1)]
+    assert registry.board("g2").rank("a") == 1
+
+    registry.remove_user("b")
+    assert len(registry.board("g1")) == 0
+    assert registry.board().rank("b") is None
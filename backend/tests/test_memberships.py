@@ -0,0 +1,81 @@
+import pytest
+from bson import ObjectId
+
+from app.config import settings
+from app.memberships import add_member, is_member, migrate_group_members
+
+
+@pytest.mark.asyncio
+async def test_legacy_members_count_until_migrated(mongo, monkeypatch):
+    member, string_member, outsider = ObjectId(), ObjectId(), ObjectId()
+    result = await mongo.habitgrove.groups.insert_one(
+        {"name": "Legacy", "type": "ngo", "admins": [], "members": [member, str(string_member), "not-an-id"]}
+    )
+    group_id = result.inserted_id
+
+    assert await is_member(mongo, group_id, member)
+    assert await is_member(mongo, str(group_id), str(string_member))
+    assert not await is_member(mongo, group_id, outsider)
+    assert not await add_member(mongo, group_id, member)
+
+    monkeypatch.setattr(settings, "membership_array_fallback", False)
+    assert not await is_member(mongo, group_id, member)
+
+
+@pytest.mark.asyncio
+async def test_migration_copies_members_and_is_safe_to_rerun(mongo, monkeypatch):
+    members = [ObjectId(), ObjectId()]
+    result = await mongo.habitgrove.groups.insert_one(
+        {"name": "Legacy", "type": "ngo", "admins": [], "members": [members[0], str(members[1]), "not-an-id"]}
+    )
+    group_id = result.inserted_id
+
+    assert await migrate_group_members(mongo) == {"groups_migrated": 1, "memberships_upserted": 2}
+    assert await migrate_group_members(mongo) == {"groups_migrated": 1, "memberships_upserted": 0}
+    group = await mongo.habitgrove.groups.find_one({"_id": group_id})
+    assert group["member_count"] == 2 and "members" in group
+
+    await migrate_group_members(mongo, remove_arrays=True)
+    group = await mongo.habitgrove.groups.find_one({"_id": group_id})
+    assert group["member_count"] == 2 and "members" not in group
+    assert await migrate_group_members(mongo) == {"groups_migrated": 0, "memberships_upserted": 0}
+
+    monkeypatch.setattr(settings, "membership_array_fallback", False)
+    assert all([await is_member(mongo, group_id, member) for member in members])
+    assert await add_member(mongo, group_id, ObjectId())
+    assert (await mongo.habitgrove.groups.find_one({"_id": group_id}))["member_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_joining_a_group_leaves_the_previous_one(mongo, admin_api):
+    first, second = [
+        (await mongo.habitgrove.groups.insert_one({"name": name, "type": "ngo", "admins": [], "member_count": 0})).inserted_id
+        for name in ("First", "Second")
+    ]
+
+    assert (await admin_api.post("/groups/join", json={"group_id": str(first)})).status_code == 200
+    assert (await admin_api.post("/groups/join", json={"group_id": str(first)})).status_code == 400
+    assert (await admin_api.post("/groups/join", json={"group_id": str(second)})).status_code == 200
+
+    user_id = ObjectId(admin_api.user_id)
+    assert not await is_member(mongo, first, user_id) and await is_member(mongo, second, user_id)
+    counts = {group["name"]: group["member_count"] async for group in mongo.habitgrove.groups.find()}
+    assert counts == {"First": 0, "Second": 1}
+
+    response = await admin_api.get(f"/groups/{second}")
+    assert response.status_code == 200
+    assert response.json()["member_count"] == 1 and "members" not in response.json()
+
+
+@pytest.mark.asyncio
+async def test_group_task_routes_keep_their_not_found_and_forbidden_errors(mongo, admin_api):
+    missing = str(ObjectId())
+    group_id = str((await mongo.habitgrove.groups.insert_one({"name": "Other", "type": "ngo", "admins": []})).inserted_id)
+    task = {"title": "Plant", "description": "Plant one tree", "type": "daily",
+            "category": "group", "difficulty": "easy", "points": 5}
+
+    assert (await admin_api.get(f"/tasks/group/{missing}")).status_code == 404
+    assert (await admin_api.get(f"/tasks/group/{group_id}")).status_code == 403
+    assert (await admin_api.post(f"/tasks/group/{missing}", json=task)).status_code == 404
+    assert (await admin_api.post(f"/tasks/group/{group_id}", json=task)).status_code == 403
+    assert (await admin_api.post(f"/tasks/group/{group_id}/bulk", json={"tasks": [task]})).status_code == 403
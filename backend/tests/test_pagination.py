@@ -0,0 +1,40 @@
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.pagination import decode_cursor, encode_cursor, keyset_filter
+
+
+def test_cursor_round_trip_keeps_bson_types():
+    last_id = ObjectId()
+    completed_at = datetime(2026, 3, 1, 12, 30)
+    
+    values = decode_cursor(encode_cursor(completed_at, last_id), 2)
+    assert values[0].replace(tzinfo=None) == completed_at
+    assert values[1] == last_id
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("not-a-cursor", 2)
+    assert exc_info.value.status_code == 400
+    
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor(1), 2)
+
+
+@pytest.mark.parametrize("value", [{"$ne": None}, ["a"], {"$gt": ""}])
+def test_cursor_with_non_scalar_values_is_rejected(value):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(encode_cursor(value, ObjectId()), 2)
+    assert exc_info.value.status_code == 400
+    assert decode_cursor(encode_cursor(None, "name", 1.5), 3) == [None, "name", 1.5]
+
+
+def test_keyset_filter_direction():
+    last_id = ObjectId()
+    assert keyset_filter("points", 10, last_id) == {"$or": [
+        {"points": {"$lt": 10}},
+        {"points": 10, "_id": {"$lt": last_id}},
+    ]}
+    assert keyset_filter("points", 10, last_id, descending=False)["$or"][0] == {"points": {"$gt": 10}}
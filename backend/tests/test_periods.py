@@ -0,0 +1,31 @@
+from datetime import datetime
+from app.periods import period_key, already_completed_message, bucket_periods
+
+
+def test_period_keys_per_task_type():
+    at = datetime(2026, 1, 1, 23, 59)
+    assert period_key("daily", at) == "day:2026-01-01"
+    assert period_key("weekly", at) == "week:2026-W01"
+    assert period_key("monthly", at) == "month:2026-01"
+    assert period_key("yearly", at) == "year:2026"
+    assert period_key("one_time", at) == "once"
+    assert period_key("unknown", at) == "day:2026-01-01"
+
+
+def test_weekly_period_uses_iso_weeks():
+    # Sunday 2027-01-03 still belongs to ISO week 53 of 2026
+    assert period_key("weekly", datetime(2027, 1, 3)) == "week:2026-W53"
+    assert period_key("weekly", datetime(2027, 1, 4)) == "week:2027-W01"
+
+
+def test_daily_period_rolls_over_at_month_end():
+    assert period_key("daily", datetime(2026, 1, 31, 12)) != period_key("daily", datetime(2026, 2, 1, 0))
+
+
+def test_already_completed_message():
+    assert already_completed_message("weekly") == "Bu görev bu hafta zaten tamamlandı"
+    assert already_completed_message("one_time") == "Bu görev zaten tamamlandı"
+
+
+def test_bucket_periods_cover_day_week_and_month():
+    assert bucket_periods(datetime(2024, 12, 30, 8)) == ["day:2024-12-30", "week:2025-W01", "month:2024-12"]
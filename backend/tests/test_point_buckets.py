@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.point_buckets import USER, add_to_point_buckets, backfill_point_buckets, top_buckets
+
+WEEK = "week:2026-W03"
+
+
+def completion(user_id, group_id, points, day):
+    return {
+        "user_id": user_id,
+        "group_id": group_id,
+        "points_earned": points,
+        "completed_at": datetime(2026, 1, day, 12),
+    }
+
+
+@pytest.mark.asyncio
+async def test_completion_without_group_keeps_bucket_group(mongo):
+    user_id, group_id = ObjectId(), ObjectId()
+    await add_to_point_buckets(mongo, [completion(user_id, group_id, 10, 12)])
+    await add_to_point_buckets(mongo, [completion(user_id, None, 5, 13)])
+
+    ranking = await top_buckets(mongo, USER, WEEK, 10, group_id=group_id)
+    assert [(bucket["owner_id"], bucket["points"]) for bucket in ranking] == [(user_id, 15)]
+
+
+@pytest.mark.asyncio
+async def test_backfill_mixes_completions_with_and_without_group(mongo):
+    grouped, ungrouped, group_id = ObjectId(), ObjectId(), ObjectId()
+    await mongo.habitgrove.task_completions.insert_many([
+        completion(grouped, group_id, 10, 12),
+        completion(grouped, None, 5, 13),
+        completion(ungrouped, None, 7, 13),
+    ])
+
+    await backfill_point_buckets(mongo)
+
+    ranking = await top_buckets(mongo, USER, WEEK, 10, group_id=group_id)
+    assert [bucket["owner_id"] for bucket in ranking] == [grouped]
+    bucket = await mongo.habitgrove.point_buckets.find_one({"kind": USER, "owner_id": ungrouped, "period": WEEK})
+    assert bucket["group_id"] is None and bucket["points"] == 7
+
+
+@pytest.mark.asyncio
+async def test_backfill_keeps_each_period_with_the_group_of_that_period(mongo):
+    user_id, old_group_id, new_group_id = ObjectId(), ObjectId(), ObjectId()
+    # Stored newest first, so only a time-ordered read gets the groups right
+    await mongo.habitgrove.task_completions.insert_many([
+        completion(user_id, new_group_id, 5, 20),
+        completion(user_id, None, 3, 21),
+        completion(user_id, old_group_id, 10, 12),
+    ])
+
+    await backfill_point_buckets(mongo)
+
+    groups = {
+        bucket["period"]: bucket["group_id"]
+        async for bucket in mongo.habitgrove.point_buckets.find({"kind": USER, "owner_id": user_id})
+    }
+    assert groups["week:2026-W03"] == old_group_id
+    assert groups["week:2026-W04"] == new_group_id
+    assert groups["day:2026-01-12"] == old_group_id and groups["day:2026-01-21"] is None
+    assert groups["month:2026-01"] == new_group_id
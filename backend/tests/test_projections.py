@@ -0,0 +1,15 @@
+from app.models.group import Group
+from app.models.task import Task
+from app.models.user import User
+from app.projections import model_fields, model_projection
+
+
+def test_fields_include_aliases_and_id():
+    assert {"_id", "id", "title"} <= model_fields(Task)
+
+
+def test_projection_keeps_stored_fields_only():
+    projection = model_projection(User)
+    assert projection["_id"] == projection["email"] == projection["favorite_tasks"] == 1
+    assert "id" not in projection and "password_hash" not in projection
+    assert "name_search" not in model_projection(Group)
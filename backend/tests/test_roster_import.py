@@ -0,0 +1,107 @@
+import pytest
+from bson import ObjectId
+
+from app import roster_import
+from app.config import settings
+from app.roster_import import import_roster
+
+
+async def records(emails):
+    for row, email in enumerate(emails, 1):
+        yield row, {"name": email.split("@")[0].title(), "email": email}, None
+
+
+async def add_group(mongo, name="Roster", member_count=0):
+    result = await mongo.habitgrove.groups.insert_one(
+        {"name": name, "type": "school", "admins": [], "total_points": 0, "member_count": member_count}
+    )
+    return result.inserted_id
+
+
+@pytest.mark.asyncio
+async def test_interrupted_import_resumes_and_reissues_invites(mongo, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_insert_batch_size", 2)
+    group_id = await add_group(mongo)
+    emails = ["ayse@example.com", "ben@example.com", "cem@example.com"]
+
+    # The first batch's users are written, then the run stops before saving progress
+    move_user = roster_import.leaderboards.move_user
+
+    def interrupt(*args):
+        monkeypatch.setattr(roster_import.leaderboards, "move_user", move_user)
+        raise RuntimeError("worker stopped")
+
+    monkeypatch.setattr(roster_import.leaderboards, "move_user", interrupt)
+    with pytest.raises(RuntimeError):
+        await import_roster(mongo, group_id, records(emails), "import-1")
+    progress = await mongo.habitgrove.roster_imports.find_one({"_id": "import-1"})
+    assert progress["status"] == "interrupted" and progress["rows_processed"] == 0
+    assert await mongo.habitgrove.users.count_documents({}) == 2
+
+    result = await import_roster(mongo, group_id, records(emails), "import-1")
+    assert result["status"] == "completed" and result["rows_processed"] == 3
+    assert [invite["email"] for invite in result["invites"]] == emails
+    assert result["users_created"] == 1 and result["users_existing"] == 2
+    assert await mongo.habitgrove.users.count_documents({}) == 3
+    assert await mongo.habitgrove.group_memberships.count_documents({"group_id": group_id}) == 3
+    assert (await mongo.habitgrove.groups.find_one({"_id": group_id}))["member_count"] == 3
+
+    tokens = {user["email"]: user["invite_token_hash"] async for user in mongo.habitgrove.users.find()}
+    again = await import_roster(mongo, group_id, records(emails), "import-1")
+    assert again["invites"] == [] and again["rows_processed"] == 3
+    assert {user["email"]: user["invite_token_hash"] async for user in mongo.habitgrove.users.find()} == tokens
+
+
+@pytest.mark.asyncio
+async def test_resume_reissues_invites_of_batches_finished_before_the_interruption(mongo, monkeypatch):
+    monkeypatch.setattr(settings, "bulk_insert_batch_size", 2)
+    group_id = await add_group(mongo)
+    emails = [f"member{row}@example.com" for row in range(1, 6)]
+
+    # Batch 1 is saved in full; the run stops while batch 2 moves its users
+    move_user = roster_import.leaderboards.move_user
+    calls = []
+
+    def interrupt_in_second_batch(*args):
+        calls.append(args)
+        if len(calls) == 3:
+            monkeypatch.setattr(roster_import.leaderboards, "move_user", move_user)
+            raise RuntimeError("worker stopped")
+        move_user(*args)
+
+    monkeypatch.setattr(roster_import.leaderboards, "move_user", interrupt_in_second_batch)
+    with pytest.raises(RuntimeError):
+        await import_roster(mongo, group_id, records(emails), "import-2")
+    assert (await mongo.habitgrove.roster_imports.find_one({"_id": "import-2"}))["rows_processed"] == 2
+
+    result = await import_roster(mongo, group_id, records(emails), "import-2")
+    assert sorted((invite["row"], invite["email"]) for invite in result["invites"]) == list(enumerate(emails, 1))
+    for invite in result["invites"]:
+        user = await mongo.habitgrove.users.find_one({"email": invite["email"]})
+        assert user["invite_token_hash"] == roster_import.hash_invite_token(invite["token"])
+
+
+@pytest.mark.asyncio
+async def test_import_moves_existing_users_out_of_their_old_group(mongo):
+    old_group_id = await add_group(mongo, "Old", member_count=2)
+    group_id = await add_group(mongo)
+    moved = await mongo.habitgrove.users.insert_one(
+        {"name": "Ayse", "email": "ayse@example.com", "group_id": old_group_id, "password_hash": "x"}
+    )
+    await mongo.habitgrove.group_memberships.insert_many([
+        {"group_id": old_group_id, "user_id": moved.inserted_id},
+        {"group_id": old_group_id, "user_id": ObjectId()},
+    ])
+
+    result = await import_roster(mongo, group_id, records(["ayse@example.com"]))
+    assert result["users_existing"] == 1 and result["memberships_added"] == 1
+
+    user = await mongo.habitgrove.users.find_one({"_id": moved.inserted_id})
+    assert user["group_id"] == group_id
+    memberships = [
+        (membership["group_id"], membership["user_id"])
+        async for membership in mongo.habitgrove.group_memberships.find({"user_id": moved.inserted_id})
+    ]
+    assert memberships == [(group_id, moved.inserted_id)]
+    assert (await mongo.habitgrove.groups.find_one({"_id": old_group_id}))["member_count"] == 1
+    assert (await mongo.habitgrove.groups.find_one({"_id": group_id}))["member_count"] == 1
@@ -0,0 +1,45 @@
+import pytest
+from app.streaming import iter_records, StreamFormatError
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(data: str, content_type=None, size=3):
+    return [record async for record in iter_records(chunked(data.encode(), size), content_type)]
+
+
+@pytest.mark.asyncio
+async def test_wrapped_json_array_split_across_chunks():
+    data = '{"tasks": [{"title": "Kısa duş al"}, {"title": "Su tasarrufu"}]}'
+    records = await collect(data, "application/json", size=1)
+    assert records == [
+        (1, {"title": "Kısa duş al"}, None),
+        (2, {"title": "Su tasarrufu"}, None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_reports_bad_rows_and_continues():
+    data = '{"a": 1}\n\n{broken\n{"b": 2}\n'
+    records = await collect(data, "application/x-ndjson")
+    assert records[0] == (1, {"a": 1}, None)
+    assert records[1][0] == 3 and records[1][2].startswith("Invalid JSON")
+    assert records[2] == (4, {"b": 2}, None)
+
+
+@pytest.mark.asyncio
+async def test_truncated_json_array_raises():
+    with pytest.raises(StreamFormatError):
+        await collect('[{"a": 1}, {"b":', "application/json")
+
+
+@pytest.mark.asyncio
+async def test_csv_rows_keyed_by_header_with_quoted_newlines():
+    data = '﻿name,email\r\n"Yılmaz, Ahmet",ahmet@example.com\r\n"Ayşe\nKaya",ayse@example.com\r\nbroken\r\n'
+    records = await collect(data, "text/csv; charset=utf-8", size=4)
+    assert records[0] == (1, {"name": "Yılmaz, Ahmet", "email": "ahmet@example.com"}, None)
+    assert records[1] == (2, {"name": "Ayşe\nKaya", "email": "ayse@example.com"}, None)
+    assert records[2][0] == 3 and records[2][1] is None
@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+from app.fieldsets import parse_fields
+from app.models.task import Task
+from app.task_catalog import TaskCatalog
+
+
+@pytest.mark.asyncio
+async def test_only_full_views_are_cached(mongo):
+    await mongo.habitgrove.tasks.insert_many([
+        {"title": f"Task {index}", "description": "Do one good thing", "type": "daily",
+         "category": "environment", "difficulty": "easy", "points": index + 1, "isActive": True}
+        for index in range(3)
+    ])
+    catalog = TaskCatalog(ttl=60)
+
+    full = await catalog.get_view(mongo)
+    assert await catalog.get_view(mongo) is full
+    for fields in ("title", "points", "title,points"):
+        body = await catalog.get_view(mongo, fields=parse_fields(Task, fields))
+        assert all(set(task) == {"_id", *fields.split(",")} for task in json.loads(body))
+
+    assert catalog.stats()["views"] == 1
+    assert catalog.stats()["hits"] == 1 and catalog.loads == 1
@@ -0,0 +1,12 @@
+from app.text import normalize_search_text
+
+
+def test_turkish_names_fold_to_ascii():
+    assert normalize_search_text("Şahinbey Belediyesi") == "sahinbey belediyesi"
+    assert normalize_search_text("Gaziantep Üniversitesi") == "gaziantep universitesi"
+    assert normalize_search_text("İSTANBUL Işık") == "istanbul isik"
+    assert normalize_search_text("Çevre  Gönüllüleri ") == "cevre gonulluleri"
+
+
+def test_query_prefix_matches_stored_name():
+    assert normalize_search_text("Ekoloji Derneği").startswith(normalize_search_text("EKOLOJİ der"))
@@ -17,8 +17,8 @@ interface Group {
   id: string
   name: string
   type: string
-  members: string[]
   admins: string[]
+  member_count: number
   total_points: number
   created_at: string
 }
@@ -273,7 +273,7 @@ export default function AdminGroupsPage() {
                       <td className="px-6 py-4">
                         <div className="flex items-center">
                           <Users className="w-4 h-4 text-gray-400 mr-1" />
-                          <span className="text-sm text-gray-900">{group.members.length}</span>
+                          <span className="text-sm text-gray-900">{group.member_count}</span>
                         </div>
                       </td>
                       <td className="px-6 py-4">
@@ -294,7 +294,7 @@ export default function AdminStatisticsPage() {
                           </div>
                           <div>
                             <p className="font-medium text-gray-900">{group.name}</p>
-                            <p className="text-sm text-gray-600">{group.members.length} üye</p>
+                            <p className="text-sm text-gray-600">{group.member_count ?? 0} üye</p>
                           </div>
                         </div>
                         <div className="flex items-center space-x-2">
@@ -23,10 +23,11 @@ interface Group {
   id: string
   name: string
   type: 'university' | 'school' | 'municipality' | 'ngo' | 'company'
-  members: string[]
-  admins: string[]
+  admins?: string[]
+  member_count: number
+  admin_count?: number
   total_points: number
-  created_at: string
+  created_at?: string
 }
 
 interface User {
@@ -119,31 +120,28 @@ export default function GroupPage() {
       setLoading(true)
       setError('')
 
-      const [userResponse, groupsResponse] = await Promise.all([
+      const [userResponse, groupsResponse, myGroupResponse] = await Promise.all([
         authAPI.getMe(),
-        groupsAPI.getGroups()
+        groupsAPI.getGroupSummaries(),
+        groupsAPI.getMyGroup()
       ])
 
       const userData = userResponse.data
       setUser(userData)
       setGroups(groupsResponse.data)
 
-      // Find user's group
+      // User's group, resolved by the backend from group_id
       if (userData.group_id) {
-        const userGroupData = groupsResponse.data.find((g: Group) => g.id === userData.group_id)
+        const userGroupData: Group | null = myGroupResponse.data
         if (userGroupData) {
           setUserGroup(userGroupData)
           
-          // Fetch group completions, admins, and group tasks
+          // Fetch group completions, admins, and group tasks in one request
           try {
-            const [completionsResponse, adminsResponse, groupTasksResponse] = await Promise.all([
-              groupsAPI.getGroupCompletions(userGroupData.id),
-              groupsAPI.getGroupAdmins(userGroupData.id),
-              tasksAPI.getGroupTasks(userGroupData.id)
-            ])
-            setGroupCompletions(completionsResponse.data)
-            setGroupAdmins(adminsResponse.data)
-            setGroupTasks(groupTasksResponse.data)
+            const profileResponse = await groupsAPI.getGroupProfile(userGroupData.id)
+            setGroupCompletions(profileResponse.data.recent_completions)
+            setGroupAdmins(profileResponse.data.admins)
+            setGroupTasks(profileResponse.data.tasks)
           } catch (err) {
             console.error('Failed to fetch group data:', err)
           }
@@ -445,7 +443,7 @@ export default function GroupPage() {
                           {groupTypeLabels[userGroup.type]}
                         </span>
                         <span className="text-sm text-gray-600">
-                          {userGroup.members.length} üye
+                          {userGroup.member_count} üye
                         </span>
                       </div>
                     </div>
@@ -695,11 +693,11 @@ export default function GroupPage() {
                     <div className="space-y-3 mb-4">
                       <div className="flex items-center justify-between text-sm">
                         <span className="text-gray-600">Üyeler:</span>
-                        <span className="font-medium">{group.members.length}</span>
+                        <span className="font-medium">{group.member_count}</span>
                       </div>
                       <div className="flex items-center justify-between text-sm">
                         <span className="text-gray-600">Yöneticiler:</span>
-                        <span className="font-medium">{group.admins?.length || 0}</span>
+                        <span className="font-medium">{group.admin_count ?? group.admins?.length ?? 0}</span>
                       </div>
                       <div className="flex items-center justify-between text-sm">
                         <span className="text-gray-600">Toplam Puan:</span>
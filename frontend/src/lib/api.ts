@@ -85,13 +85,18 @@ export const tasksAPI = {
   
   getUserCompletions: (userId: string) => api.get(`/tasks/user/${userId}`),
   
-  getGroupCompletions: (groupId: string) => api.get(`/tasks/group/${groupId}/completions`),
+  getGroupCompletions: (groupId: string, params?: { limit?: number; cursor?: string }) =>
+    api.get(`/tasks/group/${groupId}/completions`, { params }),
 };
 
 // Groups API
 export const groupsAPI = {
   getGroups: () => api.get('/groups/'),
   
+  getGroupSummaries: () => api.get('/groups/summary'),
+  
+  getMyGroup: () => api.get('/groups/mine'),
+  
   createGroup: (data: { name: string; type: string }) =>
     api.post('/groups/', data),
   
@@ -99,15 +104,18 @@ export const groupsAPI = {
   
   getGroupAdmins: (groupId: string) => api.get(`/groups/${groupId}/admins`),
   
+  getGroupProfile: (groupId: string) => api.get(`/groups/${groupId}/profile`),
+  
   joinGroup: (groupId: string) => api.post('/groups/join', { group_id: groupId }),
   
-  getGroupCompletions: (groupId: string) => api.get(`/tasks/group/${groupId}/completions`),
+  getGroupCompletions: (groupId: string, params?: { limit?: number; cursor?: string }) =>
+    api.get(`/tasks/group/${groupId}/completions`, { params }),
 };
 
 // Admin API
 export const adminAPI = {
   // User Management
-  getAllUsers: (params?: { skip?: number; limit?: number; search?: string }) =>
+  getAllUsers: (params?: { skip?: number; limit?: number; cursor?: string; search?: string }) =>
     api.get('/admin/users', { params }),
   
   getUser: (id: string) => api.get(`/admin/users/${id}`),
@@ -117,7 +125,7 @@ export const adminAPI = {
   deleteUser: (id: string) => api.delete(`/admin/users/${id}`),
   
   // Task Management
-  getAllTasks: (params?: { skip?: number; limit?: number; type_filter?: string; category_filter?: string }) =>
+  getAllTasks: (params?: { skip?: number; limit?: number; cursor?: string; type_filter?: string; category_filter?: string }) =>
     api.get('/admin/tasks', { params }),
   
   createTask: (data: any) => api.post('/admin/tasks', data),
@@ -131,19 +139,31 @@ export const adminAPI = {
   deleteTask: (id: string) => api.delete(`/admin/tasks/${id}`),
   
   // Group Management
-  getAllGroups: (params?: { skip?: number; limit?: number }) =>
+  getAllGroups: (params?: { skip?: number; limit?: number; cursor?: string }) =>
     api.get('/admin/groups', { params }),
   
   updateGroupAdmins: (groupId: string, adminIds: string[]) =>
     api.patch(`/admin/groups/${groupId}/admins`, adminIds),
   
+  // Roster import (CSV with a header row, NDJSON or a JSON array)
+  importGroupRoster: (groupId: string, file: File, importId?: string) =>
+    api.post(`/admin/groups/${groupId}/roster`, file, {
+      params: { import_id: importId },
+      headers: { 'Content-Type': file.type || 'text/csv' },
+    }),
+  
+  getRosterImport: (importId: string) => api.get(`/admin/roster-imports/${importId}`),
+  
   // Admin Requests Management
-  getAdminRequests: (params?: { status_filter?: string; skip?: number; limit?: number }) =>
+  getAdminRequests: (params?: { status_filter?: string; skip?: number; limit?: number; cursor?: string }) =>
     api.get('/admin/admin-requests', { params }),
   
   reviewAdminRequest: (requestId: string, data: { status: string; admin_notes?: string }) =>
     api.patch(`/admin/admin-requests/${requestId}`, data),
   
+  bulkReviewAdminRequests: (data: { request_ids: string[]; status: string; admin_notes?: string }) =>
+    api.post('/admin/admin-requests/review', data),
+  
   // Statistics
   getStatistics: (period?: string) => api.get('/admin/statistics', { params: { period } }),
 };
@@ -164,4 +184,16 @@ export const adminRequestsAPI = {
   getAdminRequest: (id: string) => api.get(`/admin-requests/${id}`),
 };
 
+// Leaderboards API
+export const leaderboardsAPI = {
+  getGlobal: (params?: { limit?: number; offset?: number }) =>
+    api.get('/leaderboards/users', { params }),
+  
+  getGroup: (groupId: string, params?: { limit?: number; offset?: number }) =>
+    api.get(`/leaderboards/groups/${groupId}`, { params }),
+  
+  getMyPosition: (params?: { group_id?: string; radius?: number }) =>
+    api.get('/leaderboards/me', { params }),
+};
+
 export default api; 
\ No newline at end of file